@@ -0,0 +1,113 @@
+"""Micro-benchmark of committee parsing for a feed's worth of descriptions.
+
+Usage::
+
+    python -m benchmarks.bench_parse_committee [--events 1000] [--distinct 40]
+
+Compares the original per-call regex implementation with the compiled
+parser (cold and memoized) and the ``parse_committees()`` batch entry point.
+Real feeds repeat committees, so ``--distinct`` controls how many different
+descriptions the ``--events`` descriptions are drawn from.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import timeit
+
+from fpo_flyers.feed import _parse_committee, parse_committee, parse_committees
+from fpo_flyers.models import CommitteeMember
+
+_FIRST = ("Jianqing", "Liza", "Jason", "Ann", "Bob", "Carl", "Dee", "Miklos")
+_LAST = ("Fan", "Rebrova", "Klusowski", "Lee", "Ray", "Fox", "Moe", "Racz")
+
+
+def legacy_parse_committee(description: str) -> list[CommitteeMember]:
+    """``parse_committee()`` as it was before patterns were precompiled."""
+    match = re.search(
+        r"(?:Professors?|Prof\.)\s+(.+)",
+        description,
+        re.IGNORECASE | re.DOTALL,
+    )
+    if not match:
+        return []
+
+    text = match.group(1).strip().rstrip(".")
+    text = re.sub(r",?\s+and\s+", ", ", text)
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+
+    members: list[CommitteeMember] = []
+    for part in parts:
+        is_chair = False
+        if "(Chair" in part:
+            is_chair = True
+            part = re.sub(r"\s*\(Chair[^)]*\)", "", part).strip()
+        if part:
+            members.append(CommitteeMember(name=part, is_chair=is_chair))
+    return members
+
+
+def descriptions(n_events: int, distinct: int, seed: int = 0) -> list[str]:
+    """``n_events`` feed-style descriptions drawn from ``distinct`` committees."""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        names = [
+            f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+            for _ in range(rng.randint(3, 5))
+        ]
+        names[0] += " (Chair of the Committee)"
+        pool.append(
+            "The examining committee members are Professors "
+            + ", ".join(names[:-1])
+            + f", and {names[-1]}."
+        )
+    return [rng.choice(pool) for _ in range(n_events)]
+
+
+def run(texts: list[str], repeat: int = 5) -> dict[str, float]:
+    """Return the best microseconds per feed for each strategy."""
+    expected = [legacy_parse_committee(t) for t in texts]
+    assert [parse_committee(t) for t in texts] == expected
+    assert parse_committees(texts) == expected
+
+    def cold() -> None:
+        _parse_committee.cache_clear()
+        for text in texts:
+            parse_committee(text)
+
+    strategies = {
+        "legacy": lambda: [legacy_parse_committee(t) for t in texts],
+        "compiled_cold": cold,
+        "memoized": lambda: [parse_committee(t) for t in texts],
+        "batch": lambda: parse_committees(texts),
+    }
+    return {
+        name: min(timeit.repeat(call, number=1, repeat=repeat)) * 1e6
+        for name, call in strategies.items()
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000, help="Descriptions.")
+    parser.add_argument("--distinct", type=int, default=40, help="Committees.")
+    parser.add_argument("--json", action="store_true", help="Print JSON.")
+    args = parser.parse_args(argv)
+
+    results = run(descriptions(args.events, args.distinct))
+    if args.json:
+        print(json.dumps({"events": args.events, "us_per_feed": results}))
+        return 0
+    baseline = results["legacy"]
+    for name, us in sorted(results.items(), key=lambda item: item[1]):
+        print(f"{name:>13}: {us:10.0f} us/feed  ({baseline / us:5.1f}x vs legacy)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
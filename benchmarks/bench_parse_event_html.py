@@ -0,0 +1,93 @@
+"""Micro-benchmark of parse_event_html() per parser backend.
+
+Usage::
+
+    python -m benchmarks.bench_parse_event_html [--page saved_page.html]
+
+Without ``--page``, the test fixture is padded with Drupal-style navigation,
+menus and inline scripts to the size of a real ORFE event page (~250 KB).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from fpo_flyers.scraper import PARSER_BACKENDS, parse_event_html
+
+FIXTURES_DIR = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+FIXTURE = FIXTURES_DIR / "sample_event_page.html"
+
+_OPTIONAL = {"lxml": "lxml", "selectolax": "selectolax"}
+
+
+def drupal_sized_page(fixture: str = "", nav_items: int = 1500) -> str:
+    """Pad the fixture page with the bulk a real Drupal page carries."""
+    fixture = fixture or FIXTURE.read_text()
+    nav = "\n".join(
+        f'<li class="menu-item menu-item--collapsed"><a href="/node/{i}"'
+        f' data-drupal-link-system-path="node/{i}">Menu entry {i}</a></li>'
+        for i in range(nav_items)
+    )
+    settings = json.dumps({"path": {"baseUrl": "/"}, "blob": "x" * 40_000})
+    script = (
+        '<script type="application/json"'
+        f' data-drupal-selector="drupal-settings-json">{settings}</script>'
+    )
+    head, body = fixture.split("<body>", 1)
+    footer = f'<footer class="site-footer"><ul>{nav[: len(nav) // 3]}</ul></footer>'
+    header = f'<nav><ul class="menu">{nav}</ul></nav>'
+    return f"{head}<body>{header}{body}{footer}{script}"
+
+
+def available_backends() -> list[str]:
+    """Concrete backends whose optional dependency is installed."""
+    return [
+        b
+        for b in PARSER_BACKENDS
+        if b != "auto"
+        and (b not in _OPTIONAL or importlib.util.find_spec(_OPTIONAL[b]))
+    ]
+
+
+def run(html: str, number: int) -> dict[str, float]:
+    """Return mean microseconds per page for each available backend."""
+    expected = parse_event_html(html, "bs4")
+    results: dict[str, float] = {}
+    for backend in available_backends():
+        assert parse_event_html(html, backend) == expected, backend
+        best = min(
+            timeit.repeat(
+                lambda: parse_event_html(html, backend), number=number, repeat=3
+            )
+        )
+        results[backend] = best / number * 1e6
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page", type=Path, help="Saved event page to parse.")
+    parser.add_argument("--number", type=int, default=20, help="Parses per run.")
+    parser.add_argument("--json", action="store_true", help="Print JSON.")
+    args = parser.parse_args(argv)
+
+    html = args.page.read_text() if args.page else drupal_sized_page()
+    results = run(html, args.number)
+    if args.json:
+        report = {"page_bytes": len(html.encode()), "us_per_page": results}
+        print(json.dumps(report))
+        return 0
+    print(f"page size: {len(html.encode()) / 1024:.0f} KiB")
+    baseline = results["bs4"]
+    for backend, us in sorted(results.items(), key=lambda item: item[1]):
+        print(f"{backend:>11}: {us:10.0f} us/page  ({baseline / us:5.1f}x vs bs4)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
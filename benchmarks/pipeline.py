@@ -0,0 +1,305 @@
+"""Offline benchmark of every pipeline stage at increasing feed sizes.
+
+Usage::
+
+    python -m benchmarks.pipeline --sizes 1,10,100 --output bench.json
+    python -m benchmarks.pipeline --baseline bench.json --threshold 0.25
+
+A local HTTP server replays a generated ICS feed of N events and one
+Drupal-sized page per event, so no network access is needed. Each stage
+reports throughput, p50/p95 latency and the process's peak RSS as JSON.
+With ``--baseline``, stages that got slower than the threshold are listed
+and the exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.bench_parse_event_html import drupal_sized_page
+
+DEFAULT_SIZES = (1, 10, 100, 1000)
+DEFAULT_THRESHOLD = 0.2
+STAGES = (
+    "fetch_feed",
+    "compute_feed_hash",
+    "parse_events",
+    "scrape_event_page",
+    "render_html",
+    "render_pdf",
+    "render_html_flyer",
+)
+
+_EVENT_TEMPLATE = """BEGIN:VEVENT\r
+UID:bench:{i}\r
+DTSTART:{start}\r
+DTEND:{end}\r
+URL:{base_url}/events/{i}\r
+LOCATION:125 - Sherrerd Hall\r
+SUMMARY:FPO\\, Candidate {i}\r
+DESCRIPTION:The examining committee members are Professors Jianqing Fan (C\r
+ hair of the Committee)\\, Liza Rebrova\\, and Jason Klusowski.\r
+CATEGORIES:FPO\r
+DTSTAMP:20260225T162101Z\r
+END:VEVENT\r
+"""
+
+
+def generate_feed(n_events: int, base_url: str) -> str:
+    """Build an ICS feed of ``n_events`` FPOs whose URLs point at ``base_url``."""
+    first = datetime(2026, 3, 2, 18, 0, tzinfo=timezone.utc)
+    parts = [
+        "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:fpo-flyers-benchmark\r\n"
+    ]
+    for i in range(n_events):
+        start = first + timedelta(days=i)
+        parts.append(
+            _EVENT_TEMPLATE.format(
+                i=i,
+                start=start.strftime("%Y%m%dT%H%M%SZ"),
+                end=(start + timedelta(hours=2)).strftime("%Y%m%dT%H%M%SZ"),
+                base_url=base_url,
+            )
+        )
+    parts.append("END:VCALENDAR\r\n")
+    return "".join(parts)
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    feed = b""
+    page = b""
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        if self.path.startswith("/feed.ics"):
+            body, content_type = self.feed, "text/calendar; charset=utf-8"
+        elif self.path.startswith("/events/"):
+            body, content_type = self.page, "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@contextmanager
+def fixture_server() -> Iterator[tuple[str, type[_FixtureHandler]]]:
+    """Serve recorded feed and event pages on an ephemeral localhost port."""
+    handler = type("FixtureHandler", (_FixtureHandler,), {})
+    handler.page = drupal_sized_page().encode("utf-8")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}", handler
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``pct`` in 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def peak_rss_kib() -> int:
+    """Peak resident set size of this process so far, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _timed(call: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def _summarise(stage: str, n_events: int, samples: list[float], items: int) -> dict:
+    total = sum(samples)
+    return {
+        "stage": stage,
+        "events": n_events,
+        "calls": len(samples),
+        "total_s": round(total, 6),
+        "throughput_per_s": round(items / total, 3) if total else None,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run_size(
+    n_events: int,
+    base_url: str,
+    handler: type[_FixtureHandler],
+    stages: tuple[str, ...] = STAGES,
+) -> list[dict]:
+    """Benchmark the selected stages for a feed of ``n_events`` events."""
+    from fpo_flyers.feed import compute_feed_hash, fetch_feed, parse_events
+    from fpo_flyers.scraper import make_session, scrape_event_page
+
+    ics_text = generate_feed(n_events, base_url)
+    handler.feed = ics_text.encode("utf-8")
+    feed_url = f"{base_url}/feed.ics"
+    # Feed-level stages are repeated so small feeds still get a distribution
+    repeats = max(5, min(50, 500 // n_events))
+    events = parse_events(ics_text)
+    results: list[dict] = []
+
+    def feed_stage(name: str, call: Callable[[], object]) -> None:
+        if name in stages:
+            samples = [_timed(call) for _ in range(repeats)]
+            results.append(_summarise(name, n_events, samples, n_events * repeats))
+
+    def event_stage(name: str, call: Callable[[object], object]) -> None:
+        if name not in stages:
+            return
+        try:
+            samples = [_timed(lambda e=e: call(e)) for e in events]
+        except (ImportError, OSError) as exc:
+            results.append({"stage": name, "events": n_events, "skipped": str(exc)})
+            return
+        results.append(_summarise(name, n_events, samples, len(events)))
+
+    feed_stage("fetch_feed", lambda: fetch_feed(feed_url))
+    feed_stage("compute_feed_hash", lambda: compute_feed_hash(ics_text))
+    feed_stage("parse_events", lambda: parse_events(ics_text))
+
+    with make_session() as session:
+        event_stage(
+            "scrape_event_page",
+            lambda e: scrape_event_page(e.event_url, session=session),
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+
+        def render(name: str) -> Callable[[object], object]:
+            def call(event: object) -> object:
+                from fpo_flyers import renderer
+
+                func = getattr(renderer, name)
+                if name == "render_html":
+                    return func(event)
+                return func(event, output_dir)
+
+            return call
+
+        for name in ("render_html", "render_pdf", "render_html_flyer"):
+            event_stage(name, render(name))
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """List stages whose p50 latency or throughput regressed past ``threshold``."""
+    previous = {
+        (r["stage"], r["events"]): r
+        for r in baseline.get("results", [])
+        if "skipped" not in r
+    }
+    regressions: list[str] = []
+    for result in current.get("results", []):
+        old = previous.get((result["stage"], result["events"]))
+        if old is None or "skipped" in result:
+            continue
+        label = f"{result['stage']}@{result['events']}"
+        if old["p50_ms"] and result["p50_ms"] > old["p50_ms"] * (1 + threshold):
+            regressions.append(
+                f"{label}: p50 {old['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms"
+            )
+        old_tp, new_tp = old.get("throughput_per_s"), result.get("throughput_per_s")
+        if old_tp and new_tp and new_tp < old_tp * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {old_tp:.1f}/s -> {new_tp:.1f}/s"
+            )
+    return regressions
+
+
+def run(sizes: tuple[int, ...], stages: tuple[str, ...] = STAGES) -> dict:
+    """Run the benchmark for every size and return the JSON-ready report."""
+    results: list[dict] = []
+    with fixture_server() as (base_url, handler):
+        for n_events in sizes:
+            results.extend(run_size(n_events, base_url, handler, stages))
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+        },
+        "results": results,
+    }
+
+
+def _csv(value: str) -> tuple[str, ...]:
+    return tuple(v.strip() for v in value.split(",") if v.strip())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated event counts.",
+    )
+    parser.add_argument(
+        "--stages", default=",".join(STAGES), help="Comma-separated stages."
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed fractional slowdown before flagging a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    stages = _csv(args.stages)
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    report = run(tuple(int(s) for s in _csv(args.sizes)), stages)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(
+            report, json.loads(args.baseline.read_text()), args.threshold
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
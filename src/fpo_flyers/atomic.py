@@ -0,0 +1,51 @@
+"""Atomic file replacement that leaves identical files untouched."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask() can only be read by changing it, which
+# would briefly affect files created by other threads
+_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def same_content(path: Path, data: bytes) -> bool:
+    """Return True if ``path`` exists and holds exactly ``data``."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def replace_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` to ``path`` unless it already holds those bytes.
+
+    New content goes to a temporary file in the same directory that is then
+    renamed over ``path``, so readers see either the old file or the new
+    one, never a partial write. Returns True if the file was written.
+    """
+    if same_content(path, data):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates 0600; published files must stay world-readable
+        os.chmod(tmp, _FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return True
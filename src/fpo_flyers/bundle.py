@@ -0,0 +1,78 @@
+"""Single-file kiosk slideshow with every flyer inlined."""
+
+from __future__ import annotations
+
+import gzip
+import importlib.util
+from collections.abc import Iterable
+from pathlib import Path
+
+from .atomic import replace_if_changed
+from .models import FPOEvent
+
+KIOSK_BUNDLE = "kiosk.html"
+# Rotation order of slide background tints, as in docs/slideshow.html
+COLOR_NAMES = ("gold", "olive", "tan", "sage", "teal", "plum", "rose")
+
+
+def brotli_available() -> bool:
+    """Return True if the optional ``brotli`` module is installed."""
+    return importlib.util.find_spec("brotli") is not None
+
+
+def kiosk_files(output_dir: Path) -> list[Path]:
+    """The bundle and every compressed variant it may have."""
+    path = output_dir / KIOSK_BUNDLE
+    return [path] + [path.with_name(path.name + s) for s in (".gz", ".br")]
+
+
+def render_kiosk_html(
+    events: Iterable[FPOEvent], templates_dir: Path | None = None
+) -> str:
+    """Render one HTML page holding every flyer as a slide, in order.
+
+    The iPad flyer stylesheet is included once and shared by all slides.
+    """
+    # Jinja loads only when a bundle is actually built
+    from .renderer import TEMPLATES_DIR, get_renderer
+
+    renderer = get_renderer(templates_dir or TEMPLATES_DIR)
+    template = renderer.env.get_template("kiosk.html")
+    return template.render(events=list(events), colors=COLOR_NAMES)
+
+
+def compressed_variants(data: bytes) -> dict[str, bytes]:
+    """Precompressed copies of ``data`` keyed by file suffix.
+
+    Always ``.gz``; ``.br`` too when brotli is installed. The gzip header
+    carries no timestamp, so identical input gives identical output.
+    """
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli_available():
+        import brotli
+
+        variants[".br"] = brotli.compress(data, mode=brotli.MODE_TEXT)
+    return variants
+
+
+def write_kiosk_bundle(
+    events: Iterable[FPOEvent],
+    output_dir: Path,
+    templates_dir: Path | None = None,
+) -> dict[Path, bool]:
+    """Write ``kiosk.html`` and its compressed variants to ``output_dir``.
+
+    Returns every path with whether it was written; files whose content is
+    unchanged are left alone. A stale ``.br`` from a run with brotli
+    installed is removed rather than left out of date.
+    """
+    data = render_kiosk_html(events, templates_dir).encode("utf-8")
+    path = output_dir / KIOSK_BUNDLE
+    written = {path: replace_if_changed(path, data)}
+    variants = compressed_variants(data)
+    for suffix, compressed in variants.items():
+        variant = path.with_name(path.name + suffix)
+        written[variant] = replace_if_changed(variant, compressed)
+    if ".br" not in variants:
+        path.with_name(path.name + ".br").unlink(missing_ok=True)
+    return written
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from pathlib import Path
 
+from .atomic import replace_if_changed
+from .models import FPOEvent
+
 DEFAULT_HASH_FILE = ".feed_hash"
+MANIFEST_FILE = ".render_manifest.json"
 
 
 def read_stored_hash(hash_file: Path) -> str:
@@ -16,10 +22,94 @@ def read_stored_hash(hash_file: Path) -> str:
 
 def write_hash(hash_file: Path, feed_hash: str) -> None:
     """Write the current hash to the hash file."""
-    hash_file.write_text(feed_hash + "\n")
+    replace_if_changed(hash_file, (feed_hash + "\n").encode("utf-8"))
 
 
 def has_changed(current_hash: str, hash_file: Path) -> bool:
     """Return True if the feed has changed since last run."""
     stored = read_stored_hash(hash_file)
     return current_hash != stored
+
+
+def validators_file_for(hash_file: Path) -> Path:
+    """Return the path storing HTTP cache validators next to ``hash_file``."""
+    return hash_file.with_name(hash_file.name + ".validators")
+
+
+def read_validators(validators_file: Path) -> dict[str, str]:
+    """Read stored ETag/Last-Modified validators, or return an empty dict."""
+    if not validators_file.exists():
+        return {}
+    try:
+        data = json.loads(validators_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, str) and v}
+
+
+def write_validators(validators_file: Path, validators: dict[str, str]) -> None:
+    """Write validators, removing the file when there are none to store."""
+    if validators:
+        text = json.dumps(validators, sort_keys=True) + "\n"
+        replace_if_changed(validators_file, text.encode("utf-8"))
+    elif validators_file.exists():
+        validators_file.unlink()
+
+
+def compute_event_fingerprint(event: FPOEvent, template_version: str) -> str:
+    """Compute SHA-256 over every field of an event plus the template version."""
+    content = f"{template_version}\n{event.fingerprint()}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def read_manifest(manifest_file: Path) -> dict[str, dict]:
+    """Read the per-event render manifest, keyed by event UID.
+
+    Each entry holds the event's ``fingerprint`` and the ``files`` rendered
+    for it. A missing or unreadable manifest yields an empty dict, which makes
+    every event look new.
+    """
+    if not manifest_file.exists():
+        return {}
+    try:
+        data = json.loads(manifest_file.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_manifest(manifest_file: Path, manifest: dict[str, dict]) -> None:
+    """Write the per-event render manifest, leaving it alone if unchanged."""
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    replace_if_changed(manifest_file, text.encode("utf-8"))
+
+
+def is_up_to_date(
+    entry: dict | None,
+    fingerprint: str,
+    output_dir: Path,
+) -> bool:
+    """Return True if a manifest entry matches and all its files still exist."""
+    if not entry or entry.get("fingerprint") != fingerprint:
+        return False
+    files = entry.get("files") or []
+    return bool(files) and all((output_dir / name).exists() for name in files)
+
+
+def stale_files(
+    manifest: dict[str, dict],
+    current: dict[str, dict],
+) -> list[str]:
+    """Return files recorded in ``manifest`` that ``current`` no longer lists.
+
+    Covers both vanished UIDs and events whose output filenames changed.
+    """
+    keep = {name for entry in current.values() for name in entry.get("files", [])}
+    stale: list[str] = []
+    for entry in manifest.values():
+        for name in entry.get("files", []):
+            if name not in keep and name not in stale:
+                stale.append(name)
+    return stale
@@ -4,19 +4,27 @@ from __future__ import annotations
 
 import logging
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import click
 
-from .change_detection import has_changed, write_hash
-from .feed import FEED_URL, compute_feed_hash, fetch_feed, parse_events
-from .renderer import render_html_flyer, render_pdf
-from .scraper import scrape_event_page
+from .change_detection import DEFAULT_HASH_FILE
+from .event_store import STORE_FILE, EventStore
+from .feed import FEED_URL
+from .metrics import PROFILERS
+from .models import EASTERN
+from .multifeed import DEFAULT_FEED_WORKERS, load_feeds, run_feeds, select_shard
+from .pipeline import Pipeline, PipelineConfig, RunResult
+from .raster import RASTER_FORMATS, raster_available
+from .scrape_cache import DEFAULT_CACHE_FILE, DEFAULT_TTL
+from .scraper import DEFAULT_DEADLINE, DEFAULT_MAX_WORKERS, PARSER_BACKENDS
+from .watch import DEFAULT_INTERVAL, DEFAULT_JITTER, DEFAULT_MAX_BACKOFF, watch
 
 logger = logging.getLogger("fpo_flyers")
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option(
     "--output-dir",
     type=click.Path(path_type=Path),
@@ -26,10 +34,12 @@ logger = logging.getLogger("fpo_flyers")
 @click.option(
     "--hash-file",
     type=click.Path(path_type=Path),
-    default=Path(".feed_hash"),
+    default=Path(DEFAULT_HASH_FILE),
     help="Path to the feed hash file.",
 )
-@click.option("--force", is_flag=True, help="Skip change detection.")
+@click.option(
+    "--force", is_flag=True, help="Skip change detection (single runs only)."
+)
 @click.option("--verbose", is_flag=True, help="Enable verbose logging.")
 @click.option("--feed-url", default=FEED_URL, help="ICS feed URL.")
 @click.option(
@@ -37,15 +47,160 @@ logger = logging.getLogger("fpo_flyers")
     default=None,
     help='Header for event page scraping, as "Name: Value".',
 )
+@click.option(
+    "--scrape-workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_WORKERS,
+    show_default=True,
+    help="Concurrent event page requests.",
+)
+@click.option(
+    "--scrape-per-host",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Cap on concurrent requests to one host (default: --scrape-workers).",
+)
+@click.option(
+    "--scrape-deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_DEADLINE,
+    show_default=True,
+    help="Total seconds allowed for scraping all event pages.",
+)
+@click.option(
+    "--scrape-cache",
+    type=click.Path(path_type=Path),
+    default=Path(DEFAULT_CACHE_FILE),
+    show_default=True,
+    help="SQLite cache of scraped event pages.",
+)
+@click.option(
+    "--scrape-cache-ttl",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TTL,
+    show_default=True,
+    help="Seconds before a cached event page is revalidated.",
+)
+@click.option(
+    "--no-scrape-cache",
+    is_flag=True,
+    help="Scrape every event page without reading or updating the cache.",
+)
+@click.option(
+    "--html-parser",
+    type=click.Choice(PARSER_BACKENDS),
+    default="auto",
+    show_default=True,
+    help="Backend for extracting fields from event pages.",
+)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for PDF rendering.",
+)
+@click.option(
+    "--combined-pdf",
+    is_flag=True,
+    help=(
+        "Also write every flyer into one multi-page all_flyers.pdf. Flyers "
+        "rendered by --jobs workers, or left unchanged, are laid out again "
+        "for it."
+    ),
+)
+@click.option(
+    "--content-addressed",
+    is_flag=True,
+    help="Name outputs by content hash so hosts can cache them forever.",
+)
+@click.option(
+    "--raster",
+    type=click.Choice(RASTER_FORMATS),
+    default=None,
+    help="Also write slideshow images and thumbnails in this format.",
+)
+@click.option(
+    "--kiosk-bundle",
+    is_flag=True,
+    help="Also write kiosk.html, a self-contained slideshow of every flyer.",
+)
+@click.option(
+    "--since",
+    type=click.DateTime(),
+    default=None,
+    help="Skip events starting before this US/Eastern date or time.",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(),
+    default=None,
+    help="Skip events starting at or after this US/Eastern date or time.",
+)
+@click.option(
+    "--upcoming-days",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Only handle events starting today or in the next N-1 days.",
+)
+@click.option(
+    "--template-cache",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Directory for Jinja's compiled template bytecode cache.",
+)
+@click.option(
+    "--metrics-out",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Write run metrics here (Prometheus textfile for .prom, else JSON).",
+)
+@click.option(
+    "--profile-render",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Profile the render step and save the report here.",
+)
+@click.option(
+    "--profiler",
+    type=click.Choice(PROFILERS),
+    default="cprofile",
+    show_default=True,
+    help="Profiler used by --profile-render.",
+)
+@click.pass_context
 def main(
+    ctx: click.Context,
     output_dir: Path,
     hash_file: Path,
     force: bool,
     verbose: bool,
     feed_url: str,
     bypass_header: str | None,
+    scrape_workers: int,
+    scrape_per_host: int | None,
+    scrape_deadline: float,
+    scrape_cache: Path,
+    scrape_cache_ttl: float,
+    no_scrape_cache: bool,
+    html_parser: str,
+    jobs: int,
+    combined_pdf: bool,
+    content_addressed: bool,
+    raster: str | None,
+    kiosk_bundle: bool,
+    since: datetime | None,
+    until: datetime | None,
+    upcoming_days: int | None,
+    template_cache: Path | None,
+    metrics_out: Path | None,
+    profile_render: Path | None,
+    profiler: str,
 ) -> None:
-    """Generate FPO flyer PDFs from the Princeton ORFE ICS feed."""
+    """Generate FPO flyer PDFs from the Princeton ORFE ICS feed.
+
+    Runs once unless a subcommand such as ``watch`` is given.
+    """
     logging.basicConfig(
         level=logging.DEBUG if verbose else logging.INFO,
         format="%(levelname)s: %(message)s",
@@ -62,40 +217,204 @@ def main(
         name, value = bypass_header.split(":", 1)
         extra_headers = {name.strip(): value.strip()}
 
-    logger.info("Fetching ICS feed from %s", feed_url)
-    ics_text = fetch_feed(feed_url)
-    current_hash = compute_feed_hash(ics_text)
+    if raster and not raster_available():
+        raise click.BadParameter(
+            "needs pypdfium2 and Pillow; install with: pip install '.[raster]'",
+            param_hint="'--raster'",
+        )
+
+    if upcoming_days is not None and (since or until):
+        raise click.UsageError(
+            "--upcoming-days cannot be combined with --since or --until"
+        )
+
+    config = PipelineConfig(
+        output_dir=output_dir,
+        hash_file=hash_file,
+        feed_url=feed_url,
+        extra_headers=extra_headers,
+        scrape_workers=scrape_workers,
+        scrape_per_host=scrape_per_host,
+        scrape_deadline=scrape_deadline,
+        scrape_cache=None if no_scrape_cache else scrape_cache,
+        scrape_cache_ttl=scrape_cache_ttl,
+        html_parser=html_parser,
+        jobs=jobs,
+        template_cache=template_cache,
+        profile_render=profile_render,
+        profiler=profiler,
+        combined_pdf=combined_pdf,
+        content_addressed=content_addressed,
+        raster=raster,
+        kiosk_bundle=kiosk_bundle,
+        # Dates on the command line are local to the feed, like its flyers
+        since=since.replace(tzinfo=EASTERN) if since else None,
+        until=until.replace(tzinfo=EASTERN) if until else None,
+        upcoming_days=upcoming_days,
+    )
+    ctx.obj = {"config": config, "metrics_out": metrics_out, "force": force}
+    if ctx.invoked_subcommand is not None:
+        return
+
+    with Pipeline(config) as pipeline:
+        try:
+            result = pipeline.run(force)
+        finally:
+            # Also reports what was measured before a crash
+            if metrics_out is not None and pipeline.metrics is not None:
+                pipeline.metrics.write(metrics_out)
+    sys.exit(result.exit_code)
+
+
+@main.command("watch")
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_INTERVAL,
+    show_default=True,
+    help="Seconds between feed polls.",
+)
+@click.option(
+    "--jitter",
+    type=click.FloatRange(min=0, max=1),
+    default=DEFAULT_JITTER,
+    show_default=True,
+    help="Randomise each interval by up to this fraction either way.",
+)
+@click.option(
+    "--max-backoff",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_MAX_BACKOFF,
+    show_default=True,
+    help="Longest delay in seconds after repeated failures.",
+)
+@click.option(
+    "--iterations",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop after this many runs (default: run until interrupted).",
+)
+@click.pass_obj
+def watch_command(
+    obj: dict,
+    interval: float,
+    jitter: float,
+    max_backoff: float,
+    iterations: int | None,
+) -> None:
+    """Poll the feed from one warm process, rendering only what changed."""
+    metrics_out: Path | None = obj["metrics_out"]
+
+    def on_result(result: RunResult) -> None:
+        if metrics_out is not None:
+            # Overwritten after every poll so the textfile tracks the last run
+            result.metrics.write(metrics_out)
+
+    with Pipeline(obj["config"]) as pipeline:
+        try:
+            watch(
+                pipeline,
+                interval=interval,
+                jitter=jitter,
+                max_backoff=max_backoff,
+                iterations=iterations,
+                on_result=on_result,
+            )
+        except KeyboardInterrupt:
+            logger.info("Stopping watch.")
+
+
+def _parse_shard(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> tuple[int, int] | None:
+    if value is None:
+        return None
+    index, sep, count = value.partition("/")
+    if not (sep and index.isdigit() and count.isdigit()):
+        raise click.BadParameter(f"Expected 'INDEX/COUNT', got: {value!r}")
+    if not 0 <= int(index) < int(count):
+        raise click.BadParameter(f"Shard index must be below {count}")
+    return int(index), int(count)
+
+
+@main.command("feeds")
+@click.argument("config_file", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--shard",
+    callback=_parse_shard,
+    default=None,
+    metavar="INDEX/COUNT",
+    help="Only run the feeds assigned to this shard, e.g. 0/4.",
+)
+@click.option(
+    "--feed-workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_FEED_WORKERS,
+    show_default=True,
+    help="Feeds processed concurrently.",
+)
+@click.pass_obj
+def feeds_command(
+    obj: dict,
+    config_file: Path,
+    shard: tuple[int, int] | None,
+    feed_workers: int,
+) -> None:
+    """Generate flyers for every feed listed in a TOML config file.
+
+    Global options such as --jobs and --scrape-cache apply to all feeds;
+    --feed-url, --hash-file and --output-dir come from the config instead.
+    """
+    try:
+        feeds = load_feeds(config_file)
+    except (OSError, ValueError) as exc:
+        raise click.BadParameter(str(exc), param_hint="'CONFIG_FILE'") from exc
+    if shard is not None:
+        feeds = select_shard(feeds, *shard)
+        logger.info("Shard %d/%d: %d feed(s)", shard[0], shard[1], len(feeds))
+    metrics_out: Path | None = obj["metrics_out"]
 
-    if not force and not has_changed(current_hash, hash_file):
-        logger.info("Feed unchanged (hash %s). Nothing to do.", current_hash[:12])
-        sys.exit(0)
+    def on_result(feed, result: RunResult) -> None:
+        if metrics_out is not None:
+            name = f"{metrics_out.stem}.{feed.name}{metrics_out.suffix}"
+            result.metrics.write(metrics_out.with_name(name))
+
+    results = run_feeds(
+        feeds,
+        obj["config"],
+        force=obj["force"],
+        max_workers=feed_workers,
+        on_result=on_result,
+    )
+    failed = sorted(
+        name
+        for name, result in results.items()
+        if isinstance(result, Exception) or result.exit_code
+    )
+    if failed:
+        logger.error("Failed feed(s): %s", ", ".join(failed))
+        sys.exit(1)
 
-    logger.info("Feed changed or --force used. Generating flyers...")
-    events = parse_events(ics_text)
-    if not events:
-        logger.warning("No FPO events found in feed.")
-        sys.exit(0)
 
-    logger.info("Found %d event(s)", len(events))
+@main.command("events")
+@click.option(
+    "--days",
+    type=click.IntRange(min=1),
+    default=7,
+    show_default=True,
+    help="How far ahead to look.",
+)
+@click.pass_obj
+def events_command(obj: dict, days: int) -> None:
+    """List upcoming events from the last run, without fetching the feed."""
+    path = obj["config"].output_dir / STORE_FILE
+    if not path.exists():
+        raise click.ClickException(f"No event store at {path}; run once first.")
+    now = datetime.now(timezone.utc)
+    with EventStore(path) as store:
+        events = store.events_between(now, now + timedelta(days=days))
     for event in events:
-        logger.info("Processing: %s", event.candidate_name)
-        if event.event_url:
-            try:
-                info = scrape_event_page(event.event_url, extra_headers)
-                event.dissertation_title = info["dissertation_title"]
-                event.dissertation_pdf_url = info["dissertation_pdf_url"]
-                logger.debug(
-                    "  Title: %s", event.dissertation_title or "(not found)"
-                )
-            except Exception:
-                logger.warning(
-                    "  Could not scrape event page: %s", event.event_url
-                )
-
-        pdf_path = render_pdf(event, output_dir)
-        html_path = render_html_flyer(event, output_dir)
-        logger.info("  Generated: %s, %s", pdf_path, html_path)
-
-    write_hash(hash_file, current_hash)
-    logger.info("Hash updated: %s", current_hash[:12])
-    logger.info("Done. %d flyer(s) in %s", len(events), output_dir)
+        click.echo(
+            f"{event.formatted_date}, {event.formatted_time_location}: "
+            f"{event.candidate_name}"
+        )
@@ -0,0 +1,333 @@
+"""Persistent SQLite store of feed events, revisions and render outputs."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .feed import TimeWindow
+from .models import CommitteeMember, FPOEvent
+from .site_manifest import file_sha256
+
+STORE_FILE = ".events.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    uid TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    start TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    removed_at REAL
+);
+CREATE INDEX IF NOT EXISTS events_start ON events (start);
+CREATE TABLE IF NOT EXISTS revisions (
+    uid TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (uid, revision)
+);
+CREATE TABLE IF NOT EXISTS outputs (
+    uid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    render_fingerprint TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    PRIMARY KEY (uid, name)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _utc(moment: datetime) -> str:
+    # One zone and format, so text order is time order in the index
+    return moment.astimezone(timezone.utc).isoformat()
+
+
+def _dump(event: FPOEvent) -> str:
+    return json.dumps(
+        {
+            "uid": event.uid,
+            "candidate_name": event.candidate_name,
+            "start": event.start.isoformat(),
+            "end": event.end.isoformat(),
+            "location": event.location,
+            "committee": [[m.name, m.is_chair] for m in event.committee],
+            "dissertation_title": event.dissertation_title,
+            "dissertation_pdf_url": event.dissertation_pdf_url,
+            "event_url": event.event_url,
+            "description_raw": event.description_raw,
+        },
+        ensure_ascii=False,
+    )
+
+
+def _feed_fingerprint(event: FPOEvent) -> str:
+    # Only what the feed says; scraped fields arrive after the diff
+    return replace(event, dissertation_title="", dissertation_pdf_url="").fingerprint()
+
+
+def _scraped(data: str) -> dict[str, str]:
+    fields = json.loads(data)
+    return {
+        "dissertation_title": fields["dissertation_title"],
+        "dissertation_pdf_url": fields["dissertation_pdf_url"],
+    }
+
+
+def _load(data: str) -> FPOEvent:
+    fields = json.loads(data)
+    fields["start"] = datetime.fromisoformat(fields["start"])
+    fields["end"] = datetime.fromisoformat(fields["end"])
+    fields["committee"] = [CommitteeMember(n, c) for n, c in fields["committee"]]
+    return FPOEvent(**fields)
+
+
+@dataclass
+class StoreDelta:
+    """UIDs sorted by how the feed differs from the store.
+
+    ``scraped`` holds the stored title and PDF link of every changed and
+    unchanged event, as they were before this sync.
+    """
+
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    scraped: dict[str, dict[str, str]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+
+class EventStore:
+    """UID-keyed SQLite store of the events seen in a feed.
+
+    Each event keeps its current fields (including scraped ones) and a
+    revision history, and the files last rendered for it with their
+    SHA-256. Events that leave the feed are marked removed, not deleted,
+    so their history survives. Safe to share between threads.
+    """
+
+    def __init__(
+        self, path: Path, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> EventStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def sync(
+        self, events: Iterable[FPOEvent], window: TimeWindow | None = None
+    ) -> StoreDelta:
+        """Record the feed's current ``events`` and return what changed.
+
+        One read of the stored fingerprints decides each event's fate. Only
+        the feed's own fields are compared, so this can run before event
+        pages are scraped; save the results with :meth:`record_scraped`.
+        New and changed events get a new revision, and stored events
+        missing from ``events`` are marked removed. With a ``window``, the
+        events were parsed from that window only, so stored events starting
+        outside it are left as they are. All in one transaction.
+        """
+        now = self._clock()
+        delta = StoreDelta()
+        with self._lock, self._conn:
+            stored: dict[str, tuple[int, str, str]] = {}
+            removed: dict[str, int] = {}
+            outside: set[str] = set()
+            rows = self._conn.execute(
+                "SELECT uid, revision, fingerprint, start, data, removed_at"
+                " FROM events"
+            )
+            for uid, revision, fingerprint, start, data, removed_at in rows:
+                if window is not None and datetime.fromisoformat(start) not in window:
+                    outside.add(uid)
+                if removed_at is None:
+                    stored[uid] = (revision, fingerprint, data)
+                else:
+                    removed[uid] = revision
+            seen: set[str] = set()
+            for event in events:
+                if event.uid in seen:
+                    continue
+                seen.add(event.uid)
+                fingerprint = _feed_fingerprint(event)
+                revision, old, old_data = stored.get(event.uid, (None, None, None))
+                if old_data is not None:
+                    delta.scraped[event.uid] = _scraped(old_data)
+                if old == fingerprint:
+                    delta.unchanged.append(event.uid)
+                    self._conn.execute(
+                        "UPDATE events SET last_seen = ? WHERE uid = ?",
+                        (now, event.uid),
+                    )
+                    continue
+                if revision is None:
+                    delta.added.append(event.uid)
+                    # A returning event continues its old history
+                    revision = removed.get(event.uid, 0)
+                else:
+                    delta.changed.append(event.uid)
+                data = _dump(event)
+                self._conn.execute(
+                    "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, NULL)"
+                    " ON CONFLICT (uid) DO UPDATE SET revision = excluded.revision,"
+                    " fingerprint = excluded.fingerprint, start = excluded.start,"
+                    " data = excluded.data, last_seen = excluded.last_seen,"
+                    " removed_at = NULL",
+                    (
+                        event.uid,
+                        revision + 1,
+                        fingerprint,
+                        _utc(event.start),
+                        data,
+                        now,
+                        now,
+                    ),
+                )
+                self._conn.execute(
+                    "INSERT INTO revisions VALUES (?, ?, ?, ?)",
+                    (event.uid, revision + 1, data, now),
+                )
+            delta.removed = sorted(set(stored) - seen - outside)
+            self._conn.executemany(
+                "UPDATE events SET removed_at = ? WHERE uid = ?",
+                [(now, uid) for uid in delta.removed],
+            )
+        return delta
+
+    def record_scraped(self, events: Iterable[FPOEvent]) -> None:
+        """Save the scraped fields of ``events`` into their current revision."""
+        rows = [(_dump(event), event.uid) for event in events]
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE events SET data = ? WHERE uid = ?", rows)
+            self._conn.executemany(
+                "UPDATE revisions SET data = ? WHERE uid = ? AND revision ="
+                " (SELECT revision FROM events WHERE uid = revisions.uid)",
+                rows,
+            )
+
+    def get_meta(self, key: str) -> str | None:
+        """Return a value saved with :meth:`set_meta`, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Save a small piece of run state alongside the events."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def render_state(self) -> dict[str, dict]:
+        """Files last rendered per UID, as ``{"fingerprint", "files"}``."""
+        state: dict[str, dict] = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT uid, name, render_fingerprint FROM outputs"
+                " ORDER BY uid, position"
+            ).fetchall()
+        for uid, name, fingerprint in rows:
+            entry = state.setdefault(uid, {"fingerprint": fingerprint, "files": []})
+            entry["files"].append(name)
+        return state
+
+    def output_hashes(self) -> dict[str, str]:
+        """SHA-256 of every recorded output file, by file name."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT name, sha256 FROM outputs"))
+
+    def set_render_state(self, state: dict[str, dict], output_dir: Path) -> None:
+        """Replace the recorded outputs with ``state``.
+
+        Files are hashed from ``output_dir`` unless the same UID already
+        recorded that name, at the same size, for the same render
+        fingerprint; a re-render may keep the size but not the bytes.
+        Missing files are left out, so their event is re-rendered on the
+        next run.
+        """
+        with self._lock:
+            known = {
+                (uid, name, fingerprint, size): sha256
+                for uid, name, fingerprint, sha256, size in self._conn.execute(
+                    "SELECT uid, name, render_fingerprint, sha256, bytes"
+                    " FROM outputs"
+                )
+            }
+        rows = []
+        for uid, entry in state.items():
+            for position, name in enumerate(entry.get("files", [])):
+                path = output_dir / name
+                try:
+                    size = path.stat().st_size
+                except FileNotFoundError:
+                    continue
+                fingerprint = entry["fingerprint"]
+                sha256 = known.get((uid, name, fingerprint, size))
+                if sha256 is None:
+                    sha256 = file_sha256(path)
+                rows.append((uid, name, position, fingerprint, sha256, size))
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM outputs")
+            self._conn.executemany(
+                "INSERT INTO outputs VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def events_between(
+        self, start: datetime, end: datetime, include_removed: bool = False
+    ) -> list[FPOEvent]:
+        """Events starting in ``[start, end)``, in start order.
+
+        Answered from the ``start`` index, without fetching or parsing the
+        feed.
+        """
+        query = "SELECT data FROM events WHERE start >= ? AND start < ?"
+        if not include_removed:
+            query += " AND removed_at IS NULL"
+        with self._lock:
+            rows = self._conn.execute(
+                query + " ORDER BY start, uid", (_utc(start), _utc(end))
+            ).fetchall()
+        return [_load(data) for (data,) in rows]
+
+    def history(self, uid: str) -> list[tuple[int, float, FPOEvent]]:
+        """Every recorded ``(revision, recorded_at, event)`` for ``uid``."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT revision, recorded_at, data FROM revisions"
+                " WHERE uid = ? ORDER BY revision",
+                (uid,),
+            ).fetchall()
+        return [(revision, at, _load(data)) for revision, at, data in rows]
@@ -2,23 +2,195 @@
 
 from __future__ import annotations
 
+import codecs
+import functools
 import hashlib
 import re
-from datetime import datetime, timezone
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
 
 import requests
-from icalendar import Calendar
 
-from .models import CommitteeMember, FPOEvent
+from .models import EASTERN, CommitteeMember, FPOEvent
+
+if TYPE_CHECKING:
+    from icalendar import Event
 
 FEED_URL = "https://orfe.princeton.edu/feeds/events/ical.ics?tid=491"
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class FeedResponse:
+    """Result of a (possibly conditional) feed fetch."""
+
+    text: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False
+    feed_hash: str = ""
+    size: int = 0
+    status_code: int = 200
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """Cache validators to send with the next conditional request."""
+        return {
+            key: value
+            for key, value in (
+                ("etag", self.etag),
+                ("last_modified", self.last_modified),
+            )
+            if value
+        }
+
+    def iter_lines(self) -> Iterator[str]:
+        """Yield the body's lines one at a time, without splitting it up front."""
+        text = self.text
+        start = 0
+        while start < len(text):
+            end = text.find("\n", start) + 1 or len(text)
+            yield text[start:end]
+            start = end
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    """Event start times in ``[since, until)``; None leaves that end open."""
+
+    since: datetime | None = None
+    until: datetime | None = None
+
+    @classmethod
+    def upcoming(cls, days: int, now: datetime | None = None) -> TimeWindow:
+        """Today and the following ``days - 1`` days, in US/Eastern.
+
+        Starts at midnight, so exams later today or already under way
+        keep their flyers until the day is over.
+        """
+        now = now or datetime.now(timezone.utc)
+        today = now.astimezone(EASTERN).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return cls(today, today + timedelta(days=days))
+
+    def __contains__(self, start: datetime) -> bool:
+        if self.since is not None and start < self.since:
+            return False
+        return self.until is None or start < self.until
+
+    @property
+    def key(self) -> str:
+        """Stable text form; it changes exactly when the window moves."""
+        return "/".join(
+            bound.isoformat() if bound is not None else ""
+            for bound in (self.since, self.until)
+        )
+
+
+def fetch_feed_conditional(
+    url: str = FEED_URL,
+    validators: dict[str, str] | None = None,
+    session: requests.Session | None = None,
+) -> FeedResponse:
+    """Fetch the ICS feed, revalidating against stored cache validators.
+
+    ``validators`` may hold ``etag`` and ``last_modified`` from an earlier
+    response. If the server answers 304 Not Modified, the returned response
+    has ``not_modified`` set and no body. Compressed transfer encodings
+    (gzip, and brotli when the ``brotli`` package is installed) are
+    negotiated and decoded by requests. The feed hash is computed from the
+    decoded bytes as they stream in, and each chunk is decoded to text
+    straight away; :meth:`FeedResponse.iter_lines` then feeds the parser.
+    """
+    validators = validators or {}
+    headers: dict[str, str] = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    get = session.get if session is not None else requests.get
+    resp = get(url, headers=headers, timeout=30, stream=True)
+    with resp:
+        if resp.status_code == 304:
+            return FeedResponse(
+                etag=resp.headers.get("ETag", validators.get("etag", "")),
+                last_modified=resp.headers.get(
+                    "Last-Modified", validators.get("last_modified", "")
+                ),
+                not_modified=True,
+                status_code=304,
+            )
+        resp.raise_for_status()
+        # RFC 5545 feeds are UTF-8 unless the server says otherwise
+        content_type = resp.headers.get("Content-Type", "").lower()
+        encoding = resp.encoding if "charset=" in content_type else "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")("replace")
+        hasher = FeedHasher()
+        parts: list[str] = []
+        size = 0
+        # Each chunk is decoded as it arrives, so the raw body is never
+        # held in full next to its text
+        for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+            hasher.update(chunk)
+            size += len(chunk)
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        return FeedResponse(
+            text="".join(parts),
+            etag=resp.headers.get("ETag", ""),
+            last_modified=resp.headers.get("Last-Modified", ""),
+            feed_hash=hasher.hexdigest(),
+            size=size,
+            status_code=resp.status_code,
+        )
 
 
 def fetch_feed(url: str = FEED_URL) -> str:
     """Fetch the raw ICS feed text."""
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    return resp.text
+    return fetch_feed_conditional(url).text
+
+
+# Start of the member list: "Professors ...", "Professor ..." or "Prof. ..."
+_COMMITTEE_START = re.compile(r"(?:Professors?|Profs?\.)\s+(.+)", re.I | re.S)
+# "(Chair of the Committee)", "(Co-Chair)", "(co-chairs)", ...
+_CHAIR_NOTE = re.compile(r"\s*\(\s*(co-?)?chair(s?)[^)]*\)", re.I)
+_MEMBER_SEPARATOR = re.compile(r",\s*(?:and\s+)?|\s+and\s+")
+# Per-name titles in lists like "Prof. A, Prof. B, and Prof. C"
+_MEMBER_TITLE = re.compile(r"^(?:Professors?|Profs?\.|Dr\.)\s+", re.I)
+# Stands in for a chair note while the list is split on commas
+_CHAIR_MARK = "\x00"
+_PLURAL_CHAIR_MARK = "\x01"
+
+COMMITTEE_CACHE_SIZE = 4096
+
+
+def _mark_chair(match: re.Match[str]) -> str:
+    # "(Co-Chairs)" after the second of two names covers both of them
+    return _PLURAL_CHAIR_MARK if match.group(1) and match.group(2) else _CHAIR_MARK
+
+
+@functools.lru_cache(maxsize=COMMITTEE_CACHE_SIZE)
+def _parse_committee(description: str) -> tuple[CommitteeMember, ...]:
+    match = _COMMITTEE_START.search(description)
+    if not match:
+        return ()
+
+    text = match.group(1).strip().rstrip(".")
+    # Replace chair notes first so commas inside them do not split names
+    text = _CHAIR_NOTE.sub(_mark_chair, text)
+    members: list[CommitteeMember] = []
+    for part in _MEMBER_SEPARATOR.split(text):
+        is_chair = _CHAIR_MARK in part or _PLURAL_CHAIR_MARK in part
+        if _PLURAL_CHAIR_MARK in part and members:
+            members[-1] = CommitteeMember(members[-1].name, is_chair=True)
+        name = " ".join(part.replace(_CHAIR_MARK, " ").split())
+        name = _MEMBER_TITLE.sub("", name.replace(_PLURAL_CHAIR_MARK, ""))
+        if name:
+            members.append(CommitteeMember(name=name, is_chair=is_chair))
+    return tuple(members)
 
 
 def parse_committee(description: str) -> list[CommitteeMember]:
@@ -27,31 +199,26 @@ def parse_committee(description: str) -> list[CommitteeMember]:
     Example input:
       "The examining committee members are Professors Jianqing Fan
        (Chair of the Committee), Liza Rebrova, and Jason Klusowski."
+
+    Results are memoized on the description text, since the same
+    committee recurs across events and runs.
     """
-    # Strip the preamble
-    match = re.search(
-        r"(?:Professors?|Prof\.)\s+(.+)",
-        description,
-        re.IGNORECASE | re.DOTALL,
-    )
-    if not match:
-        return []
+    return list(_parse_committee(description))
 
-    text = match.group(1).strip().rstrip(".")
-    # Split on commas and "and"
-    # First, normalize "and" preceded by comma or standalone
-    text = re.sub(r",?\s+and\s+", ", ", text)
-    parts = [p.strip() for p in text.split(",") if p.strip()]
 
-    members: list[CommitteeMember] = []
-    for part in parts:
-        is_chair = False
-        if "(Chair" in part:
-            is_chair = True
-            part = re.sub(r"\s*\(Chair[^)]*\)", "", part).strip()
-        if part:
-            members.append(CommitteeMember(name=part, is_chair=is_chair))
-    return members
+def parse_committees(descriptions: Iterable[str]) -> list[list[CommitteeMember]]:
+    """Parse the DESCRIPTION of every event in a feed, in order.
+
+    Each distinct description is parsed once, however often it repeats.
+    """
+    parsed: dict[str, tuple[CommitteeMember, ...]] = {}
+    committees: list[list[CommitteeMember]] = []
+    for description in descriptions:
+        members = parsed.get(description)
+        if members is None:
+            members = parsed[description] = _parse_committee(description)
+        committees.append(list(members))
+    return committees
 
 
 def extract_candidate_name(summary: str) -> str:
@@ -61,52 +228,175 @@ def extract_candidate_name(summary: str) -> str:
     return summary.strip()
 
 
-def parse_events(ics_text: str) -> list[FPOEvent]:
-    """Parse ICS text into a list of FPOEvent objects."""
+def _component_start(component: Event) -> datetime:
+    dt_start = component.get("DTSTART")
+    start = dt_start.dt if dt_start else datetime.now(timezone.utc)
+    # Ensure timezone-aware
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    return start
+
+
+def _event_from_component(
+    component: Event, committee: list[CommitteeMember] | None = None
+) -> FPOEvent:
+    """Build an FPOEvent from a parsed VEVENT component.
+
+    Pass ``committee`` when it was already parsed in a batch.
+    """
+    summary = str(component.get("SUMMARY", ""))
+    uid = str(component.get("UID", ""))
+    location = str(component.get("LOCATION", ""))
+    description = str(component.get("DESCRIPTION", ""))
+    url = str(component.get("URL", ""))
+
+    dt_end = component.get("DTEND")
+    start = _component_start(component)
+    end = dt_end.dt if dt_end else start
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+
+    candidate = extract_candidate_name(summary)
+    if committee is None:
+        committee = parse_committee(description)
+
+    return FPOEvent(
+        uid=uid,
+        candidate_name=candidate,
+        start=start,
+        end=end,
+        location=location,
+        committee=committee,
+        event_url=url,
+        description_raw=description,
+    )
+
+
+def parse_events(
+    ics_text: str, window: TimeWindow | None = None
+) -> list[FPOEvent]:
+    """Parse ICS text into a list of FPOEvent objects.
+
+    With a ``window``, events whose DTSTART falls outside it are dropped
+    before their description is parsed.
+    """
+    from icalendar import Calendar
+
     cal = Calendar.from_ical(ics_text)
-    events: list[FPOEvent] = []
-    for component in cal.walk():
-        if component.name != "VEVENT":
+    components = [
+        c
+        for c in cal.walk()
+        if c.name == "VEVENT" and (window is None or _component_start(c) in window)
+    ]
+    committees = parse_committees(
+        str(component.get("DESCRIPTION", "")) for component in components
+    )
+    return [
+        _event_from_component(component, committee)
+        for component, committee in zip(components, committees)
+    ]
+
+
+def unfold_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Join RFC 5545 folded continuation lines into logical content lines."""
+    current: str | None = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
             continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
 
-        summary = str(component.get("SUMMARY", ""))
-        uid = str(component.get("UID", ""))
-        location = str(component.get("LOCATION", ""))
-        description = str(component.get("DESCRIPTION", ""))
-        url = str(component.get("URL", ""))
 
-        dt_start = component.get("DTSTART")
-        dt_end = component.get("DTEND")
-        start = dt_start.dt if dt_start else datetime.now(timezone.utc)
-        end = dt_end.dt if dt_end else start
+def iter_events(
+    lines: Iterable[str], window: TimeWindow | None = None
+) -> Iterator[FPOEvent]:
+    """Yield FPOEvents one VEVENT at a time from ICS lines.
 
-        # Ensure timezone-aware
-        if start.tzinfo is None:
-            start = start.replace(tzinfo=timezone.utc)
-        if end.tzinfo is None:
-            end = end.replace(tzinfo=timezone.utc)
+    Accepts any iterable of lines, such as an open file or a streamed HTTP
+    response, so the feed never has to be held as a whole ``Calendar``.
+    Lines outside a VEVENT (including whole VTIMEZONE blocks) are skipped
+    without being parsed. TZID parameters are resolved against the system
+    time zone database rather than the feed's VTIMEZONE definitions.
+    With a ``window``, events starting outside it are skipped as soon as
+    their DTSTART is known.
+    """
+    from icalendar import Event
 
-        candidate = extract_candidate_name(summary)
-        committee = parse_committee(description)
+    block: list[str] = []
+    depth = 0
+    for line in unfold_lines(lines):
+        if depth == 0:
+            if line.upper() == "BEGIN:VEVENT":
+                block = [line]
+                depth = 1
+            continue
+        block.append(line)
+        upper = line.upper()
+        if upper.startswith("BEGIN:"):
+            depth += 1
+        elif upper.startswith("END:"):
+            depth -= 1
+            if depth == 0:
+                component = Event.from_ical("\r\n".join(block))
+                if window is None or _component_start(component) in window:
+                    yield _event_from_component(component)
 
-        events.append(
-            FPOEvent(
-                uid=uid,
-                candidate_name=candidate,
-                start=start,
-                end=end,
-                location=location,
-                committee=committee,
-                event_url=url,
-                description_raw=description,
-            )
-        )
-    return events
+
+# Every line boundary str.splitlines() recognises, as UTF-8 bytes
+_LINE_BREAK = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+class FeedHasher:
+    """Incremental SHA-256 of a feed, excluding DTSTAMP lines.
+
+    Feed UTF-8 bytes in chunks of any size with :meth:`update`; the digest is
+    identical to ``compute_feed_hash()`` on the decoded text, and to the
+    shell pipeline in ``generate.yml`` for feeds with LF or CRLF line ends.
+    Only the current partial line is buffered.
+    """
+
+    def __init__(self) -> None:
+        self._sha = hashlib.sha256()
+        self._pending = b""
+        self._first = True
+
+    def update(self, chunk: bytes) -> None:
+        """Hash every complete line in ``chunk``, buffering the remainder."""
+        data = self._pending + chunk
+        # No line break can straddle a "\n", so everything up to the last
+        # one can be split safely.
+        cut = data.rfind(b"\n") + 1
+        self._pending = data[cut:]
+        if cut:
+            self._add_lines(data[:cut])
+
+    def hexdigest(self) -> str:
+        """Flush the final partial line and return the hex digest."""
+        if self._pending:
+            self._add_lines(self._pending)
+            self._pending = b""
+        return self._sha.hexdigest()
+
+    def _add_lines(self, data: bytes) -> None:
+        lines = _LINE_BREAK.split(data)
+        if lines[-1] == b"":
+            lines.pop()
+        for line in lines:
+            if line.startswith(b"DTSTAMP"):
+                continue
+            if not self._first:
+                self._sha.update(b"\n")
+            self._sha.update(line)
+            self._first = False
 
 
 def compute_feed_hash(ics_text: str) -> str:
     """Compute SHA-256 hash of the feed, excluding DTSTAMP lines."""
-    lines = ics_text.splitlines()
-    filtered = [line for line in lines if not line.startswith("DTSTAMP")]
-    content = "\n".join(filtered)
-    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+    hasher = FeedHasher()
+    hasher.update(ics_text.encode("utf-8"))
+    return hasher.hexdigest()
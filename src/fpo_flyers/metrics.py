@@ -0,0 +1,155 @@
+"""Per-run counters, timers and optional profiling of pipeline stages."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import math
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+METRIC_PREFIX = "fpo_flyers"
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class Metrics:
+    """Counters, gauges and timers collected over one pipeline run.
+
+    Counters accumulate (bytes fetched, cache hits), gauges hold the last
+    value set (HTTP status), and timers keep every observation in seconds
+    so per-event latencies can be summarised.
+    """
+
+    def __init__(self) -> None:
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+        self.timers: dict[str, list[float]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Add ``value`` to counter ``name``."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        """Set gauge ``name`` to ``value``."""
+        self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one duration for timer ``name``."""
+        self.timers.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Time the enclosed block into timer ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def to_dict(self) -> dict:
+        """Summarise everything as plain JSON-serialisable data."""
+        timers = {}
+        for name, samples in sorted(self.timers.items()):
+            ordered = sorted(samples)
+            timers[name] = {
+                "count": len(ordered),
+                "sum_seconds": sum(ordered),
+                "p50_seconds": _quantile(ordered, 0.5),
+                "p95_seconds": _quantile(ordered, 0.95),
+                "max_seconds": ordered[-1],
+            }
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": dict(sorted(self.gauges.items())),
+            "timers": timers,
+        }
+
+    def to_json(self) -> str:
+        """Render the summary as JSON."""
+        return json.dumps(self.to_dict(), indent=2) + "\n"
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """Render the summary in the Prometheus textfile exposition format."""
+        lines: list[str] = []
+        for name, value in sorted(self.counters.items()):
+            metric = _metric_name(prefix, name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {_number(value)}"]
+        for name, value in sorted(self.gauges.items()):
+            metric = _metric_name(prefix, name)
+            lines += [f"# TYPE {metric} gauge", f"{metric} {_number(value)}"]
+        for name, summary in self.to_dict()["timers"].items():
+            metric = _metric_name(prefix, name) + "_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for quantile in ("0.5", "0.95"):
+                key = "p50_seconds" if quantile == "0.5" else "p95_seconds"
+                lines.append(
+                    f'{metric}{{quantile="{quantile}"}} {_number(summary[key])}'
+                )
+            lines.append(f"{metric}_sum {_number(summary['sum_seconds'])}")
+            lines.append(f"{metric}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Write to ``path``: Prometheus format for ``.prom``, else JSON."""
+        text = self.to_prometheus() if path.suffix == ".prom" else self.to_json()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so node_exporter never scrapes a partial file
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+
+
+def _quantile(ordered: list[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted list."""
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _metric_name(prefix: str, name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}")
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+@contextmanager
+def profile_to(path: Path | None, profiler: str = "cprofile") -> Iterator[None]:
+    """Profile the enclosed block and save the result to ``path``.
+
+    ``cprofile`` writes pstats data (load with ``python -m pstats``);
+    ``pyinstrument`` (optional dependency) writes an HTML report. Does
+    nothing when ``path`` is None.
+    """
+    if path is None:
+        yield
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profiler!r}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if profiler == "pyinstrument":
+        if importlib.util.find_spec("pyinstrument") is None:
+            raise RuntimeError("pyinstrument is not installed")
+        from pyinstrument import Profiler
+
+        sampler = Profiler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            path.write_text(sampler.output_html())
+        return
+
+    import cProfile
+
+    tracer = cProfile.Profile()
+    tracer.enable()
+    try:
+        yield
+    finally:
+        tracer.disable()
+        tracer.dump_stats(str(path))
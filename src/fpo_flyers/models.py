@@ -2,14 +2,35 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any
 from zoneinfo import ZoneInfo
 
 EASTERN = ZoneInfo("America/New_York")
 
 
-@dataclass
+def _derived(func: Callable[[FPOEvent], Any]) -> property:
+    """A read-only property computed once and kept until a field changes."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def get(self: FPOEvent) -> Any:
+        cache = self._cache
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = func(self)
+            return value
+
+    return property(get)
+
+
+@dataclass(frozen=True, slots=True)
 class CommitteeMember:
     """A member of the examining committee."""
 
@@ -22,9 +43,14 @@ class CommitteeMember:
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class FPOEvent:
-    """A Final Public Oral examination event."""
+    """A Final Public Oral examination event.
+
+    Display properties are computed on first use and cached; assigning any
+    field (as the scraper does for the title and PDF link) clears the cache.
+    Replace ``committee`` rather than mutating the list in place.
+    """
 
     uid: str
     candidate_name: str
@@ -36,23 +62,54 @@ class FPOEvent:
     dissertation_pdf_url: str = ""
     event_url: str = ""
     description_raw: str = ""
-
-    @property
+    _cache: dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_cache":
+            try:
+                self._cache.clear()
+            except AttributeError:
+                pass  # Still in __init__, before the cache exists
+
+    def fingerprint(self) -> str:
+        """SHA-256 over every field, stable across processes and runs."""
+        cache = self._cache
+        if "fingerprint" not in cache:
+            payload = [
+                self.uid,
+                self.candidate_name,
+                self.start.isoformat(),
+                self.end.isoformat(),
+                self.location,
+                [[m.name, m.is_chair] for m in self.committee],
+                self.dissertation_title,
+                self.dissertation_pdf_url,
+                self.event_url,
+                self.description_raw,
+            ]
+            content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            cache["fingerprint"] = hashlib.sha256(content).hexdigest()
+        return cache["fingerprint"]
+
+    @_derived
     def start_eastern(self) -> datetime:
         """Start time in US/Eastern."""
         return self.start.astimezone(EASTERN)
 
-    @property
+    @_derived
     def end_eastern(self) -> datetime:
         """End time in US/Eastern."""
         return self.end.astimezone(EASTERN)
 
-    @property
+    @_derived
     def formatted_date(self) -> str:
         """e.g. 'Monday, March 2, 2026'."""
         return self.start_eastern.strftime("%A, %B %-d, %Y")
 
-    @property
+    @_derived
     def formatted_time(self) -> str:
         """e.g. '1:00 pm'."""
         t = self.start_eastern
@@ -60,7 +117,7 @@ class FPOEvent:
         period = "am" if t.hour < 12 else "pm"
         return f"{hour}:{t.minute:02d} {period}"
 
-    @property
+    @_derived
     def formatted_location(self) -> str:
         """Reformat '125 - Sherrerd Hall' to 'Sherrerd Hall, Room 125'."""
         loc = self.location.strip()
@@ -69,12 +126,12 @@ class FPOEvent:
             return f"{building}, Room {room}"
         return loc
 
-    @property
+    @_derived
     def formatted_time_location(self) -> str:
         """e.g. '1:00 pm in Sherrerd Hall, Room 125'."""
         return f"{self.formatted_time} in {self.formatted_location}"
 
-    @property
+    @_derived
     def committee_text(self) -> str:
         """Format committee for the flyer.
 
@@ -103,7 +160,7 @@ class FPOEvent:
             lines.append(first)
         return "\n".join(lines)
 
-    @property
+    @_derived
     def safe_filename(self) -> str:
         """Filename-safe version of candidate name."""
         return self.candidate_name.replace(" ", "_").replace("/", "_")
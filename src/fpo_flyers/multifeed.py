@@ -0,0 +1,149 @@
+"""Generate flyers for many feeds from one process."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import tomllib
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .change_detection import DEFAULT_HASH_FILE
+from .pipeline import Pipeline, PipelineConfig, RunResult
+
+logger = logging.getLogger("fpo_flyers")
+
+DEFAULT_FEED_WORKERS = 4
+
+_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    """One feed in a multi-feed config and where its state lives."""
+
+    name: str
+    url: str
+    output_dir: Path
+    hash_file: Path
+
+
+def load_feeds(path: Path) -> list[FeedSpec]:
+    """Read feed definitions from a TOML config file.
+
+    The file holds one ``[[feed]]`` table per feed with a ``name`` and
+    ``url``. Each feed writes to ``<output_dir>/<name>`` and keeps its feed
+    hash in ``<state_dir>/.feed_hash.<name>``; both directories are
+    top-level keys relative to the config file (default ``output`` and the
+    file's own directory), and a feed may override either path. Raises
+    ValueError for a malformed file.
+    """
+    with path.open("rb") as f:
+        data = tomllib.load(f)
+    base = path.parent
+    output_root = base / data.get("output_dir", "output")
+    state_dir = base / data.get("state_dir", ".")
+    feeds = []
+    for entry in data.get("feed", []):
+        name = entry.get("name", "")
+        url = entry.get("url", "")
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid feed name: {name!r}")
+        if not url:
+            raise ValueError(f"Feed {name!r} has no url")
+        output_dir = output_root / name
+        if "output_dir" in entry:
+            output_dir = base / entry["output_dir"]
+        hash_file = state_dir / f"{DEFAULT_HASH_FILE}.{name}"
+        if "hash_file" in entry:
+            hash_file = base / entry["hash_file"]
+        feeds.append(FeedSpec(name, url, output_dir, hash_file))
+    names = [feed.name for feed in feeds]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate feed names: {', '.join(duplicates)}")
+    if not feeds:
+        raise ValueError(f"No [[feed]] entries in {path}")
+    return feeds
+
+
+def shard_of(name: str, count: int) -> int:
+    """Deterministically assign feed ``name`` to one of ``count`` shards.
+
+    Uses SHA-256 rather than ``hash()``, so every process and machine
+    agrees on the assignment regardless of ``PYTHONHASHSEED``.
+    """
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def select_shard(
+    feeds: Iterable[FeedSpec], index: int, count: int
+) -> list[FeedSpec]:
+    """Return the feeds belonging to shard ``index`` of ``count``."""
+    if not 0 <= index < count:
+        raise ValueError(f"Shard {index} out of range for {count} shard(s)")
+    return [feed for feed in feeds if shard_of(feed.name, count) == index]
+
+
+def feed_config(base: PipelineConfig, feed: FeedSpec) -> PipelineConfig:
+    """``base`` with the feed's URL and per-feed state paths."""
+    return replace(
+        base,
+        feed_url=feed.url,
+        output_dir=feed.output_dir,
+        hash_file=feed.hash_file,
+        # Profilers are per process, not per thread
+        profile_render=None,
+    )
+
+
+def run_feeds(
+    feeds: list[FeedSpec],
+    base: PipelineConfig,
+    force: bool = False,
+    max_workers: int = DEFAULT_FEED_WORKERS,
+    on_result: Callable[[FeedSpec, RunResult], None] | None = None,
+    shared: Pipeline | None = None,
+) -> dict[str, RunResult | Exception]:
+    """Run the pipeline for every feed, up to ``max_workers`` at a time.
+
+    Feeds are fetched, scraped and diffed concurrently in threads that
+    share one HTTP session, scrape cache and render pool, taken from
+    ``shared`` (a pipeline for ``base``) or created for this call. Hash
+    files and manifests stay per feed. Each result is a ``RunResult`` or
+    the exception that feed raised; one failing feed does not stop the
+    others.
+    """
+    own = shared is None
+    if own:
+        shared = Pipeline(base)
+    results: dict[str, RunResult | Exception] = {}
+
+    def run_one(feed: FeedSpec) -> RunResult:
+        logger.info("[%s] Starting", feed.name)
+        # Closes only the feed's own event store; shared state stays open
+        with Pipeline(feed_config(base, feed), shared=shared) as pipeline:
+            return pipeline.run(force)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {feed: executor.submit(run_one, feed) for feed in feeds}
+            for feed, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    logger.exception("[%s] Run failed", feed.name)
+                    results[feed.name] = exc
+                    continue
+                logger.info("[%s] %s", feed.name, result.status)
+                results[feed.name] = result
+                if on_result is not None:
+                    on_result(feed, result)
+    finally:
+        if own:
+            shared.close()
+    return results
@@ -0,0 +1,618 @@
+"""One fetch-scrape-render pass, with state that can stay warm between runs."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import requests
+
+from .bundle import KIOSK_BUNDLE, kiosk_files
+from .change_detection import (
+    DEFAULT_HASH_FILE,
+    MANIFEST_FILE,
+    compute_event_fingerprint,
+    has_changed,
+    is_up_to_date,
+    read_manifest,
+    read_validators,
+    stale_files,
+    validators_file_for,
+    write_hash,
+    write_validators,
+)
+from .event_store import STORE_FILE, EventStore, StoreDelta
+from .feed import FEED_URL, TimeWindow, fetch_feed_conditional, iter_events
+from .metrics import Metrics, profile_to
+from .models import FPOEvent
+from .scrape_cache import DEFAULT_CACHE_FILE, DEFAULT_TTL, ScrapeCache
+from .scraper import (
+    DEFAULT_DEADLINE,
+    DEFAULT_MAX_WORKERS,
+    make_session,
+    scrape_event_pages,
+)
+from .site_manifest import (
+    HEADERS_FILE,
+    SITE_MANIFEST,
+    address_by_content,
+    build_site_manifest,
+    read_site_manifest,
+    write_headers,
+    write_site_manifest,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger("fpo_flyers")
+
+COMBINED_PDF = "all_flyers.pdf"
+
+
+@dataclass
+class PipelineConfig:
+    """Settings shared by one-shot runs and ``fpo-flyers watch``."""
+
+    output_dir: Path = Path("output")
+    hash_file: Path = Path(DEFAULT_HASH_FILE)
+    feed_url: str = FEED_URL
+    extra_headers: dict[str, str] | None = None
+    scrape_workers: int = DEFAULT_MAX_WORKERS
+    # None leaves requests to one host bounded only by scrape_workers
+    scrape_per_host: int | None = None
+    scrape_deadline: float = DEFAULT_DEADLINE
+    scrape_cache: Path | None = Path(DEFAULT_CACHE_FILE)
+    scrape_cache_ttl: float = DEFAULT_TTL
+    html_parser: str = "auto"
+    jobs: int = 1
+    template_cache: Path | None = None
+    profile_render: Path | None = None
+    profiler: str = "cprofile"
+    combined_pdf: bool = False
+    content_addressed: bool = False
+    # "webp" or "png" to also write slideshow images and thumbnails
+    raster: str | None = None
+    kiosk_bundle: bool = False
+    # Only events starting in this window are scraped and rendered;
+    # upcoming_days, when set, replaces since/until with a rolling window
+    since: datetime | None = None
+    until: datetime | None = None
+    upcoming_days: int | None = None
+
+    def time_window(self, now: datetime | None = None) -> TimeWindow | None:
+        """The window events must start in, or None for the whole feed."""
+        if self.upcoming_days is not None:
+            return TimeWindow.upcoming(self.upcoming_days, now)
+        if self.since is None and self.until is None:
+            return None
+        return TimeWindow(self.since, self.until)
+
+
+@dataclass
+class RunResult:
+    """Outcome of one ``Pipeline.run()``.
+
+    ``status`` is one of ``not_modified``, ``unchanged``, ``no_events``,
+    ``done`` or ``failed``. ``written`` and ``identical`` count the flyer
+    files re-rendered this run that did and did not differ from what was
+    already on disk.
+    """
+
+    status: str
+    events: int = 0
+    rendered: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    deleted: int = 0
+    written: int = 0
+    identical: int = 0
+    metrics: Metrics = field(default_factory=Metrics)
+
+    @property
+    def exit_code(self) -> int:
+        """Process exit status for this outcome."""
+        return 1 if self.status == "failed" else 0
+
+
+class Pipeline:
+    """Runs the flyer pipeline, reusing expensive state across runs.
+
+    The HTTP session, scrape cache and (with ``jobs`` > 1) the pool of
+    warmed render workers are created on first use and kept until
+    ``close()``, so repeated runs from ``fpo-flyers watch`` only pay for
+    incremental work.
+
+    A pipeline created with ``shared`` uses that pipeline's session, cache
+    and render pool instead of its own and leaves them open on ``close()``;
+    this is how several feeds run side by side in one process.
+    """
+
+    def __init__(
+        self, config: PipelineConfig, shared: Pipeline | None = None
+    ) -> None:
+        self.config = config
+        self._shared = shared
+        self._session: requests.Session | None = None
+        self._cache: ScrapeCache | None = None
+        self._pool: ProcessPoolExecutor | None = None
+        self._store: EventStore | None = None
+        # Serialises in-process rendering between pipelines sharing state
+        self._render_lock = threading.Lock()
+        # Feed threads may all ask for the shared session, cache or pool
+        # at once; only one of each may be created
+        self._create_lock = threading.Lock()
+        self.metrics: Metrics | None = None
+
+    def __enter__(self) -> Pipeline:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the session, cache and store connections and workers."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session shared by feed and event page requests."""
+        if self._shared is not None:
+            return self._shared.session
+        with self._create_lock:
+            if self._session is None:
+                self._session = make_session(self.config.scrape_workers)
+            return self._session
+
+    @property
+    def cache(self) -> ScrapeCache | None:
+        """The scrape cache, or None when caching is disabled."""
+        if self._shared is not None:
+            return self._shared.cache
+        with self._create_lock:
+            if self._cache is None and self.config.scrape_cache is not None:
+                self._cache = ScrapeCache(
+                    self.config.scrape_cache, self.config.scrape_cache_ttl
+                )
+            return self._cache
+
+    @property
+    def store(self) -> EventStore:
+        """The event store in the output directory; never shared."""
+        if self._store is None:
+            self._store = EventStore(self.config.output_dir / STORE_FILE)
+        return self._store
+
+    def _window_moved(self, window_key: str) -> bool:
+        # Whole-feed runs need not open (or create) the store to find out
+        if not window_key and self._store is None:
+            if not (self.config.output_dir / STORE_FILE).exists():
+                return False
+        return window_key != (self.store.get_meta("window") or "")
+
+    def _load_render_state(self) -> dict[str, dict]:
+        state = self.store.render_state()
+        legacy = self.config.output_dir / MANIFEST_FILE
+        if not state and legacy.exists():
+            logger.info("Migrating %s into %s", legacy, self.store.path)
+            state = read_manifest(legacy)
+        return state
+
+    def _save_render_state(self, state: dict[str, dict]) -> None:
+        self.store.set_render_state(state, self.config.output_dir)
+        # Migrated by now; the store is the only record from here on
+        (self.config.output_dir / MANIFEST_FILE).unlink(missing_ok=True)
+
+    def _record_events(
+        self,
+        events: list[FPOEvent],
+        window: TimeWindow | None,
+        metrics: Metrics,
+    ) -> StoreDelta:
+        with metrics.timer("store_sync"):
+            delta = self.store.sync(events, window)
+        logger.info(
+            "Event store: %d new, %d changed, %d unchanged, %d removed",
+            len(delta.added),
+            len(delta.changed),
+            len(delta.unchanged),
+            len(delta.removed),
+        )
+        metrics.incr("events_added", len(delta.added))
+        metrics.incr("events_changed", len(delta.changed))
+        metrics.incr("events_removed", len(delta.removed))
+        return delta
+
+    def _render_pool(self, n_events: int) -> ProcessPoolExecutor | None:
+        if self._shared is not None:
+            return self._shared._render_pool(n_events)
+        # One-off small batches are cheaper in-process than spawning workers
+        with self._create_lock:
+            if self.config.jobs <= 1 or (self._pool is None and n_events <= 1):
+                return None
+            if self._pool is None:
+                from .renderer import make_render_pool
+
+                self._pool = make_render_pool(
+                    self.config.jobs, bytecode_cache_dir=self.config.template_cache
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        if self._shared is not None:
+            self._shared._reset_pool()
+            return
+        with self._create_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def run(self, force: bool = False) -> RunResult:
+        """Fetch the feed and bring the output directory up to date."""
+        config = self.config
+        metrics = self.metrics = Metrics()
+
+        window = config.time_window()
+        window_key = window.key if window is not None else ""
+        # A window that moved (say, at midnight) expires and admits events
+        # even when the feed itself is unchanged
+        window_moved = self._window_moved(window_key)
+        if window_moved and not force:
+            logger.info("Time window changed; re-reading the feed.")
+        refresh = force or window_moved
+
+        logger.info("Fetching ICS feed from %s", config.feed_url)
+        validators_file = validators_file_for(config.hash_file)
+        # Without a stored hash there is nothing to compare a 304 against
+        use_validators = not refresh and config.hash_file.exists()
+        validators = read_validators(validators_file) if use_validators else {}
+        with metrics.timer("feed_fetch"):
+            response = fetch_feed_conditional(
+                config.feed_url, validators, session=self.session
+            )
+        metrics.set("feed_http_status", response.status_code)
+        metrics.incr("feed_bytes", response.size)
+        if response.not_modified:
+            logger.info("Feed not modified (HTTP 304). Nothing to do.")
+            return RunResult("not_modified", metrics=metrics)
+
+        current_hash = response.feed_hash
+
+        if not refresh and not has_changed(current_hash, config.hash_file):
+            logger.info("Feed unchanged (hash %s). Nothing to do.", current_hash[:12])
+            write_validators(validators_file, response.validators)
+            return RunResult("unchanged", metrics=metrics)
+
+        logger.info("Feed changed or --force used. Generating flyers...")
+        if window is not None:
+            logger.info("Only events starting in %s", window_key)
+        with metrics.timer("feed_parse"):
+            events = list(iter_events(response.iter_lines(), window))
+        metrics.set("events", len(events))
+        output_dir = config.output_dir
+        manifest = self._load_render_state()
+        if not events:
+            if window is not None:
+                logger.warning("No FPO events start in the time window.")
+            else:
+                logger.warning("No FPO events found in feed.")
+            stale = stale_files(manifest, {})
+            _delete_stale(output_dir, stale)
+            if config.combined_pdf:
+                _delete_stale(output_dir, [COMBINED_PDF])
+            _delete_stale(output_dir, [p.name for p in kiosk_files(output_dir)])
+            self._record_events([], window, metrics)
+            self._save_render_state({})
+            write_site_manifest(
+                output_dir / SITE_MANIFEST, build_site_manifest([], {}, output_dir)
+            )
+            # An empty window is a finished run too: until the feed or the
+            # window changes, the next run has nothing to do
+            write_hash(config.hash_file, current_hash)
+            write_validators(validators_file, response.validators)
+            self.store.set_meta("window", window_key)
+            return RunResult("no_events", deleted=len(stale), metrics=metrics)
+
+        logger.info("Found %d event(s)", len(events))
+        delta = self._record_events(events, window, metrics)
+        # Events the feed left unchanged reuse what was scraped for them
+        # last time, unless that was incomplete; --force scrapes them all
+        unchanged_uids = set(delta.unchanged)
+        to_scrape = []
+        for event in events:
+            known = delta.scraped.get(event.uid)
+            if not force and event.uid in unchanged_uids and _complete(known):
+                event.dissertation_title = known["dissertation_title"]
+                event.dissertation_pdf_url = known["dissertation_pdf_url"]
+            elif event.event_url:
+                to_scrape.append(event)
+        metrics.incr("scrapes_skipped", len(events) - len(to_scrape))
+        cache = self.cache
+        # Counted per call: the cache outlives this run and may be shared
+        # with other feeds' pipelines running at the same time
+        stats = dict.fromkeys(cache.stats, 0) if cache is not None else {}
+        with metrics.timer("scrape"):
+            scraped = scrape_event_pages(
+                (event.event_url for event in to_scrape),
+                config.extra_headers,
+                session=self.session,
+                max_workers=config.scrape_workers,
+                per_host_limit=config.scrape_per_host,
+                deadline=config.scrape_deadline,
+                cache=cache,
+                html_parser=config.html_parser,
+                stats=stats,
+            )
+        if cache is not None:
+            logger.info(
+                "Scrape cache: %(hits)d hit(s), %(revalidated)d revalidated, "
+                "%(misses)d miss(es), %(stale)d stale",
+                stats,
+            )
+            for outcome, count in stats.items():
+                metrics.incr(f"scrape_cache_{outcome}", count)
+        for event in to_scrape:
+            info = scraped.get(event.event_url)
+            if not isinstance(info, dict):
+                metrics.incr("scrape_errors")
+                info = delta.scraped.get(event.uid)
+                if info is None:
+                    logger.warning(
+                        "  Could not scrape event page: %s", event.event_url
+                    )
+                    continue
+                logger.warning(
+                    "  Could not scrape event page: %s; using stored title",
+                    event.event_url,
+                )
+            event.dissertation_title = info["dissertation_title"]
+            event.dissertation_pdf_url = info["dissertation_pdf_url"]
+            logger.debug(
+                "  %s: %s",
+                event.candidate_name,
+                event.dissertation_title or "(no title found)",
+            )
+        self.store.record_scraped(to_scrape)
+        # Jinja and WeasyPrint load only once rendering may be needed
+        from .renderer import compute_template_version, render_events
+
+        template_version = compute_template_version()
+        if config.raster:
+            # Turning images on or off must re-render every flyer
+            template_version += f"+{config.raster}"
+        if config.content_addressed:
+            # So must switching between plain and content-addressed names
+            template_version += "+addressed"
+        current: dict[str, dict] = {}
+        pending: dict[str, str] = {}
+        to_render = []
+        for event in events:
+            logger.info("Processing: %s", event.candidate_name)
+            fingerprint = compute_event_fingerprint(event, template_version)
+            entry = manifest.get(event.uid)
+            if not force and is_up_to_date(entry, fingerprint, output_dir):
+                logger.info("  Unchanged, skipping render")
+                current[event.uid] = entry
+                continue
+            pending[event.uid] = fingerprint
+            to_render.append(event)
+
+        if to_render:
+            logger.info(
+                "Rendering %d flyer(s) with %d job(s)", len(to_render), config.jobs
+            )
+        if config.profile_render is not None and config.jobs > 1:
+            logger.warning(
+                "--profile-render only sees the parent process; use --jobs 1"
+            )
+        failed_uids: set[str] = set()
+        written = identical = 0
+        # Laid-out documents reused for the combined PDF
+        documents: dict[str, object] = {}
+        pool = self._render_pool(len(to_render))
+        owner = self._shared or self
+        # WeasyPrint is not safe to run from several threads at once
+        render_lock = owner._render_lock if pool is None else nullcontext()
+        with render_lock, metrics.timer("render"), profile_to(
+            config.profile_render, config.profiler
+        ):
+            for event, result in render_events(
+                to_render,
+                output_dir,
+                config.jobs,
+                bytecode_cache_dir=config.template_cache,
+                pool=pool,
+                keep_documents=config.combined_pdf,
+                raster=config.raster,
+            ):
+                if isinstance(result, Exception):
+                    failed_uids.add(event.uid)
+                    logger.error(
+                        "  Failed to render %s: %s", event.candidate_name, result
+                    )
+                    # Keep the old outputs; the stale fingerprint forces a retry
+                    if event.uid in manifest:
+                        current[event.uid] = manifest[event.uid]
+                    continue
+                metrics.observe("render_event", result.seconds)
+                metrics.incr("pdf_bytes", result.pdf_path.stat().st_size)
+                paths = result.paths
+                changed = len(paths) - result.unchanged
+                if config.content_addressed:
+                    paths = [address_by_content(path) for path in paths]
+                    # Same name as last run means same bytes
+                    previous = (manifest.get(event.uid) or {}).get("files", [])
+                    changed = sum(path.name not in previous for path in paths)
+                written += changed
+                identical += len(paths) - changed
+                logger.info("  Generated: %s", ", ".join(map(str, paths)))
+                current[event.uid] = {
+                    "fingerprint": pending[event.uid],
+                    "files": [path.name for path in paths],
+                }
+                if result.document is not None:
+                    documents[event.uid] = result.document
+        if failed_uids and pool is not None and getattr(pool, "_broken", False):
+            # A crashed worker poisons the pool; start fresh next run
+            logger.warning("Render pool broken; restarting workers next run")
+            self._reset_pool()
+
+        stale = stale_files(manifest, current)
+        _delete_stale(output_dir, stale)
+        self._record_events(events, window, metrics)
+        self._save_render_state(current)
+
+        published = [
+            e for e in events if e.uid in current and e.uid not in failed_uids
+        ]
+        combined_failed = False
+        if config.combined_pdf:
+            combined_failed = not self._write_combined_pdf(
+                published,
+                documents,
+                rebuild=bool(to_render or stale),
+                metrics=metrics,
+            )
+        if config.kiosk_bundle:
+            from .bundle import write_kiosk_bundle
+
+            with metrics.timer("kiosk_bundle"):
+                # Chronological, like the slideshow
+                bundle = write_kiosk_bundle(
+                    sorted(published, key=lambda e: (e.start, e.uid)), output_dir
+                )
+            for path, changed in bundle.items():
+                if changed:
+                    logger.info("  Generated: %s", path)
+        else:
+            _delete_stale(output_dir, [p.name for p in kiosk_files(output_dir)])
+        with metrics.timer("site_manifest"):
+            site_manifest_file = output_dir / SITE_MANIFEST
+            site_manifest = build_site_manifest(
+                events,
+                {uid: entry["files"] for uid, entry in current.items()},
+                output_dir,
+                previous=read_site_manifest(site_manifest_file),
+                changed=set(pending) - failed_uids,
+                combined=COMBINED_PDF if config.combined_pdf else None,
+                kiosk=KIOSK_BUNDLE if config.kiosk_bundle else None,
+            )
+            write_site_manifest(site_manifest_file, site_manifest)
+            if config.content_addressed:
+                write_headers(output_dir, site_manifest)
+            else:
+                _delete_stale(output_dir, [HEADERS_FILE])
+
+        failed = len(failed_uids)
+        rendered = len(to_render) - failed
+        unchanged = len(events) - len(to_render)
+        metrics.incr("flyers_rendered", rendered)
+        metrics.incr("flyers_unchanged", unchanged)
+        metrics.incr("flyers_failed", failed)
+        metrics.incr("outputs_deleted", len(stale))
+        metrics.incr("files_written", written)
+        metrics.incr("files_identical", identical)
+        logger.info(
+            "Outputs: %d written, %d identical (left untouched), %d deleted",
+            written,
+            identical,
+            len(stale),
+        )
+        result = RunResult(
+            "failed" if failed or combined_failed else "done",
+            events=len(events),
+            rendered=rendered,
+            unchanged=unchanged,
+            failed=failed,
+            deleted=len(stale),
+            written=written,
+            identical=identical,
+            metrics=metrics,
+        )
+        if failed:
+            logger.error(
+                "%d flyer(s) failed to render; hash not updated so the next run "
+                "retries them.",
+                failed,
+            )
+            return result
+        if combined_failed:
+            logger.error(
+                "Combined PDF failed; hash not updated so the next run retries it."
+            )
+            return result
+
+        write_hash(config.hash_file, current_hash)
+        write_validators(validators_file, response.validators)
+        self.store.set_meta("window", window_key)
+        logger.info("Hash updated: %s", current_hash[:12])
+        logger.info(
+            "Done. %d flyer(s) in %s (%d rendered, %d unchanged)",
+            len(events),
+            output_dir,
+            rendered,
+            unchanged,
+        )
+        return result
+
+    def _write_combined_pdf(
+        self,
+        events: list[FPOEvent],
+        documents: dict[str, object],
+        rebuild: bool,
+        metrics: Metrics,
+    ) -> bool:
+        """Rebuild ``all_flyers.pdf`` if needed; return False on failure."""
+        from .renderer import write_combined_pdf
+
+        path = self.config.output_dir / COMBINED_PDF
+        if not events:
+            _delete_stale(self.config.output_dir, [COMBINED_PDF])
+            return True
+        if not rebuild and path.exists():
+            return True
+        # Chronological, like the printed stack of flyers
+        events = sorted(events, key=lambda e: e.start)
+        # Lays out any flyer not already in ``documents``, in this thread
+        render_lock = (self._shared or self)._render_lock
+        try:
+            with render_lock, metrics.timer("combined_pdf"):
+                write_combined_pdf(events, path, documents=documents)
+        except Exception as exc:
+            logger.error("  Failed to write %s: %s", path, exc)
+            return False
+        metrics.incr("pdf_bytes", path.stat().st_size)
+        logger.info("  Generated: %s (%d page(s))", path, len(events))
+        return True
+
+
+def _complete(info: dict[str, str] | None) -> bool:
+    """Return True if a scrape result has both a title and a PDF link."""
+    return bool(
+        info and info["dissertation_title"] and info["dissertation_pdf_url"]
+    )
+
+
+def _delete_stale(output_dir: Path, names: list[str]) -> None:
+    """Remove outputs belonging to vanished or renamed events."""
+    for name in names:
+        path = output_dir / name
+        if path.exists():
+            path.unlink()
+            logger.info("Removed stale output: %s", path)
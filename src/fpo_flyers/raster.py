@@ -0,0 +1,77 @@
+"""Raster flyer images for the kiosk slideshow."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+from pathlib import Path
+
+from .atomic import replace_if_changed
+
+RASTER_FORMATS = ("webp", "png")
+# iPad portrait at 2x; images keep the letter page's aspect ratio
+IMAGE_WIDTH = 1536
+THUMBNAIL_WIDTH = 320
+THUMBNAIL_MARK = ".thumb"
+
+_MODULES = ("pypdfium2", "PIL")
+
+
+def raster_available() -> bool:
+    """Return True if the optional ``raster`` extra is installed."""
+    return all(importlib.util.find_spec(module) is not None for module in _MODULES)
+
+
+def _encode(image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        # Black text on transparency: lossless is both smaller and faster
+        # than lossy here, and keeps the type crisp
+        image.save(buffer, "WEBP", lossless=True, method=4)
+    else:
+        image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def rasterize_pdf(pdf: bytes, fmt: str = "webp") -> tuple[bytes, bytes]:
+    """Render the first page of ``pdf`` as ``(image, thumbnail)`` bytes.
+
+    The page is drawn on a transparent background, so the slideshow can
+    show it over any background colour.
+    """
+    if fmt not in RASTER_FORMATS:
+        raise ValueError(f"Unknown raster format: {fmt!r}")
+    if not raster_available():
+        raise RuntimeError("pypdfium2 and Pillow are not installed")
+    import pypdfium2
+    from PIL import Image
+
+    document = pypdfium2.PdfDocument(pdf)
+    try:
+        page = document[0]
+        bitmap = page.render(
+            scale=IMAGE_WIDTH / page.get_width(), fill_color=(0, 0, 0, 0)
+        )
+        image = bitmap.to_pil().convert("RGBA")
+    finally:
+        document.close()
+    thumbnail = image.copy()
+    thumbnail.thumbnail((THUMBNAIL_WIDTH, image.height), Image.LANCZOS)
+    return _encode(image, fmt), _encode(thumbnail, fmt)
+
+
+def write_images(
+    pdf: bytes, output_dir: Path, stem: str, fmt: str = "webp"
+) -> list[tuple[Path, bool]]:
+    """Write ``<stem>.<fmt>`` and ``<stem>.thumb.<fmt>`` rasterised from ``pdf``.
+
+    Returns each path with whether it was written, as identical images are
+    left untouched.
+    """
+    image, thumbnail = rasterize_pdf(pdf, fmt)
+    image_path = output_dir / f"{stem}.{fmt}"
+    thumbnail_path = output_dir / f"{stem}{THUMBNAIL_MARK}.{fmt}"
+    return [
+        (image_path, replace_if_changed(image_path, image)),
+        (thumbnail_path, replace_if_changed(thumbnail_path, thumbnail)),
+    ]
@@ -2,57 +2,377 @@
 
 from __future__ import annotations
 
+import hashlib
+import multiprocessing
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
+from .atomic import replace_if_changed
 from .models import FPOEvent
 
+if TYPE_CHECKING:
+    from weasyprint import Document
+
 TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+TEMPLATE_NAMES = (
+    "flyer.html",
+    "flyer_ipad.html",
+    "flyer_ipad.css",
+    "flyer_ipad_content.html",
+)
+
+_WARMUP_EVENT = FPOEvent(
+    uid="warmup",
+    candidate_name="Warmup",
+    start=datetime(2000, 1, 1, tzinfo=timezone.utc),
+    end=datetime(2000, 1, 1, tzinfo=timezone.utc),
+    location="",
+)
+
+
+def compute_template_version(templates_dir: Path = TEMPLATES_DIR) -> str:
+    """Compute SHA-256 over the flyer templates, so edits force a re-render."""
+    digest = hashlib.sha256()
+    for name in TEMPLATE_NAMES:
+        digest.update(name.encode("utf-8"))
+        digest.update((templates_dir / name).read_bytes())
+    return digest.hexdigest()
+
+
+class FlyerRenderer:
+    """Flyer templates compiled once and reused for every event.
+
+    Pass ``bytecode_cache_dir`` to persist Jinja's compiled bytecode on disk,
+    so later processes skip template compilation as well.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path = TEMPLATES_DIR,
+        bytecode_cache_dir: Path | None = None,
+    ) -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir is not None:
+            bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(bytecode_cache_dir))
+        self.env = Environment(
+            loader=FileSystemLoader(str(templates_dir)),
+            autoescape=False,
+            auto_reload=False,
+            bytecode_cache=bytecode_cache,
+        )
+        self.print_template = self.env.get_template("flyer.html")
+        self.ipad_template = self.env.get_template("flyer_ipad.html")
+
+    def render_html(self, event: FPOEvent) -> str:
+        """Render a flyer to HTML string (print layout for PDF conversion)."""
+        return self.print_template.render(event=event)
+
+    def render_ipad_html(self, event: FPOEvent) -> str:
+        """Render a flyer to HTML string (iPad portrait layout)."""
+        return self.ipad_template.render(event=event)
+
+    def render_many(self, events: Iterable[FPOEvent]) -> list[tuple[str, str]]:
+        """Render ``(print_html, ipad_html)`` for each event, in order."""
+        return [(self.render_html(e), self.render_ipad_html(e)) for e in events]
+
+
+_renderers: dict[Path, FlyerRenderer] = {}
+
+
+def get_renderer(
+    templates_dir: Path = TEMPLATES_DIR,
+    bytecode_cache_dir: Path | None = None,
+) -> FlyerRenderer:
+    """Return the process-wide renderer for ``templates_dir``.
+
+    The first call for a directory compiles its templates; later calls reuse
+    them, so ``bytecode_cache_dir`` only takes effect on that first call.
+    """
+    renderer = _renderers.get(templates_dir)
+    if renderer is None:
+        renderer = FlyerRenderer(templates_dir, bytecode_cache_dir)
+        _renderers[templates_dir] = renderer
+    return renderer
 
 
 def render_html(event: FPOEvent, templates_dir: Path = TEMPLATES_DIR) -> str:
     """Render a flyer to HTML string (print layout for PDF conversion)."""
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=False,
-    )
-    template = env.get_template("flyer.html")
-    return template.render(event=event)
+    return get_renderer(templates_dir).render_html(event)
 
 
 def render_ipad_html(event: FPOEvent, templates_dir: Path = TEMPLATES_DIR) -> str:
     """Render a flyer to HTML string (iPad portrait layout)."""
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=False,
-    )
-    template = env.get_template("flyer_ipad.html")
-    return template.render(event=event)
+    return get_renderer(templates_dir).render_ipad_html(event)
+
+
+_font_config: Any = None
+
+
+def get_font_config() -> Any:
+    """Return the process-wide WeasyPrint ``FontConfiguration``.
+
+    Sharing one configuration means fonts are discovered and loaded once
+    per process instead of once per flyer.
+    """
+    global _font_config
+    if _font_config is None:
+        from weasyprint.text.fonts import FontConfiguration
+
+        _font_config = FontConfiguration()
+    return _font_config
+
+
+# Pinned so a WeasyPrint upgrade changing its defaults cannot change our
+# bytes: fonts are subset to the glyphs used, without hinting, and the
+# file ID is the MD5 of the PDF's own objects rather than absent.
+PDF_OPTIONS = {
+    "pdf_identifier": True,
+    "full_fonts": False,
+    "hinting": False,
+    "uncompressed_pdf": False,
+}
+
+
+def source_date() -> str | None:
+    """Return ``SOURCE_DATE_EPOCH`` as a W3C date, or None when unset.
+
+    This is the reproducible-builds convention for pinning embedded
+    timestamps; an invalid value is ignored.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not epoch.isdigit():
+        return None
+    moment = datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def pdf_bytes(document: Document) -> bytes:
+    """Serialise ``document`` to PDF bytes that depend only on its content.
+
+    Creation and modification dates are both set to ``source_date()``, or
+    left out, so the same flyer always produces byte-identical output.
+    """
+    date = source_date()
+    document.metadata.created = date
+    document.metadata.modified = date
+    return document.write_pdf(**PDF_OPTIONS)
+
+
+def render_document(
+    event: FPOEvent, templates_dir: Path = TEMPLATES_DIR
+) -> Document:
+    """Lay out a flyer as a WeasyPrint document, ready to write as PDF."""
+    from weasyprint import HTML
+
+    font_config = get_font_config()
+    html = HTML(string=render_html(event, templates_dir))
+    return html.render(font_config=font_config)
 
 
 def render_pdf(
     event: FPOEvent,
     output_dir: Path,
     templates_dir: Path = TEMPLATES_DIR,
+    document: Document | None = None,
 ) -> Path:
-    """Render a flyer to PDF and return the output path."""
-    html_str = render_html(event, templates_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    """Render a flyer to PDF and return the output path.
+
+    Pass a ``document`` from ``render_document()`` to write it without
+    laying the flyer out again.
+    """
+    if document is None:
+        document = render_document(event, templates_dir)
     pdf_path = output_dir / f"{event.safe_filename}.pdf"
-    HTML(string=html_str).write_pdf(str(pdf_path))
+    replace_if_changed(pdf_path, pdf_bytes(document))
     return pdf_path
 
 
+def write_combined_pdf(
+    events: Iterable[FPOEvent],
+    path: Path,
+    templates_dir: Path = TEMPLATES_DIR,
+    documents: dict[str, Document] | None = None,
+) -> Path:
+    """Write every event's flyer into one multi-page PDF at ``path``.
+
+    Pages are copied from ``documents`` (keyed by event UID) where given,
+    so flyers rendered earlier in the run are not laid out twice; the rest
+    are laid out here. Events appear in the order given.
+    """
+    documents = documents or {}
+    laid_out = [
+        documents.get(event.uid) or render_document(event, templates_dir)
+        for event in events
+    ]
+    if not laid_out:
+        raise ValueError("No flyers to combine")
+    pages = [page for document in laid_out for page in document.pages]
+    # The first document's metadata applies to the whole file
+    replace_if_changed(path, pdf_bytes(laid_out[0].copy(pages)))
+    return path
+
+
 def render_html_flyer(
     event: FPOEvent,
     output_dir: Path,
     templates_dir: Path = TEMPLATES_DIR,
 ) -> Path:
     """Render a flyer to a standalone HTML file (iPad portrait layout)."""
-    html_str = render_ipad_html(event, templates_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return _write_html_flyer(event, output_dir, templates_dir)[0]
+
+
+def _write_html_flyer(
+    event: FPOEvent, output_dir: Path, templates_dir: Path
+) -> tuple[Path, bool]:
     html_path = output_dir / f"{event.safe_filename}.html"
-    html_path.write_text(html_str, encoding="utf-8")
-    return html_path
+    html = render_ipad_html(event, templates_dir).encode("utf-8")
+    return html_path, replace_if_changed(html_path, html)
+
+
+@dataclass
+class RenderResult:
+    """Files rendered for one event and how long rendering took.
+
+    ``unchanged`` counts the files left untouched because they already held
+    exactly what was rendered. ``document`` holds the laid-out PDF document
+    when it was requested with ``keep_documents``; it never crosses process
+    boundaries.
+    """
+
+    pdf_path: Path
+    html_path: Path
+    seconds: float = 0.0
+    unchanged: int = 0
+    document: Document | None = field(default=None, repr=False, compare=False)
+    image_paths: tuple[Path, ...] = ()
+
+    @property
+    def paths(self) -> list[Path]:
+        """Every file written for the event: PDF, HTML, then any images."""
+        return [self.pdf_path, self.html_path, *self.image_paths]
+
+
+def render_event(
+    event: FPOEvent,
+    output_dir: Path,
+    templates_dir: Path = TEMPLATES_DIR,
+    keep_document: bool = False,
+    raster: str | None = None,
+) -> RenderResult:
+    """Render the PDF and the HTML flyer for one event.
+
+    With ``raster`` (``webp`` or ``png``), the PDF is also rasterised into
+    a slideshow image and a thumbnail in the same pass.
+    """
+    start = time.perf_counter()
+    document = render_document(event, templates_dir)
+    pdf = pdf_bytes(document)
+    pdf_path = output_dir / f"{event.safe_filename}.pdf"
+    written = [replace_if_changed(pdf_path, pdf)]
+    html_path, html_written = _write_html_flyer(event, output_dir, templates_dir)
+    written.append(html_written)
+    image_paths: list[Path] = []
+    if raster:
+        from .raster import write_images
+
+        for path, image_written in write_images(
+            pdf, output_dir, event.safe_filename, raster
+        ):
+            image_paths.append(path)
+            written.append(image_written)
+    return RenderResult(
+        pdf_path,
+        html_path,
+        time.perf_counter() - start,
+        written.count(False),
+        document if keep_document else None,
+        tuple(image_paths),
+    )
+
+
+def _warm_worker(templates_dir: Path, bytecode_cache_dir: Path | None) -> None:
+    """Compile templates and load WeasyPrint fonts once per worker process."""
+    get_renderer(templates_dir, bytecode_cache_dir)
+    render_document(_WARMUP_EVENT, templates_dir)
+
+
+def make_render_pool(
+    jobs: int,
+    templates_dir: Path = TEMPLATES_DIR,
+    bytecode_cache_dir: Path | None = None,
+) -> ProcessPoolExecutor:
+    """Start ``jobs`` render workers, each warmed once on startup."""
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+        initargs=(templates_dir, bytecode_cache_dir),
+    )
+
+
+def render_events(
+    events: Iterable[FPOEvent],
+    output_dir: Path,
+    jobs: int = 1,
+    templates_dir: Path = TEMPLATES_DIR,
+    bytecode_cache_dir: Path | None = None,
+    pool: ProcessPoolExecutor | None = None,
+    keep_documents: bool = False,
+    raster: str | None = None,
+) -> Iterator[tuple[FPOEvent, RenderResult | Exception]]:
+    """Render flyers for many events, yielding results as they finish.
+
+    With ``jobs`` greater than one, events are rendered in a pool of worker
+    processes so WeasyPrint layout can use several cores. Pass a ``pool``
+    from ``make_render_pool()`` to reuse warm workers across calls; it is
+    left running. Each result is either a ``RenderResult`` or the exception
+    raised while rendering that event; one failure does not stop the batch.
+
+    With ``keep_documents``, results rendered in this process carry their
+    laid-out document for ``write_combined_pdf()``; worker results do not.
+    ``raster`` is passed on to ``render_event()``.
+    """
+    events = list(events)
+    if pool is None and (jobs <= 1 or len(events) <= 1):
+        # Compile up front so bytecode_cache_dir applies to this process too
+        get_renderer(templates_dir, bytecode_cache_dir)
+        for event in events:
+            try:
+                yield event, render_event(
+                    event, output_dir, templates_dir, keep_documents, raster
+                )
+            except Exception as exc:
+                yield event, exc
+        return
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    own_pool = pool is None
+    if own_pool:
+        pool = make_render_pool(
+            min(jobs, len(events)), templates_dir, bytecode_cache_dir
+        )
+    try:
+        futures = {
+            pool.submit(
+                render_event, event, output_dir, templates_dir, False, raster
+            ): event
+            for event in events
+        }
+        for future in as_completed(futures):
+            event = futures[future]
+            try:
+                yield event, future.result()
+            except Exception as exc:
+                yield event, exc
+    finally:
+        if own_pool:
+            pool.shutdown()
@@ -0,0 +1,167 @@
+"""Persistent SQLite cache of scraped event page results."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_CACHE_FILE = ".scrape_cache.sqlite"
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+# Pages scraped before their title or PDF link was posted are rechecked
+# this often instead of waiting out the full TTL
+INCOMPLETE_TTL = 60 * 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    dissertation_title TEXT NOT NULL,
+    dissertation_pdf_url TEXT NOT NULL,
+    etag TEXT NOT NULL DEFAULT '',
+    last_modified TEXT NOT NULL DEFAULT '',
+    fetched_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_last_used ON pages (last_used);
+"""
+
+
+@dataclass
+class CachedPage:
+    """A cached scrape result with the validators of the response it came from."""
+
+    url: str
+    dissertation_title: str
+    dissertation_pdf_url: str
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0
+
+    @property
+    def info(self) -> dict[str, str]:
+        """The result in the shape ``scrape_event_page()`` returns."""
+        return {
+            "dissertation_title": self.dissertation_title,
+            "dissertation_pdf_url": self.dissertation_pdf_url,
+        }
+
+
+class ScrapeCache:
+    """URL-keyed cache of parsed event pages, bounded by LRU eviction.
+
+    Entries younger than ``ttl`` seconds are served without a request; older
+    ones are revalidated with their ETag/Last-Modified. Entries missing a
+    title or PDF link only stay fresh for ``INCOMPLETE_TTL``. Once more than
+    ``max_entries`` pages are stored, the least recently used are evicted.
+    Safe to share between the threads of ``scrape_event_pages()``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stale": 0}
+
+    def __enter__(self) -> ScrapeCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        return count
+
+    def get(self, url: str) -> CachedPage | None:
+        """Return the cached page for ``url`` and mark it as recently used."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, dissertation_title, dissertation_pdf_url, etag,"
+                " last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE pages SET last_used = ? WHERE url = ?",
+                    (self._clock(), url),
+                )
+        return CachedPage(*row)
+
+    def record(self, outcome: str, tally: dict[str, int] | None = None) -> None:
+        """Count a lookup outcome: ``hits``, ``revalidated``, ``misses``, or
+        ``stale`` for an expired entry served because the page was unreachable.
+
+        ``tally``, if given, is counted too; callers sharing the cache use it
+        to see only their own lookups.
+        """
+        with self._lock:
+            self.stats[outcome] += 1
+            if tally is not None:
+                tally[outcome] = tally.get(outcome, 0) + 1
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Return True if ``page`` is younger than its TTL."""
+        ttl = self.ttl
+        if not (page.dissertation_title and page.dissertation_pdf_url):
+            ttl = min(ttl, INCOMPLETE_TTL)
+        return self._clock() - page.fetched_at < ttl
+
+    def put(
+        self,
+        url: str,
+        info: dict[str, str],
+        etag: str = "",
+        last_modified: str = "",
+    ) -> None:
+        """Store a freshly scraped result, evicting old entries if needed."""
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    info["dissertation_title"],
+                    info["dissertation_pdf_url"],
+                    etag,
+                    last_modified,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.execute(
+                "DELETE FROM pages WHERE url IN (SELECT url FROM pages"
+                " ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def refresh(self, url: str) -> None:
+        """Restart the TTL of ``url`` after a 304 revalidation."""
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ?, last_used = ? WHERE url = ?",
+                (now, now, url),
+            )
@@ -2,48 +2,347 @@
 
 from __future__ import annotations
 
+import functools
+import importlib.util
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from .scrape_cache import ScrapeCache
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_DEADLINE = 120.0
+
+
+def make_session(pool_size: int = DEFAULT_MAX_WORKERS) -> requests.Session:
+    """Create a session whose keep-alive pool can serve ``pool_size`` threads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 def scrape_event_page(
     url: str,
     extra_headers: dict[str, str] | None = None,
+    session: requests.Session | None = None,
+    cache: ScrapeCache | None = None,
+    html_parser: str = "auto",
+    stats: dict[str, int] | None = None,
 ) -> dict[str, str]:
     """Scrape an event page for dissertation title and PDF URL.
 
     Returns a dict with keys 'dissertation_title' and 'dissertation_pdf_url'.
+    With a ``cache``, fresh entries are returned without a request and stale
+    ones are revalidated conditionally. If revalidation fails, the stale
+    entry is returned rather than losing a known title. Cache outcomes are
+    also counted in ``stats`` when given.
     """
     headers = dict(extra_headers) if extra_headers else {}
-    resp = requests.get(
-        url,
-        headers=headers,
-        timeout=30,
-    )
-    resp.raise_for_status()
-    return parse_event_html(resp.text)
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None:
+        if cache.is_fresh(cached):
+            cache.record("hits", stats)
+            return cached.info
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
 
+    get = session.get if session is not None else requests.get
+    try:
+        resp = get(
+            url,
+            headers=headers,
+            timeout=30,
+        )
+        if cached is not None and resp.status_code == 304:
+            cache.refresh(url)
+            cache.record("revalidated", stats)
+            return cached.info
+        resp.raise_for_status()
+    except requests.RequestException:
+        if cached is None:
+            raise
+        cache.record("stale", stats)
+        return cached.info
+    info = parse_event_html(resp.text, html_parser)
+    if cache is not None:
+        cache.record("misses", stats)
+        cache.put(
+            url,
+            info,
+            resp.headers.get("ETag", ""),
+            resp.headers.get("Last-Modified", ""),
+        )
+    return info
 
-def parse_event_html(html: str) -> dict[str, str]:
-    """Parse event page HTML for dissertation info."""
-    soup = BeautifulSoup(html, "html.parser")
-    result: dict[str, str] = {
+
+def scrape_event_pages(
+    urls: Iterable[str],
+    extra_headers: dict[str, str] | None = None,
+    session: requests.Session | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host_limit: int | None = None,
+    deadline: float | None = DEFAULT_DEADLINE,
+    cache: ScrapeCache | None = None,
+    html_parser: str = "auto",
+    stats: dict[str, int] | None = None,
+) -> dict[str, dict[str, str] | Exception]:
+    """Scrape many event pages concurrently over one pooled session.
+
+    Returns a dict mapping each URL to its scrape result, or to the exception
+    that URL raised. Pages still pending when ``deadline`` seconds have passed
+    map to their cached result if there is one, else to a ``TimeoutError``.
+    No exception is raised for individual pages. At most ``per_host_limit``
+    requests go to any one host at a time; by default only ``max_workers``
+    bounds them. This call's cache outcomes are counted in ``stats``.
+    """
+    unique = list(dict.fromkeys(u for u in urls if u))
+    if not unique:
+        return {}
+
+    own_session = session is None
+    if own_session:
+        session = make_session(max_workers)
+
+    limits = {
+        host: threading.BoundedSemaphore(per_host_limit or max_workers)
+        for host in {urlsplit(u).netloc for u in unique}
+    }
+
+    def fetch(url: str) -> dict[str, str]:
+        with limits[urlsplit(url).netloc]:
+            return scrape_event_page(
+                url, extra_headers, session, cache, html_parser, stats
+            )
+
+    results: dict[str, dict[str, str] | Exception] = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {executor.submit(fetch, url): url for url in unique}
+        done, pending = wait(futures, timeout=deadline)
+        for future in done:
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as exc:
+                results[url] = exc
+        for future in pending:
+            future.cancel()
+            url = futures[future]
+            cached = cache.get(url) if cache is not None else None
+            if cached is not None:
+                # Out of time, but an older result beats none
+                cache.record("stale", stats)
+                results[url] = cached.info
+                continue
+            results[url] = TimeoutError(f"Scrape deadline of {deadline}s exceeded")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_session:
+            session.close()
+    return results
+
+
+SUBTITLE_CLASS = "event-subtitle"
+VIRTUAL_FIELD_CLASS = "field--name-field-ps-events-location-virtual"
+
+PARSER_BACKENDS = ("auto", "selectolax", "lxml", "stream", "bs4")
+
+
+def _empty_result() -> dict[str, str]:
+    return {
         "dissertation_title": "",
         "dissertation_pdf_url": "",
     }
 
+
+def _parse_bs4(html: str) -> dict[str, str]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    result = _empty_result()
+
     # Dissertation title from event-subtitle div
-    subtitle = soup.find(class_="event-subtitle")
+    subtitle = soup.find(class_=SUBTITLE_CLASS)
     if subtitle:
         result["dissertation_title"] = subtitle.get_text(strip=True)
 
     # Dissertation PDF link from the virtual location field
-    virtual_field = soup.find(
-        class_="field--name-field-ps-events-location-virtual"
-    )
+    virtual_field = soup.find(class_=VIRTUAL_FIELD_CLASS)
     if virtual_field:
         link = virtual_field.find("a", href=True)
         if link:
             result["dissertation_pdf_url"] = link["href"]
 
     return result
+
+
+def _parse_selectolax(html: str) -> dict[str, str]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    result = _empty_result()
+    subtitle = tree.css_first(f".{SUBTITLE_CLASS}")
+    if subtitle is not None:
+        result["dissertation_title"] = subtitle.text(
+            deep=True, separator="", strip=True
+        )
+    virtual_field = tree.css_first(f".{VIRTUAL_FIELD_CLASS}")
+    if virtual_field is not None:
+        link = virtual_field.css_first("a[href]")
+        if link is not None:
+            result["dissertation_pdf_url"] = link.attributes["href"] or ""
+    return result
+
+
+def _class_xpath(name: str) -> str:
+    return (
+        f"(//*[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')])[1]"
+    )
+
+
+def _parse_lxml(html: str) -> dict[str, str]:
+    from lxml import html as lxml_html
+
+    result = _empty_result()
+    if not html.strip():
+        return result
+    root = lxml_html.document_fromstring(html)
+    subtitle = root.xpath(_class_xpath(SUBTITLE_CLASS))
+    if subtitle:
+        result["dissertation_title"] = "".join(
+            text.strip() for text in subtitle[0].xpath(".//text()")
+        )
+    virtual_field = root.xpath(_class_xpath(VIRTUAL_FIELD_CLASS))
+    if virtual_field:
+        link = virtual_field[0].xpath(".//a[@href]")
+        if link:
+            result["dissertation_pdf_url"] = link[0].get("href")
+    return result
+
+
+_VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta source track wbr".split()
+)
+
+
+class _StopParsing(Exception):
+    """Raised by the streaming extractor once both fields are found."""
+
+
+class _EventFieldExtractor(HTMLParser):
+    """Stdlib tokenizer that collects just the two fields, then stops."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.result = _empty_result()
+        self._title_parts: list[str] | None = None
+        self._title_done = False
+        self._link_done = False
+        self._title_stack: list[str] = []
+        self._field_stack: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        classes = (dict(attrs).get("class") or "").split()
+        void = tag in _VOID_ELEMENTS
+        if self._title_stack and not void:
+            self._title_stack.append(tag)
+        elif not self._title_done and SUBTITLE_CLASS in classes and not void:
+            self._title_stack = [tag]
+            self._title_parts = []
+
+        if self._field_stack:
+            href = dict(attrs).get("href")
+            if tag == "a" and href is not None:
+                self.result["dissertation_pdf_url"] = href
+                self._field_stack = []
+                self._finish_link()
+            elif not void:
+                self._field_stack.append(tag)
+        elif not self._link_done and VIRTUAL_FIELD_CLASS in classes and not void:
+            self._field_stack = [tag]
+
+    def handle_startendtag(
+        self, tag: str, attrs: list[tuple[str, str | None]]
+    ) -> None:
+        if self._field_stack and tag == "a":
+            self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._title_stack and tag in self._title_stack:
+            while self._title_stack.pop() != tag:
+                pass
+            if not self._title_stack:
+                self.result["dissertation_title"] = "".join(self._title_parts)
+                self._title_done = True
+                self._check_done()
+        if self._field_stack and tag in self._field_stack:
+            while self._field_stack.pop() != tag:
+                pass
+            if not self._field_stack:
+                self._finish_link()
+
+    def handle_data(self, data: str) -> None:
+        if self._title_stack:
+            self._title_parts.append(data.strip())
+
+    def _finish_link(self) -> None:
+        self._link_done = True
+        self._check_done()
+
+    def _check_done(self) -> None:
+        if self._title_done and self._link_done:
+            raise _StopParsing
+
+
+def _parse_stream(html: str) -> dict[str, str]:
+    extractor = _EventFieldExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except _StopParsing:
+        pass
+    return extractor.result
+
+
+_PARSERS = {
+    "selectolax": _parse_selectolax,
+    "lxml": _parse_lxml,
+    "stream": _parse_stream,
+    "bs4": _parse_bs4,
+}
+
+
+@functools.cache
+def resolve_backend(backend: str = "auto") -> str:
+    """Return the concrete parser backend ``backend`` refers to.
+
+    ``auto`` picks the fastest installed one: selectolax, then lxml, then
+    BeautifulSoup.
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend!r}")
+    if backend != "auto":
+        return backend
+    for candidate, module in (("selectolax", "selectolax"), ("lxml", "lxml")):
+        if importlib.util.find_spec(module) is not None:
+            return candidate
+    return "bs4"
+
+
+def parse_event_html(html: str, backend: str = "auto") -> dict[str, str]:
+    """Parse event page HTML for dissertation info.
+
+    ``backend`` selects the parser: ``selectolax`` or ``lxml`` (optional
+    ``fast`` extra), ``stream`` (stdlib tokenizer that stops once both fields
+    are found), ``bs4``, or ``auto``. All return the same result.
+    """
+    return _PARSERS[resolve_backend(backend)](html)
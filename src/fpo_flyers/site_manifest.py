@@ -0,0 +1,190 @@
+"""Public ``manifest.json`` index of published flyers for the Pages site."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+from .atomic import replace_if_changed
+from .models import FPOEvent
+from .raster import RASTER_FORMATS, THUMBNAIL_MARK
+
+SITE_MANIFEST = "manifest.json"
+HEADERS_FILE = "_headers"
+SCHEMA_VERSION = 1
+# Hex digits of the SHA-256 used in content-addressed names and ?v= params
+DIGEST_LENGTH = 12
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_CONTENT_ADDRESSED = re.compile(rf"\.[0-9a-f]{{{DIGEST_LENGTH}}}\.[^.]+$")
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of the file at ``path``, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_content_addressed(name: str) -> bool:
+    """Return True for names like ``Jane_Doe.0123456789ab.pdf``."""
+    return _CONTENT_ADDRESSED.search(name) is not None
+
+
+def address_by_content(path: Path) -> Path:
+    """Rename ``Name.ext`` to ``Name.<digest>.ext`` and return the new path.
+
+    The name changes whenever the content does, so the file can be cached
+    forever. A file already at the target has the same content, so it is
+    kept as is and ``path`` is removed.
+    """
+    digest = file_sha256(path)[:DIGEST_LENGTH]
+    target = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+    if target.exists():
+        path.unlink()
+    else:
+        path.replace(target)
+    return target
+
+
+def file_kind(name: str) -> str:
+    """Key a file is listed under: ``pdf``, ``html``, ``image`` or ``thumbnail``."""
+    stem, _, ext = name.rpartition(".")
+    if is_content_addressed(name):
+        stem = stem.rpartition(".")[0]
+    if ext not in RASTER_FORMATS:
+        return ext
+    return "thumbnail" if stem.endswith(THUMBNAIL_MARK) else "image"
+
+
+def file_entry(path: Path) -> dict:
+    """Name, URL, size and SHA-256 of one published file.
+
+    The URL of a content-addressed file is its name; other files get a
+    ``?v=`` parameter so browsers and CDNs refetch them after each change.
+    """
+    sha256 = file_sha256(path)
+    url = path.name
+    if not is_content_addressed(path.name):
+        url = f"{path.name}?v={sha256[:DIGEST_LENGTH]}"
+    return {
+        "name": path.name,
+        "url": url,
+        "bytes": path.stat().st_size,
+        "sha256": sha256,
+    }
+
+
+def event_entry(event: FPOEvent, files: dict[str, dict]) -> dict:
+    """Describe one event and its files, keyed by ``file_kind()``."""
+    return {
+        "uid": event.uid,
+        "candidate": event.candidate_name,
+        "start": event.start.isoformat(),
+        "end": event.end.isoformat(),
+        "date": event.formatted_date,
+        "time": event.formatted_time,
+        "location": event.formatted_location,
+        "title": event.dissertation_title,
+        "dissertation_pdf_url": event.dissertation_pdf_url,
+        "event_url": event.event_url,
+        "files": files,
+    }
+
+
+def read_site_manifest(path: Path) -> dict:
+    """Read a previously written site manifest; empty if missing or corrupt."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def build_site_manifest(
+    events: Iterable[FPOEvent],
+    outputs: dict[str, list[str]],
+    output_dir: Path,
+    previous: dict | None = None,
+    changed: Iterable[str] = (),
+    combined: str | None = None,
+    kiosk: str | None = None,
+) -> dict:
+    """Build the site manifest for ``events``, sorted by start time.
+
+    ``outputs`` maps each UID to the file names published for it; events
+    without outputs are left out. File hashes from ``previous`` are reused
+    for events whose UID is not in ``changed`` and whose file names and
+    sizes still match, so an incremental run only hashes what it rendered.
+    ``combined`` and ``kiosk`` name the combined PDF and kiosk bundle, listed
+    when they exist.
+    """
+    changed = set(changed)
+    known: dict[tuple[str, str], dict] = {}
+    for entry in (previous or {}).get("events", []):
+        if entry.get("uid") in changed:
+            continue
+        for info in entry.get("files", {}).values():
+            known[(entry["uid"], info.get("name"))] = info
+
+    entries = []
+    for event in sorted(events, key=lambda e: (e.start, e.uid)):
+        names = outputs.get(event.uid)
+        if not names:
+            continue
+        files: dict[str, dict] = {}
+        for name in names:
+            path = output_dir / name
+            info = known.get((event.uid, name))
+            stale = info is None or "url" not in info
+            if stale or info.get("bytes") != path.stat().st_size:
+                info = file_entry(path)
+            files[file_kind(name)] = info
+        entries.append(event_entry(event, files))
+
+    return {
+        "version": SCHEMA_VERSION,
+        "events": entries,
+        "combined_pdf": _optional_entry(output_dir, combined),
+        "kiosk": _optional_entry(output_dir, kiosk),
+    }
+
+
+def _optional_entry(output_dir: Path, name: str | None) -> dict | None:
+    path = output_dir / name if name else None
+    return file_entry(path) if path is not None and path.exists() else None
+
+
+def write_site_manifest(path: Path, manifest: dict) -> bool:
+    """Write the manifest atomically, so the site never serves half a file.
+
+    Returns False, leaving the file untouched, if nothing changed.
+    """
+    text = json.dumps(manifest, indent=2, ensure_ascii=False) + "\n"
+    return replace_if_changed(path, text.encode("utf-8"))
+
+
+def write_headers(output_dir: Path, manifest: dict) -> Path:
+    """Write a ``_headers`` file marking content-addressed files immutable.
+
+    Netlify and Cloudflare Pages apply it; GitHub Pages ignores it and
+    serves its own short cache lifetime. The manifest itself must always
+    be revalidated, since it is how clients learn the new names.
+    """
+    names = sorted(
+        info["name"]
+        for entry in manifest.get("events", [])
+        for info in entry.get("files", {}).values()
+        if is_content_addressed(info["name"])
+    )
+    lines = [f"/{SITE_MANIFEST}", "  Cache-Control: no-cache", ""]
+    for name in names:
+        lines += [f"/{name}", f"  Cache-Control: {IMMUTABLE}", ""]
+    path = output_dir / HEADERS_FILE
+    replace_if_changed(path, "\n".join(lines).encode("utf-8"))
+    return path
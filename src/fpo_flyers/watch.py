@@ -0,0 +1,74 @@
+"""Poll the feed from one long-running process."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections.abc import Callable
+
+from .pipeline import Pipeline, RunResult
+
+logger = logging.getLogger("fpo_flyers")
+
+DEFAULT_INTERVAL = 30 * 60
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_BACKOFF = 4 * 60 * 60
+
+
+def next_delay(
+    interval: float,
+    jitter: float = DEFAULT_JITTER,
+    failures: int = 0,
+    max_backoff: float = DEFAULT_MAX_BACKOFF,
+    rng: random.Random | None = None,
+) -> float:
+    """Seconds to wait before the next poll.
+
+    After ``failures`` consecutive failed runs the interval doubles each
+    time, capped at ``max_backoff`` (but never shorter than ``interval``).
+    The result is then spread by up to ``jitter`` (a fraction) either way.
+    """
+    # Bound the exponent; the cap below applies long before this matters
+    base = interval * 2 ** min(failures, 32)
+    base = min(base, max(interval, max_backoff))
+    spread = base * jitter
+    return max(0.0, base + (rng or random).uniform(-spread, spread))
+
+
+def watch(
+    pipeline: Pipeline,
+    interval: float = DEFAULT_INTERVAL,
+    jitter: float = DEFAULT_JITTER,
+    max_backoff: float = DEFAULT_MAX_BACKOFF,
+    iterations: int | None = None,
+    on_result: Callable[[RunResult], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    rng: random.Random | None = None,
+) -> int:
+    """Run ``pipeline`` every ``interval`` seconds until interrupted.
+
+    Failed runs, whether flyers failed to render or the run raised (e.g.
+    the feed was unreachable), back off exponentially. ``on_result`` is
+    called after every completed run. Stops after ``iterations`` runs when
+    given and returns the number of runs made.
+    """
+    runs = 0
+    failures = 0
+    while iterations is None or runs < iterations:
+        try:
+            result = pipeline.run()
+        except Exception:
+            logger.exception("Run failed")
+            failures += 1
+        else:
+            failures = failures + 1 if result.exit_code else 0
+            if on_result is not None:
+                on_result(result)
+        runs += 1
+        if iterations is not None and runs >= iterations:
+            break
+        delay = next_delay(interval, jitter, failures, max_backoff, rng)
+        logger.info("Next poll in %.0f s", delay)
+        sleep(delay)
+    return runs
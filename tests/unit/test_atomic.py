@@ -0,0 +1,59 @@
+"""Tests for atomic, change-aware file writes."""
+
+import pytest
+
+from fpo_flyers.atomic import replace_if_changed, same_content
+
+
+class TestSameContent:
+    def test_missing_file(self, tmp_path):
+        assert not same_content(tmp_path / "a.txt", b"")
+
+    def test_compares_bytes(self, tmp_path):
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"abc")
+        assert same_content(path, b"abc")
+        assert not same_content(path, b"abd")
+        assert not same_content(path, b"abcd")
+
+
+class TestReplaceIfChanged:
+    def test_writes_new_file(self, tmp_path):
+        path = tmp_path / "nested" / "a.txt"
+        assert replace_if_changed(path, b"abc")
+        assert path.read_bytes() == b"abc"
+
+    def test_default_permissions(self, tmp_path):
+        path = tmp_path / "a.txt"
+        replace_if_changed(path, b"abc")
+        reference = tmp_path / "b.txt"
+        reference.write_bytes(b"abc")
+        assert path.stat().st_mode == reference.stat().st_mode
+
+    def test_identical_content_not_rewritten(self, tmp_path):
+        path = tmp_path / "a.txt"
+        replace_if_changed(path, b"abc")
+        before = path.stat()
+        assert not replace_if_changed(path, b"abc")
+        assert path.stat().st_ino == before.st_ino
+        assert path.stat().st_mtime_ns == before.st_mtime_ns
+
+    def test_changed_content_replaced(self, tmp_path):
+        path = tmp_path / "a.txt"
+        replace_if_changed(path, b"abc")
+        assert replace_if_changed(path, b"xyz")
+        assert path.read_bytes() == b"xyz"
+        assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
+
+    def test_failed_write_leaves_old_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "a.txt"
+        replace_if_changed(path, b"abc")
+
+        def fail(*args):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("fpo_flyers.atomic.os.replace", fail)
+        with pytest.raises(OSError):
+            replace_if_changed(path, b"xyz")
+        assert path.read_bytes() == b"abc"
+        assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
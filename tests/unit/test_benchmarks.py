@@ -0,0 +1,76 @@
+"""Tests for the offline pipeline benchmark harness."""
+
+from benchmarks.bench_parse_committee import descriptions
+from benchmarks.bench_parse_committee import run as run_committee
+from benchmarks.pipeline import compare, generate_feed, percentile, run
+from fpo_flyers.feed import parse_events
+
+
+class TestPercentile:
+    def test_empty(self):
+        assert percentile([], 50) == 0.0
+
+    def test_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 95) == 95.0
+        assert percentile([3.0], 95) == 3.0
+
+
+class TestGenerateFeed:
+    def test_event_count(self):
+        events = parse_events(generate_feed(5, "http://127.0.0.1:1"))
+        assert len(events) == 5
+        assert events[0].event_url == "http://127.0.0.1:1/events/0"
+        assert len(events[0].committee) == 3
+
+
+class TestCompare:
+    def _report(self, p50, throughput):
+        return {
+            "results": [
+                {
+                    "stage": "parse_events",
+                    "events": 10,
+                    "p50_ms": p50,
+                    "throughput_per_s": throughput,
+                }
+            ]
+        }
+
+    def test_no_regression(self):
+        assert compare(self._report(1.1, 95), self._report(1.0, 100), 0.2) == []
+
+    def test_latency_regression(self):
+        regressions = compare(self._report(1.5, 100), self._report(1.0, 100), 0.2)
+        assert len(regressions) == 1
+        assert "parse_events@10" in regressions[0]
+
+    def test_throughput_regression(self):
+        regressions = compare(self._report(1.0, 50), self._report(1.0, 100), 0.2)
+        assert "throughput" in regressions[0]
+
+    def test_ignores_skipped_and_new_stages(self):
+        baseline = {"results": [{"stage": "render_pdf", "events": 10, "skipped": "x"}]}
+        assert compare(self._report(9.0, 1), baseline, 0.2) == []
+
+
+class TestRun:
+    def test_offline_stages(self):
+        report = run((2,), ("fetch_feed", "parse_events", "scrape_event_page"))
+        stages = {r["stage"]: r for r in report["results"]}
+        assert set(stages) == {"fetch_feed", "parse_events", "scrape_event_page"}
+        assert stages["scrape_event_page"]["calls"] == 2
+        assert stages["fetch_feed"]["p95_ms"] >= stages["fetch_feed"]["p50_ms"]
+        assert stages["parse_events"]["peak_rss_kib"] > 0
+
+
+class TestCommitteeBenchmark:
+    def test_descriptions_repeat(self):
+        texts = descriptions(50, 5)
+        assert len(texts) == 50
+        assert len(set(texts)) <= 5
+
+    def test_run_reports_every_strategy(self):
+        results = run_committee(descriptions(20, 5), repeat=1)
+        assert set(results) == {"legacy", "compiled_cold", "memoized", "batch"}
@@ -0,0 +1,88 @@
+"""Tests for the single-file kiosk bundle."""
+
+import gzip
+from datetime import datetime, timezone
+
+import pytest
+
+from fpo_flyers import bundle
+from fpo_flyers.bundle import (
+    compressed_variants,
+    kiosk_files,
+    render_kiosk_html,
+    write_kiosk_bundle,
+)
+from fpo_flyers.models import FPOEvent
+
+
+def _events() -> list[FPOEvent]:
+    return [
+        FPOEvent(
+            uid=f"uid-{name}",
+            candidate_name=name,
+            start=datetime(2026, 3, day, 18, tzinfo=timezone.utc),
+            end=datetime(2026, 3, day, 21, tzinfo=timezone.utc),
+            location="125 - Sherrerd Hall",
+            dissertation_title=f"Thesis of {name}",
+        )
+        for day, name in ((2, "Jane Doe"), (3, "Shange Tang"))
+    ]
+
+
+class TestRenderKioskHtml:
+    def test_one_slide_per_event_in_order(self):
+        html = render_kiosk_html(_events())
+        assert html.count('<section class="slide') == 2
+        assert html.index("Jane Doe") < html.index("Shange Tang")
+
+    def test_stylesheet_included_once(self):
+        html = render_kiosk_html(_events())
+        assert html.count(".border-box {") == 1
+
+    def test_self_contained(self):
+        html = render_kiosk_html(_events())
+        assert "<iframe" not in html
+        assert "fetch(" not in html
+        assert 'src="' not in html
+
+    def test_tints_rotate(self):
+        html = render_kiosk_html(_events())
+        assert 'class="slide gold"' in html
+        assert 'class="slide olive"' in html
+
+    def test_no_events(self):
+        html = render_kiosk_html([])
+        assert "No flyers available." in html
+        assert "id=\"prevBtn\"" not in html
+
+
+class TestCompressedVariants:
+    def test_gzip_is_reproducible(self):
+        first = compressed_variants(b"<html>" * 100)[".gz"]
+        assert gzip.decompress(first) == b"<html>" * 100
+        assert compressed_variants(b"<html>" * 100)[".gz"] == first
+
+    def test_brotli(self):
+        brotli = pytest.importorskip("brotli")
+        data = compressed_variants(b"<html>" * 100)[".br"]
+        assert brotli.decompress(data) == b"<html>" * 100
+
+    def test_without_brotli(self, monkeypatch):
+        monkeypatch.setattr(bundle, "brotli_available", lambda: False)
+        assert set(compressed_variants(b"x")) == {".gz"}
+
+
+class TestWriteKioskBundle:
+    def test_writes_then_leaves_alone(self, tmp_path):
+        first = write_kiosk_bundle(_events(), tmp_path)
+        assert all(first.values())
+        assert set(first) <= set(kiosk_files(tmp_path))
+        again = write_kiosk_bundle(_events(), tmp_path)
+        assert not any(again.values())
+
+    def test_stale_brotli_removed(self, tmp_path, monkeypatch):
+        (tmp_path / "kiosk.html.br").write_bytes(b"old")
+        monkeypatch.setattr(bundle, "brotli_available", lambda: False)
+        write_kiosk_bundle(_events(), tmp_path)
+        assert not (tmp_path / "kiosk.html.br").exists()
+        assert (tmp_path / "kiosk.html.gz").exists()
@@ -1,8 +1,34 @@
 """Tests for change detection."""
 
+from datetime import datetime, timezone
 from pathlib import Path
 
-from fpo_flyers.change_detection import has_changed, read_stored_hash, write_hash
+from fpo_flyers.change_detection import (
+    compute_event_fingerprint,
+    has_changed,
+    is_up_to_date,
+    read_manifest,
+    read_stored_hash,
+    read_validators,
+    stale_files,
+    validators_file_for,
+    write_hash,
+    write_manifest,
+    write_validators,
+)
+from fpo_flyers.models import FPOEvent
+
+
+def _make_event(**kwargs) -> FPOEvent:
+    defaults = {
+        "uid": "test-uid-1",
+        "candidate_name": "Shange Tang",
+        "start": datetime(2026, 3, 2, 18, 0, tzinfo=timezone.utc),
+        "end": datetime(2026, 3, 2, 19, 30, tzinfo=timezone.utc),
+        "location": "125 - Sherrerd Hall",
+    }
+    defaults.update(kwargs)
+    return FPOEvent(**defaults)
 
 
 class TestReadStoredHash:
@@ -41,3 +67,100 @@ class TestHasChanged:
         f = tmp_path / ".feed_hash"
         f.write_text("abc\n")
         assert has_changed("xyz", f) is True
+
+
+class TestValidators:
+    def test_file_next_to_hash_file(self, tmp_path):
+        path = validators_file_for(tmp_path / ".feed_hash")
+        assert path == tmp_path / ".feed_hash.validators"
+
+    def test_missing_file(self, tmp_path):
+        assert read_validators(tmp_path / "missing") == {}
+
+    def test_roundtrip(self, tmp_path):
+        f = tmp_path / ".feed_hash.validators"
+        write_validators(f, {"etag": '"v1"', "last_modified": "Wed"})
+        assert read_validators(f) == {"etag": '"v1"', "last_modified": "Wed"}
+
+    def test_empty_removes_file(self, tmp_path):
+        f = tmp_path / ".feed_hash.validators"
+        f.write_text('{"etag": "old"}')
+        write_validators(f, {})
+        assert not f.exists()
+
+
+class TestComputeEventFingerprint:
+    def test_deterministic(self):
+        assert compute_event_fingerprint(_make_event(), "v1") == (
+            compute_event_fingerprint(_make_event(), "v1")
+        )
+
+    def test_changes_with_field(self):
+        a = compute_event_fingerprint(_make_event(), "v1")
+        b = compute_event_fingerprint(_make_event(description_raw="edited"), "v1")
+        assert a != b
+
+    def test_changes_with_scraped_title(self):
+        a = compute_event_fingerprint(_make_event(), "v1")
+        b = compute_event_fingerprint(_make_event(dissertation_title="T"), "v1")
+        assert a != b
+
+    def test_changes_with_template_version(self):
+        event = _make_event()
+        assert compute_event_fingerprint(event, "v1") != (
+            compute_event_fingerprint(event, "v2")
+        )
+
+
+class TestManifest:
+    def test_missing_file(self, tmp_path):
+        assert read_manifest(tmp_path / "missing.json") == {}
+
+    def test_corrupt_file(self, tmp_path):
+        f = tmp_path / "manifest.json"
+        f.write_text("{not json")
+        assert read_manifest(f) == {}
+
+    def test_roundtrip(self, tmp_path):
+        f = tmp_path / "out" / "manifest.json"
+        manifest = {"uid-1": {"fingerprint": "abc", "files": ["A.pdf", "A.html"]}}
+        write_manifest(f, manifest)
+        assert read_manifest(f) == manifest
+
+
+class TestIsUpToDate:
+    def test_no_entry(self, tmp_path):
+        assert is_up_to_date(None, "abc", tmp_path) is False
+
+    def test_fingerprint_mismatch(self, tmp_path):
+        (tmp_path / "A.pdf").write_bytes(b"%PDF")
+        entry = {"fingerprint": "old", "files": ["A.pdf"]}
+        assert is_up_to_date(entry, "new", tmp_path) is False
+
+    def test_missing_output(self, tmp_path):
+        entry = {"fingerprint": "abc", "files": ["A.pdf"]}
+        assert is_up_to_date(entry, "abc", tmp_path) is False
+
+    def test_match(self, tmp_path):
+        (tmp_path / "A.pdf").write_bytes(b"%PDF")
+        entry = {"fingerprint": "abc", "files": ["A.pdf"]}
+        assert is_up_to_date(entry, "abc", tmp_path) is True
+
+
+class TestStaleFiles:
+    def test_vanished_uid(self):
+        old = {
+            "uid-1": {"fingerprint": "a", "files": ["A.pdf", "A.html"]},
+            "uid-2": {"fingerprint": "b", "files": ["B.pdf", "B.html"]},
+        }
+        current = {"uid-1": old["uid-1"]}
+        assert stale_files(old, current) == ["B.pdf", "B.html"]
+
+    def test_renamed_output(self):
+        old = {"uid-1": {"fingerprint": "a", "files": ["A.pdf"]}}
+        current = {"uid-1": {"fingerprint": "b", "files": ["A2.pdf"]}}
+        assert stale_files(old, current) == ["A.pdf"]
+
+    def test_nothing_stale(self):
+        old = {"uid-1": {"fingerprint": "a", "files": ["A.pdf"]}}
+        assert stale_files(old, old) == []
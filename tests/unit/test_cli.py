@@ -0,0 +1,77 @@
+"""Tests for CLI startup cost."""
+
+import json
+import subprocess
+import sys
+import textwrap
+
+# Modules only needed once something has to be scraped or rendered
+HEAVY_MODULES = ("weasyprint", "bs4", "icalendar", "jinja2", "lxml", "selectolax")
+# Generous enough for slow CI machines; a regression to importing WeasyPrint
+# eagerly costs several times this
+IMPORT_BUDGET_SECONDS = 1.0
+
+_NO_OP_RUN = textwrap.dedent(
+    """
+    import json, sys, tempfile
+    from pathlib import Path
+
+    import responses
+    from click.testing import CliRunner
+
+    from fpo_flyers.cli import main
+
+    feed = "https://example.org/feed.ics"
+    with tempfile.TemporaryDirectory() as tmp, responses.RequestsMock() as mock:
+        mock.add(responses.GET, feed, status={status}, body={body!r})
+        hash_file = Path(tmp) / ".feed_hash"
+        hash_file.write_text({stored_hash!r})
+        result = CliRunner().invoke(
+            main,
+            ["--feed-url", feed, "--hash-file", str(hash_file),
+             "--output-dir", str(Path(tmp) / "out")],
+        )
+    print(json.dumps({{
+        "exit_code": result.exit_code,
+        "loaded": [m for m in {heavy!r} if m in sys.modules],
+    }}))
+    """
+)
+
+
+def _run_no_op(status: int, body: str = "", stored_hash: str = "x") -> dict:
+    code = _NO_OP_RUN.format(
+        status=status, body=body, stored_hash=stored_hash, heavy=HEAVY_MODULES
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class TestStartup:
+    def test_not_modified_run_skips_heavy_imports(self):
+        outcome = _run_no_op(304)
+        assert outcome == {"exit_code": 0, "loaded": []}
+
+    def test_unchanged_feed_skips_heavy_imports(self, sample_feed_ics):
+        from fpo_flyers.feed import compute_feed_hash
+
+        outcome = _run_no_op(200, sample_feed_ics, compute_feed_hash(sample_feed_ics))
+        assert outcome == {"exit_code": 0, "loaded": []}
+
+    def test_import_time_budget(self):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import fpo_flyers.cli"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Lines look like "import time:  self [us] | cumulative | name"
+        cumulative = {
+            fields[2].strip(): int(fields[1])
+            for line in proc.stderr.splitlines()
+            if line.startswith("import time:") and "[us]" not in line
+            for fields in [line.removeprefix("import time:").split("|")]
+        }
+        assert cumulative["fpo_flyers.cli"] / 1e6 < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,199 @@
+"""Tests for the SQLite event store."""
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from fpo_flyers.cli import main
+from fpo_flyers.event_store import STORE_FILE, EventStore, StoreDelta
+from fpo_flyers.feed import TimeWindow
+from fpo_flyers.models import CommitteeMember, FPOEvent
+
+
+def _make_event(**kwargs) -> FPOEvent:
+    defaults = {
+        "uid": "test-uid-1",
+        "candidate_name": "Shange Tang",
+        "start": datetime(2026, 3, 2, 18, 0, tzinfo=timezone.utc),
+        "end": datetime(2026, 3, 2, 19, 30, tzinfo=timezone.utc),
+        "location": "125 - Sherrerd Hall",
+    }
+    defaults.update(kwargs)
+    return FPOEvent(**defaults)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def store(tmp_path):
+    with EventStore(tmp_path / "events.sqlite", clock=_Clock()) as store:
+        yield store
+
+
+class TestSync:
+    def test_delta(self, store):
+        a = _make_event(uid="a")
+        b = _make_event(uid="b")
+        assert store.sync([a, b]) == StoreDelta(added=["a", "b"])
+
+        c = _make_event(uid="c")
+        moved = _make_event(uid="b", location="Friend 101")
+        assert store.sync([a, moved, c]) == StoreDelta(
+            added=["c"], changed=["b"], unchanged=["a"]
+        )
+        assert store.sync([moved]) == StoreDelta(unchanged=["b"], removed=["a", "c"])
+
+    def test_window_leaves_outside_events_alone(self, store):
+        past = _make_event(uid="past", start=datetime(2026, 1, 5, tzinfo=timezone.utc))
+        gone = _make_event(uid="gone")
+        store.sync([past, gone])
+        window = TimeWindow(since=datetime(2026, 3, 1, tzinfo=timezone.utc))
+        assert store.sync([], window) == StoreDelta(removed=["gone"])
+        assert store.sync([past]).unchanged == ["past"]
+
+    def test_scraped_fields_do_not_change_the_revision(self, store):
+        event = _make_event()
+        store.sync([event])
+        event.dissertation_title = "Thesis"
+        store.record_scraped([event])
+
+        delta = store.sync([_make_event()])
+        assert delta.unchanged == ["test-uid-1"]
+        assert delta.scraped["test-uid-1"]["dissertation_title"] == "Thesis"
+        assert [e.dissertation_title for _, _, e in store.history("test-uid-1")] == [
+            "Thesis"
+        ]
+
+    def test_meta(self, store):
+        assert store.get_meta("window") is None
+        store.set_meta("window", "a")
+        store.set_meta("window", "b")
+        assert store.get_meta("window") == "b"
+
+    def test_duplicate_uids_counted_once(self, store):
+        event = _make_event()
+        assert store.sync([event, event]) == StoreDelta(added=["test-uid-1"])
+
+    def test_returning_event_continues_history(self, store):
+        event = _make_event()
+        store.sync([event])
+        store.sync([])
+        assert store.sync([event]).added == ["test-uid-1"]
+        assert [r for r, _, _ in store.history("test-uid-1")] == [1, 2]
+
+    def test_history_round_trips_fields(self, store):
+        first = _make_event(
+            committee=[CommitteeMember("Jane Roe", is_chair=True)],
+            dissertation_title="Thesis",
+        )
+        second = _make_event(location="Friend 101")
+        store._clock.now = 2000.0
+        store.sync([first])
+        store._clock.now = 3000.0
+        store.sync([second])
+        assert store.history("test-uid-1") == [
+            (1, 2000.0, first),
+            (2, 3000.0, second),
+        ]
+
+    def test_persists_across_connections(self, tmp_path):
+        path = tmp_path / "events.sqlite"
+        with EventStore(path) as store:
+            store.sync([_make_event()])
+        with EventStore(path) as store:
+            assert store.sync([_make_event()]).unchanged == ["test-uid-1"]
+
+
+class TestEventsBetween:
+    def test_window_and_removed(self, store):
+        early = _make_event(
+            uid="early", start=datetime(2026, 3, 1, tzinfo=timezone.utc)
+        )
+        late = _make_event(
+            uid="late", start=datetime(2026, 3, 9, tzinfo=timezone.utc)
+        )
+        store.sync([late, early])
+        march = (
+            datetime(2026, 3, 1, tzinfo=timezone.utc),
+            datetime(2026, 3, 9, tzinfo=timezone.utc),
+        )
+        assert [e.uid for e in store.events_between(*march)] == ["early"]
+
+        store.sync([late])
+        assert store.events_between(*march) == []
+        assert store.events_between(*march, include_removed=True) == [early]
+
+
+class TestRenderState:
+    def test_round_trip_keeps_file_order(self, store, tmp_path):
+        for name in ("b.pdf", "a.html"):
+            (tmp_path / name).write_bytes(b"x")
+        state = {"uid": {"fingerprint": "f1", "files": ["b.pdf", "a.html"]}}
+        store.set_render_state(state, tmp_path)
+        assert store.render_state() == state
+        assert set(store.output_hashes()) == {"a.html", "b.pdf"}
+
+    def test_missing_files_left_out(self, store, tmp_path):
+        (tmp_path / "a.pdf").write_bytes(b"x")
+        state = {"uid": {"fingerprint": "f1", "files": ["a.pdf", "gone.html"]}}
+        store.set_render_state(state, tmp_path)
+        assert store.render_state()["uid"]["files"] == ["a.pdf"]
+
+    def test_hash_tracks_content(self, store, tmp_path):
+        path = tmp_path / "a.pdf"
+        state = {"uid": {"fingerprint": "f1", "files": ["a.pdf"]}}
+        path.write_bytes(b"one")
+        store.set_render_state(state, tmp_path)
+        first = store.output_hashes()["a.pdf"]
+        path.write_bytes(b"two!")
+        store.set_render_state(state, tmp_path)
+        assert store.output_hashes()["a.pdf"] != first
+        store.set_render_state({}, tmp_path)
+        assert store.render_state() == {}
+
+    def test_same_size_rerender_is_rehashed(self, store, tmp_path):
+        path = tmp_path / "a.pdf"
+        path.write_bytes(b"one")
+        state = {"uid": {"fingerprint": "f1", "files": ["a.pdf"]}}
+        store.set_render_state(state, tmp_path)
+        # Same length, new content and fingerprint
+        path.write_bytes(b"two")
+        state["uid"]["fingerprint"] = "f2"
+        store.set_render_state(state, tmp_path)
+        assert store.output_hashes()["a.pdf"] == hashlib.sha256(b"two").hexdigest()
+
+
+class TestEventsCommand:
+    def test_lists_upcoming_from_store(self, tmp_path):
+        soon = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+        events = [
+            _make_event(uid="soon", start=soon, end=soon + timedelta(hours=2)),
+            _make_event(
+                uid="later",
+                candidate_name="Jane Doe",
+                start=soon + timedelta(days=30),
+                end=soon + timedelta(days=30, hours=2),
+            ),
+        ]
+        with EventStore(tmp_path / STORE_FILE) as store:
+            store.sync(events)
+
+        result = CliRunner().invoke(main, ["--output-dir", str(tmp_path), "events"])
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            f"{events[0].formatted_date}, {events[0].formatted_time_location}: "
+            "Shange Tang"
+        ]
+
+    def test_missing_store(self, tmp_path):
+        result = CliRunner().invoke(main, ["--output-dir", str(tmp_path), "events"])
+        assert result.exit_code == 1
+        assert "No event store" in result.output
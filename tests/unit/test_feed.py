@@ -1,15 +1,35 @@
 """Tests for ICS feed parsing and hashing."""
 
+import gzip
+import hashlib
+import re
+import shutil
+import subprocess
+from datetime import datetime, timezone
+
+import pytest
 import responses
+from hypothesis import given
+from hypothesis import strategies as st
+from responses import matchers
 
+from fpo_flyers import feed
 from fpo_flyers.feed import (
     FEED_URL,
+    FeedHasher,
+    FeedResponse,
+    TimeWindow,
     compute_feed_hash,
     extract_candidate_name,
     fetch_feed,
+    fetch_feed_conditional,
+    iter_events,
     parse_committee,
+    parse_committees,
     parse_events,
+    unfold_lines,
 )
+from fpo_flyers.models import EASTERN, CommitteeMember
 
 
 class TestExtractCandidateName:
@@ -41,6 +61,119 @@ class TestParseCommittee:
     def test_no_professors_keyword(self):
         assert parse_committee("Some random text") == []
 
+    def test_prof_abbreviation_list(self):
+        desc = "Committee: Prof. Ann Lee (Chair), Prof. Bob Ray, and Prof. Carl Fox."
+        assert [(m.name, m.is_chair) for m in parse_committee(desc)] == [
+            ("Ann Lee", True),
+            ("Bob Ray", False),
+            ("Carl Fox", False),
+        ]
+
+    def test_co_chairs_after_pair(self):
+        desc = "Professors Ann Lee and Bob Ray (Co-Chairs), Carl Fox, and Dee Moe."
+        assert [m.is_chair for m in parse_committee(desc)] == [
+            True,
+            True,
+            False,
+            False,
+        ]
+
+    def test_co_chair_each(self):
+        desc = "Professors Ann Lee (Co-Chair), Bob Ray (co-chair), and Carl Fox"
+        members = parse_committee(desc)
+        assert [m.name for m in members] == ["Ann Lee", "Bob Ray", "Carl Fox"]
+        assert [m.is_chair for m in members] == [True, True, False]
+
+    def test_comma_inside_chair_note(self):
+        desc = "Professors Ann Lee (Chair of the Committee, and Adviser), Bob Ray"
+        assert [m.name for m in parse_committee(desc)] == ["Ann Lee", "Bob Ray"]
+
+    def test_folded_whitespace_in_names(self):
+        desc = "Professors Jianqing\n Fan (Chair), and Liza Rebrova."
+        members = parse_committee(desc)
+        assert members[0].name == "Jianqing Fan"
+
+    def test_memoized_but_returns_fresh_lists(self):
+        desc = "Professors Ann Lee (Chair) and Bob Ray."
+        first = parse_committee(desc)
+        first.append(None)
+        assert len(parse_committee(desc)) == 2
+
+    def test_batch_matches_single(self):
+        descs = ["Professors A B and C D.", "", "Professor E F (Chair)"] * 2
+        assert parse_committees(descs) == [parse_committee(d) for d in descs]
+
+
+_NAME_PART = st.text(
+    alphabet=st.characters(whitelist_categories=("Lu", "Ll")), min_size=1, max_size=8
+).filter(lambda w: w.lower() not in {"and", "prof", "professor", "professors"})
+_NAME = st.lists(_NAME_PART, min_size=1, max_size=3).map(" ".join)
+_COMMITTEE = st.lists(st.tuples(_NAME, st.booleans()), min_size=1, max_size=6)
+
+
+def _describe(committee):
+    names = [
+        f"{name} (Chair of the Committee)" if chair else name
+        for name, chair in committee
+    ]
+    if len(names) == 1:
+        listed = names[0]
+    else:
+        listed = ", ".join(names[:-1]) + ", and " + names[-1]
+    title = "Professors" if len(names) > 1 else "Professor"
+    return f"The examining committee members are {title} {listed}."
+
+
+def _reference_parse_committee(description: str) -> list[CommitteeMember]:
+    """``parse_committee()`` as it was before patterns were precompiled."""
+    match = re.search(
+        r"(?:Professors?|Prof\.)\s+(.+)",
+        description,
+        re.IGNORECASE | re.DOTALL,
+    )
+    if not match:
+        return []
+
+    text = match.group(1).strip().rstrip(".")
+    text = re.sub(r",?\s+and\s+", ", ", text)
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+
+    members: list[CommitteeMember] = []
+    for part in parts:
+        is_chair = False
+        if "(Chair" in part:
+            is_chair = True
+            part = re.sub(r"\s*\(Chair[^)]*\)", "", part).strip()
+        if part:
+            members.append(CommitteeMember(name=part, is_chair=is_chair))
+    return members
+
+
+class TestParseCommitteeProperties:
+    @given(_COMMITTEE)
+    def test_round_trip(self, committee):
+        members = parse_committee(_describe(committee))
+        assert [(m.name, m.is_chair) for m in members] == committee
+
+    @given(_COMMITTEE)
+    def test_matches_reference(self, committee):
+        desc = _describe(committee)
+        members = parse_committee(desc)
+        assert members == _reference_parse_committee(desc)
+
+    @given(st.text(max_size=200))
+    def test_never_fails_and_names_are_clean(self, text):
+        for member in parse_committee(text):
+            assert member.name == member.name.strip()
+            assert member.name
+            assert "(" not in member.name or "chair" not in member.name.lower()
+
+    @given(st.lists(st.sampled_from(["Professors A B and C.", "", "x", "Prof. Q"])))
+    def test_batch_matches_single(self, descriptions):
+        assert parse_committees(descriptions) == [
+            parse_committee(d) for d in descriptions
+        ]
+
 
 class TestParseEvents:
     def test_parse_sample_feed(self, sample_feed_ics):
@@ -63,6 +196,116 @@ class TestParseEvents:
         assert e.location == "101 - Friend Center"
 
 
+class TestTimeWindow:
+    def test_half_open(self):
+        since = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        until = datetime(2026, 4, 1, tzinfo=timezone.utc)
+        window = TimeWindow(since, until)
+        assert since in window
+        assert until not in window
+        assert datetime(2026, 2, 28, tzinfo=timezone.utc) not in window
+        assert until in TimeWindow(since=since)
+        assert since in TimeWindow(until=until)
+
+    def test_upcoming_starts_at_eastern_midnight(self):
+        # 1 am UTC on March 8 is still March 7 in New York
+        now = datetime(2026, 3, 8, 1, 0, tzinfo=timezone.utc)
+        window = TimeWindow.upcoming(2, now)
+        assert window.since == datetime(2026, 3, 7, tzinfo=EASTERN)
+        # Across the DST change the window still ends at midnight
+        assert window.until == datetime(2026, 3, 9, tzinfo=EASTERN)
+        assert window.until.utcoffset() != window.since.utcoffset()
+
+    def test_key_tracks_bounds(self):
+        now = datetime(2026, 3, 8, 12, 0, tzinfo=timezone.utc)
+        later = datetime(2026, 3, 8, 23, 0, tzinfo=timezone.utc)
+        tomorrow = datetime(2026, 3, 9, 12, 0, tzinfo=timezone.utc)
+        key = TimeWindow.upcoming(7, now).key
+        assert TimeWindow.upcoming(7, later).key == key
+        assert TimeWindow.upcoming(7, tomorrow).key != key
+        assert TimeWindow().key == "/"
+
+
+class TestUnfoldLines:
+    def test_joins_continuations(self):
+        lines = ["DESCRIPTION:The examining\r\n", "  committee\r\n", "\tmembers\r\n"]
+        assert list(unfold_lines(lines)) == ["DESCRIPTION:The examining committeemembers"]
+
+    def test_plain_lines(self):
+        assert list(unfold_lines(["A:1\n", "B:2"])) == ["A:1", "B:2"]
+
+
+class TestIterEvents:
+    def test_matches_parse_events(self, sample_feed_ics):
+        streamed = list(iter_events(sample_feed_ics.split("\n")))
+        assert streamed == parse_events(sample_feed_ics)
+
+    def test_window(self, sample_feed_ics):
+        april = TimeWindow(since=datetime(2026, 4, 1, tzinfo=timezone.utc))
+        streamed = list(iter_events(sample_feed_ics.split("\n"), april))
+        assert [e.candidate_name for e in streamed] == ["Jane Doe"]
+        assert streamed == parse_events(sample_feed_ics, april)
+
+    def test_is_lazy(self, sample_feed_ics):
+        events = iter_events(iter(sample_feed_ics.split("\n")))
+        first = next(events)
+        assert first.candidate_name == "Shange Tang"
+
+    def test_reads_file(self, tmp_path, sample_feed_ics):
+        path = tmp_path / "feed.ics"
+        path.write_text(sample_feed_ics.replace("\n", "\r\n"), newline="")
+        with path.open(encoding="utf-8", newline="") as f:
+            events = list(iter_events(f))
+        assert [e.candidate_name for e in events] == ["Shange Tang", "Jane Doe"]
+
+    def test_folded_description(self):
+        lines = [
+            "BEGIN:VCALENDAR",
+            "BEGIN:VEVENT",
+            "UID:folded",
+            "SUMMARY:FPO\\, Jane Doe",
+            "DTSTART:20260415T170000Z",
+            "DESCRIPTION:The examining committee members are Professors Alice Sm",
+            " ith (Chair of the Committee)\\, Bob Jones\\, and Carol White.",
+            "END:VEVENT",
+            "END:VCALENDAR",
+        ]
+        (event,) = iter_events(lines)
+        assert [m.name for m in event.committee] == [
+            "Alice Smith",
+            "Bob Jones",
+            "Carol White",
+        ]
+
+    def test_skips_other_components_and_keeps_nested(self):
+        lines = [
+            "BEGIN:VCALENDAR",
+            "BEGIN:VTIMEZONE",
+            "TZID:America/New_York",
+            "BEGIN:STANDARD",
+            "DTSTART:19701101T020000",
+            "END:STANDARD",
+            "END:VTIMEZONE",
+            "BEGIN:VTODO",
+            "UID:todo",
+            "END:VTODO",
+            "BEGIN:VEVENT",
+            "UID:with-alarm",
+            "SUMMARY:FPO\\, Jane Doe",
+            "DTSTART;TZID=America/New_York:20260415T130000",
+            "BEGIN:VALARM",
+            "ACTION:DISPLAY",
+            "END:VALARM",
+            "LOCATION:101 - Friend Center",
+            "END:VEVENT",
+            "END:VCALENDAR",
+        ]
+        (event,) = iter_events(lines)
+        assert event.uid == "with-alarm"
+        assert event.location == "101 - Friend Center"
+        assert event.start_eastern.hour == 13
+
+
 class TestFetchFeed:
     @responses.activate
     def test_fetch_success(self, sample_feed_ics):
@@ -79,6 +322,89 @@ class TestFetchFeed:
             fetch_feed()
 
 
+class TestFetchFeedConditional:
+    @responses.activate
+    def test_returns_validators(self, sample_feed_ics):
+        responses.add(
+            responses.GET,
+            FEED_URL,
+            body=sample_feed_ics,
+            headers={"ETag": '"v1"', "Last-Modified": "Wed, 25 Feb 2026 16:21:01 GMT"},
+        )
+        resp = fetch_feed_conditional()
+        assert resp.not_modified is False
+        assert "VCALENDAR" in resp.text
+        assert resp.validators == {
+            "etag": '"v1"',
+            "last_modified": "Wed, 25 Feb 2026 16:21:01 GMT",
+        }
+
+    @responses.activate
+    def test_sends_validators_and_handles_304(self):
+        responses.add(
+            responses.GET,
+            FEED_URL,
+            status=304,
+            match=[
+                matchers.header_matcher(
+                    {
+                        "If-None-Match": '"v1"',
+                        "If-Modified-Since": "Wed, 25 Feb 2026 16:21:01 GMT",
+                    }
+                )
+            ],
+        )
+        resp = fetch_feed_conditional(
+            FEED_URL,
+            {"etag": '"v1"', "last_modified": "Wed, 25 Feb 2026 16:21:01 GMT"},
+        )
+        assert resp.not_modified is True
+        assert resp.text == ""
+        assert resp.validators["etag"] == '"v1"'
+
+    @responses.activate
+    def test_no_conditional_headers_without_validators(self, sample_feed_ics):
+        responses.add(responses.GET, FEED_URL, body=sample_feed_ics)
+        fetch_feed_conditional()
+        headers = responses.calls[0].request.headers
+        assert "If-None-Match" not in headers
+        assert "If-Modified-Since" not in headers
+
+    @responses.activate
+    def test_accepts_gzip(self, sample_feed_ics):
+        responses.add(
+            responses.GET,
+            FEED_URL,
+            body=gzip.compress(sample_feed_ics.encode("utf-8")),
+            headers={"Content-Encoding": "gzip"},
+        )
+        resp = fetch_feed_conditional()
+        assert "gzip" in responses.calls[0].request.headers["Accept-Encoding"]
+        assert resp.text == sample_feed_ics
+
+    @responses.activate
+    def test_decodes_characters_split_across_chunks(self, monkeypatch):
+        monkeypatch.setattr(feed, "CHUNK_SIZE", 1)
+        body = "SUMMARY:FPO – Zoë\r\n".encode("utf-8")
+        responses.add(responses.GET, FEED_URL, body=body)
+        resp = fetch_feed_conditional()
+        assert resp.text == "SUMMARY:FPO – Zoë\r\n"
+        assert resp.size == len(body)
+
+
+class TestFeedResponseLines:
+    @pytest.mark.parametrize("text", ["", "A\r\nB\r\n", "A\nB", "\n\nC"])
+    def test_matches_splitlines(self, text):
+        lines = list(FeedResponse(text=text).iter_lines())
+        assert lines == text.splitlines(keepends=True)
+
+    def test_parses_like_split(self, sample_feed_ics):
+        lines = FeedResponse(text=sample_feed_ics).iter_lines()
+        assert list(iter_events(lines)) == list(
+            iter_events(sample_feed_ics.split("\n"))
+        )
+
+
 class TestComputeFeedHash:
     def test_deterministic(self, sample_feed_ics):
         h1 = compute_feed_hash(sample_feed_ics)
@@ -95,3 +421,75 @@ class TestComputeFeedHash:
         feed_a = "BEGIN:VEVENT\nSUMMARY:Test A\nEND:VEVENT"
         feed_b = "BEGIN:VEVENT\nSUMMARY:Test B\nEND:VEVENT"
         assert compute_feed_hash(feed_a) != compute_feed_hash(feed_b)
+
+
+def _reference_hash(ics_text: str) -> str:
+    """The original list-based implementation of compute_feed_hash()."""
+    lines = ics_text.splitlines()
+    filtered = [line for line in lines if not line.startswith("DTSTAMP")]
+    return hashlib.sha256("\n".join(filtered).encode("utf-8")).hexdigest()
+
+
+HASH_CASES = [
+    "",
+    "\n",
+    "\n\n",
+    "A:1",
+    "A:1\n",
+    "A:1\r\nDTSTAMP:2026\r\nB:2\r\n",
+    "DTSTAMP:x\nA:1",
+    "A:1\n\nB:2\n\n",
+    "A:1\rB:2\r\n\rC:3",
+    "A:1\x0bB\x0cC\x1cD\x1dE\x1eF",
+    "A:caf\u00e9\u2028B:\u2029C:\x85D",
+    "A:\u4e2d\u6587\r\nDTSTAMP:1\r\n",
+]
+
+
+class TestFeedHasher:
+    @pytest.mark.parametrize("text", HASH_CASES)
+    def test_matches_reference_for_every_chunking(self, text):
+        data = text.encode("utf-8")
+        expected = _reference_hash(text)
+        for size in range(1, max(len(data), 1) + 1):
+            hasher = FeedHasher()
+            for i in range(0, len(data), size):
+                hasher.update(data[i : i + size])
+            assert hasher.hexdigest() == expected, size
+
+    def test_matches_reference_on_fixture(self, sample_feed_ics):
+        crlf = sample_feed_ics.replace("\n", "\r\n")
+        for text in (sample_feed_ics, crlf):
+            hasher = FeedHasher()
+            data = text.encode("utf-8")
+            for i in range(0, len(data), 7):
+                hasher.update(data[i : i + 7])
+            assert hasher.hexdigest() == _reference_hash(text)
+
+    @pytest.mark.skipif(
+        not all(shutil.which(t) for t in ("bash", "perl", "sha256sum")),
+        reason="shell tools not available",
+    )
+    def test_matches_workflow_pipeline(self, sample_feed_ics):
+        data = sample_feed_ics.replace("\n", "\r\n").encode("utf-8")
+        out = subprocess.run(
+            [
+                "bash",
+                "-c",
+                "tr -d '\\r' | grep -v '^DTSTAMP' | perl -pe 'chomp if eof'"
+                " | sha256sum | cut -d' ' -f1",
+            ],
+            input=data,
+            capture_output=True,
+            check=True,
+        )
+        hasher = FeedHasher()
+        hasher.update(data)
+        assert hasher.hexdigest() == out.stdout.decode().strip()
+
+    @responses.activate
+    def test_fetch_hashes_stream(self, sample_feed_ics):
+        responses.add(responses.GET, FEED_URL, body=sample_feed_ics)
+        resp = fetch_feed_conditional()
+        assert resp.feed_hash == compute_feed_hash(sample_feed_ics)
+        assert resp.size == len(sample_feed_ics.encode("utf-8"))
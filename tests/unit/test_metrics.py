@@ -0,0 +1,79 @@
+"""Tests for run metrics and profiling."""
+
+import json
+import pstats
+
+import pytest
+
+from fpo_flyers.metrics import Metrics, profile_to
+
+
+def _metrics() -> Metrics:
+    m = Metrics()
+    m.incr("feed_bytes", 100)
+    m.incr("feed_bytes", 50)
+    m.set("feed_http_status", 200)
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        m.observe("render_event", seconds)
+    return m
+
+
+class TestMetrics:
+    def test_counters_accumulate(self):
+        assert _metrics().counters["feed_bytes"] == 150
+
+    def test_timer(self):
+        m = Metrics()
+        with m.timer("stage"):
+            pass
+        assert len(m.timers["stage"]) == 1
+        assert m.timers["stage"][0] >= 0
+
+    def test_timer_records_on_error(self):
+        m = Metrics()
+        with pytest.raises(RuntimeError), m.timer("stage"):
+            raise RuntimeError
+        assert len(m.timers["stage"]) == 1
+
+    def test_summary(self):
+        summary = _metrics().to_dict()["timers"]["render_event"]
+        assert summary["count"] == 4
+        assert summary["sum_seconds"] == pytest.approx(1.0)
+        assert summary["p50_seconds"] == 0.2
+        assert summary["p95_seconds"] == 0.4
+        assert summary["max_seconds"] == 0.4
+
+    def test_prometheus(self):
+        text = _metrics().to_prometheus()
+        assert "# TYPE fpo_flyers_feed_bytes_total counter" in text
+        assert "fpo_flyers_feed_bytes_total 150" in text
+        assert "fpo_flyers_feed_http_status 200" in text
+        assert 'fpo_flyers_render_event_seconds{quantile="0.95"} 0.4' in text
+        assert "fpo_flyers_render_event_seconds_count 4" in text
+
+    def test_write_json(self, tmp_path):
+        path = tmp_path / "metrics.json"
+        _metrics().write(path)
+        assert json.loads(path.read_text())["counters"]["feed_bytes"] == 150
+
+    def test_write_prometheus(self, tmp_path):
+        path = tmp_path / "fpo.prom"
+        _metrics().write(path)
+        assert path.read_text().startswith("# TYPE")
+        assert not (tmp_path / "fpo.prom.tmp").exists()
+
+
+class TestProfileTo:
+    def test_disabled(self):
+        with profile_to(None):
+            pass
+
+    def test_cprofile(self, tmp_path):
+        path = tmp_path / "render.prof"
+        with profile_to(path):
+            sum(range(1000))
+        assert pstats.Stats(str(path)).total_calls > 0
+
+    def test_unknown_profiler(self, tmp_path):
+        with pytest.raises(ValueError), profile_to(tmp_path / "x", "perf"):
+            pass
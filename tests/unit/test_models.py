@@ -1,7 +1,11 @@
 """Tests for data models."""
 
+import dataclasses
+import pickle
 from datetime import datetime, timezone
 
+import pytest
+
 from fpo_flyers.models import EASTERN, CommitteeMember, FPOEvent
 
 
@@ -27,6 +31,11 @@ class TestCommitteeMember:
         m = CommitteeMember(name="Jianqing Fan", is_chair=True)
         assert str(m) == "Jianqing Fan, (Chair)"
 
+    def test_frozen(self):
+        m = CommitteeMember(name="Jianqing Fan")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            m.is_chair = True
+
 
 class TestFPOEvent:
     def test_start_eastern(self):
@@ -98,3 +107,48 @@ class TestFPOEvent:
     def test_safe_filename_with_slash(self):
         event = _make_event(candidate_name="A/B Test")
         assert event.safe_filename == "A_B_Test"
+
+
+class TestDerivedCache:
+    def test_slotted(self):
+        assert not hasattr(_make_event(), "__dict__")
+        assert not hasattr(CommitteeMember("A"), "__dict__")
+
+    def test_computed_once(self):
+        event = _make_event()
+        assert event.start_eastern is event.start_eastern
+
+    def test_field_assignment_invalidates(self):
+        event = _make_event()
+        assert event.formatted_time == "1:00 pm"
+        event.start = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+        assert event.formatted_time == "10:00 am"
+
+    def test_not_part_of_equality_or_repr(self):
+        a, b = _make_event(), _make_event()
+        assert a.formatted_date
+        assert a == b
+        assert "_cache" not in repr(a)
+
+    def test_pickle_round_trip(self):
+        event = _make_event(committee=[CommitteeMember("Jianqing Fan", True)])
+        assert event.formatted_date
+        restored = pickle.loads(pickle.dumps(event))
+        assert restored == event
+        assert restored.committee_text == event.committee_text
+
+
+class TestFingerprint:
+    def test_stable(self):
+        assert _make_event().fingerprint() == _make_event().fingerprint()
+
+    def test_changes_when_scraped_fields_filled_in(self):
+        event = _make_event()
+        before = event.fingerprint()
+        event.dissertation_title = "A Title"
+        assert event.fingerprint() != before
+
+    def test_changes_with_committee(self):
+        a = _make_event(committee=[CommitteeMember("A", is_chair=True)])
+        b = _make_event(committee=[CommitteeMember("A")])
+        assert a.fingerprint() != b.fingerprint()
@@ -0,0 +1,198 @@
+"""Tests for multi-feed generation."""
+
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import responses
+from click.testing import CliRunner
+
+from fpo_flyers import pipeline as pipeline_module
+from fpo_flyers import renderer
+from fpo_flyers.cli import main
+from fpo_flyers.multifeed import (
+    FeedSpec,
+    load_feeds,
+    run_feeds,
+    select_shard,
+    shard_of,
+)
+from fpo_flyers.pipeline import Pipeline, PipelineConfig
+
+from .test_pipeline import PAGES, _fake_render_events
+
+ORFE = "https://example.org/feed.ics?tid=491"
+CHEM = "https://example.org/feed.ics?tid=17"
+
+
+def _write_config(tmp_path, body: str):
+    path = tmp_path / "feeds.toml"
+    path.write_text(textwrap.dedent(body))
+    return path
+
+
+class TestLoadFeeds:
+    def test_defaults(self, tmp_path):
+        path = _write_config(
+            tmp_path,
+            f"""
+            [[feed]]
+            name = "orfe"
+            url = "{ORFE}"
+            """,
+        )
+        assert load_feeds(path) == [
+            FeedSpec(
+                "orfe", ORFE, tmp_path / "output" / "orfe", tmp_path / ".feed_hash.orfe"
+            )
+        ]
+
+    def test_directories_and_overrides(self, tmp_path):
+        path = _write_config(
+            tmp_path,
+            f"""
+            output_dir = "site"
+            state_dir = "state"
+
+            [[feed]]
+            name = "orfe"
+            url = "{ORFE}"
+
+            [[feed]]
+            name = "chem"
+            url = "{CHEM}"
+            output_dir = "/srv/chem"
+            """,
+        )
+        orfe, chem = load_feeds(path)
+        assert orfe.output_dir == tmp_path / "site" / "orfe"
+        assert orfe.hash_file == tmp_path / "state" / ".feed_hash.orfe"
+        assert chem.output_dir.as_posix() == "/srv/chem"
+
+    def test_relative_config_path(self, tmp_path, monkeypatch):
+        (tmp_path / "sub").mkdir()
+        _write_config(
+            tmp_path / "sub",
+            f"""
+            [[feed]]
+            name = "orfe"
+            url = "{ORFE}"
+
+            [[feed]]
+            name = "chem"
+            url = "{CHEM}"
+            output_dir = "chem-site"
+            hash_file = "state/chem"
+            """,
+        )
+        monkeypatch.chdir(tmp_path)
+        orfe, chem = load_feeds(Path("sub/feeds.toml"))
+        assert orfe.output_dir == Path("sub/output/orfe")
+        assert orfe.hash_file == Path("sub/.feed_hash.orfe")
+        assert chem.output_dir == Path("sub/chem-site")
+        assert chem.hash_file == Path("sub/state/chem")
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            "",
+            '[[feed]]\nname = "../x"\nurl = "u"\n',
+            '[[feed]]\nname = "a"\n',
+            '[[feed]]\nname = "a"\nurl = "u"\n[[feed]]\nname = "a"\nurl = "v"\n',
+        ],
+    )
+    def test_invalid(self, tmp_path, body):
+        with pytest.raises(ValueError):
+            load_feeds(_write_config(tmp_path, body))
+
+
+class TestSharding:
+    def test_stable(self):
+        # Pinned: the assignment must not change between versions or hosts
+        assert [shard_of(name, 4) for name in ("orfe", "chem", "math")] == [0, 0, 2]
+        assert shard_of("orfe", 1) == 0
+
+    def test_shards_partition_feeds(self):
+        feeds = [FeedSpec(f"dept{i}", "u", None, None) for i in range(50)]
+        shards = [select_shard(feeds, i, 3) for i in range(3)]
+        assert sorted(f.name for shard in shards for f in shard) == sorted(
+            f.name for f in feeds
+        )
+        assert all(shards)
+
+    def test_out_of_range(self):
+        with pytest.raises(ValueError):
+            select_shard([], 3, 3)
+
+
+class TestRunFeeds:
+    @responses.activate
+    def test_per_feed_state_shared_resources(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, ORFE, body=sample_feed_ics)
+        responses.add(responses.GET, CHEM, status=500)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        feeds = [
+            FeedSpec("orfe", ORFE, tmp_path / "orfe", tmp_path / ".feed_hash.orfe"),
+            FeedSpec("chem", CHEM, tmp_path / "chem", tmp_path / ".feed_hash.chem"),
+        ]
+        base = PipelineConfig(
+            output_dir=tmp_path / "unused",
+            hash_file=tmp_path / "unused_hash",
+            scrape_cache=tmp_path / "cache.sqlite",
+        )
+        with Pipeline(base) as shared:
+            session = shared.session
+            results = run_feeds(feeds, base, shared=shared)
+            assert shared.session is session
+
+        assert results["orfe"].rendered == 2
+        assert (tmp_path / ".feed_hash.orfe").exists()
+        assert (tmp_path / "orfe" / "manifest.json").exists()
+        # One feed failing leaves the other's results and state alone
+        assert isinstance(results["chem"], Exception)
+        assert not (tmp_path / ".feed_hash.chem").exists()
+
+
+    def test_shared_session_created_once(self, tmp_path, monkeypatch):
+        created = []
+
+        def slow_make_session(workers):
+            time.sleep(0.05)
+            created.append(object())
+            return created[-1]
+
+        monkeypatch.setattr(pipeline_module, "make_session", slow_make_session)
+        base = PipelineConfig(output_dir=tmp_path, scrape_cache=None)
+        shared = Pipeline(base)
+        children = [Pipeline(base, shared=shared) for _ in range(8)]
+        start = threading.Barrier(len(children))
+
+        def get_session(child):
+            start.wait()
+            return child.session
+
+        with ThreadPoolExecutor(len(children)) as executor:
+            sessions = list(executor.map(get_session, children))
+        assert len(created) == 1
+        assert all(session is created[0] for session in sessions)
+
+
+class TestFeedsCommand:
+    def test_bad_shard(self, tmp_path):
+        path = _write_config(tmp_path, f'[[feed]]\nname = "a"\nurl = "{ORFE}"\n')
+        result = CliRunner().invoke(main, ["feeds", str(path), "--shard", "4/4"])
+        assert result.exit_code == 2
+        assert "Shard index" in result.output
+
+    def test_bad_config(self, tmp_path):
+        path = _write_config(tmp_path, "")
+        result = CliRunner().invoke(main, ["feeds", str(path)])
+        assert result.exit_code == 2
+        assert "No [[feed]] entries" in result.output
@@ -0,0 +1,399 @@
+"""Tests for the reusable pipeline."""
+
+import json
+from datetime import datetime, timezone
+
+import responses
+
+from fpo_flyers import renderer
+from fpo_flyers.atomic import replace_if_changed
+from fpo_flyers.change_detection import MANIFEST_FILE
+from fpo_flyers.event_store import STORE_FILE
+from fpo_flyers.pipeline import Pipeline, PipelineConfig, RunResult
+from fpo_flyers.renderer import RenderResult
+from fpo_flyers.site_manifest import is_content_addressed
+
+FEED = "https://example.org/feed.ics"
+PAGES = (
+    "https://orfe.princeton.edu/events/2026/fpo-shange-tang",
+    "https://orfe.princeton.edu/events/2026/fpo-jane-doe",
+)
+
+
+def _fake_render_events(events, output_dir, jobs=1, raster=None, **kwargs):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for event in events:
+        pdf = output_dir / f"{event.candidate_name}.pdf"
+        html = output_dir / f"{event.candidate_name}.html"
+        written = [
+            replace_if_changed(pdf, b"%PDF"),
+            replace_if_changed(html, b"<html></html>"),
+        ]
+        images = ()
+        if raster:
+            images = (
+                output_dir / f"{event.candidate_name}.{raster}",
+                output_dir / f"{event.candidate_name}.thumb.{raster}",
+            )
+            written += [replace_if_changed(path, b"img") for path in images]
+        yield event, RenderResult(
+            pdf, html, 0.01, written.count(False), image_paths=images
+        )
+
+
+def _config(tmp_path):
+    return PipelineConfig(
+        output_dir=tmp_path / "out",
+        hash_file=tmp_path / ".feed_hash",
+        feed_url=FEED,
+        scrape_cache=tmp_path / "cache.sqlite",
+    )
+
+
+class TestPipeline:
+    @responses.activate
+    def test_second_run_reuses_state(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+
+        with Pipeline(_config(tmp_path)) as pipeline:
+            first = pipeline.run()
+            session, cache = pipeline.session, pipeline.cache
+            second = pipeline.run()
+            assert pipeline.session is session
+            assert pipeline.cache is cache
+
+        assert first.status == "done"
+        assert (first.events, first.rendered, first.unchanged) == (2, 2, 0)
+        assert first.metrics.counters["scrape_cache_misses"] == 2
+        site = json.loads((tmp_path / "out" / "manifest.json").read_text())
+        assert [e["candidate"] for e in site["events"]] == ["Shange Tang", "Jane Doe"]
+        assert second.status == "unchanged"
+        assert second.exit_code == 0
+
+    @responses.activate
+    def test_force_skips_up_to_date_check(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+
+        with Pipeline(_config(tmp_path)) as pipeline:
+            pipeline.run()
+            forced = pipeline.run(force=True)
+
+        assert forced.rendered == 2
+        # Re-rendered flyers came out byte-identical, so nothing was rewritten
+        assert (forced.written, forced.identical) == (0, 4)
+        assert forced.metrics.counters["files_identical"] == 4
+        # Only this run's lookups are counted, not the cache's lifetime total
+        assert forced.metrics.counters["scrape_cache_hits"] == 2
+        assert forced.metrics.counters["scrape_cache_misses"] == 0
+
+    @responses.activate
+    def test_not_modified(self, tmp_path):
+        config = _config(tmp_path)
+        config.hash_file.write_text("abc\n")
+        responses.add(responses.GET, FEED, status=304)
+        with Pipeline(config) as pipeline:
+            result = pipeline.run()
+        assert result.status == "not_modified"
+        assert pipeline.metrics.gauges["feed_http_status"] == 304
+
+
+class TestRunResult:
+    def test_exit_code(self):
+        assert RunResult("done").exit_code == 0
+        assert RunResult("failed").exit_code == 1
+
+
+class TestCombinedPdf:
+    @responses.activate
+    def test_rebuilt_only_when_flyers_change(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        calls = []
+
+        def fake_write_combined_pdf(events, path, documents=None):
+            # Layout is not thread-safe, so it runs under the render lock
+            assert pipeline._render_lock.locked()
+            calls.append([e.uid for e in events])
+            path.write_bytes(b"%PDF")
+            return path
+
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        monkeypatch.setattr(renderer, "write_combined_pdf", fake_write_combined_pdf)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        config.combined_pdf = True
+
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            # Feed hash ignored, but every flyer is still up to date
+            config.hash_file.unlink()
+            pipeline.run()
+
+        assert calls == [["ps_events:12281:delta:0", "ps_events:99999:delta:0"]]
+        assert (config.output_dir / "all_flyers.pdf").exists()
+
+
+class TestContentAddressed:
+    @responses.activate
+    def test_hashed_names_and_old_files_collected(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        output_dir = config.output_dir
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            config.content_addressed = True
+            first = pipeline.run(force=True)
+            again = pipeline.run(force=True)
+
+        assert (first.written, first.identical) == (4, 0)
+        assert (again.written, again.identical) == (0, 4)
+
+        site = json.loads((output_dir / "manifest.json").read_text())
+        names = {info["name"] for e in site["events"] for info in e["files"].values()}
+        assert all(is_content_addressed(name) for name in names)
+        # Plain names from the first run were garbage-collected
+        published = {
+            p.name
+            for p in output_dir.iterdir()
+            if p.suffix != ".json" and not p.name.startswith(".")
+        }
+        assert published == names | {"_headers"}
+
+
+    @responses.activate
+    def test_toggling_renames_unchanged_events(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        output_dir = config.output_dir
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            config.hash_file.unlink()
+            config.content_addressed = True
+            on = pipeline.run()
+            addressed = sorted(p.name for p in output_dir.glob("*.pdf"))
+            config.hash_file.unlink()
+            config.content_addressed = False
+            off = pipeline.run()
+
+        assert on.rendered == 2
+        assert len(addressed) == 2
+        assert all(is_content_addressed(name) for name in addressed)
+        assert off.rendered == 2
+        assert sorted(p.name for p in output_dir.glob("*.pdf")) == [
+            "Jane Doe.pdf",
+            "Shange Tang.pdf",
+        ]
+        assert not (output_dir / "_headers").exists()
+
+
+class TestRaster:
+    @responses.activate
+    def test_toggling_images_rerenders(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            config.hash_file.unlink()
+            config.raster = "webp"
+            with_images = pipeline.run()
+            site = json.loads((config.output_dir / "manifest.json").read_text())
+            config.hash_file.unlink()
+            config.raster = None
+            without = pipeline.run()
+
+        assert with_images.rendered == 2
+        assert (with_images.written, with_images.identical) == (4, 4)
+        kinds = {kind for e in site["events"] for kind in e["files"]}
+        assert kinds == {"pdf", "html", "image", "thumbnail"}
+        assert without.rendered == 2
+        assert without.deleted == 4
+        assert not list(config.output_dir.glob("*.webp"))
+
+
+class TestKioskBundle:
+    @responses.activate
+    def test_written_listed_and_removed_when_disabled(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        config.kiosk_bundle = True
+        output_dir = config.output_dir
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            site = json.loads((output_dir / "manifest.json").read_text())
+            html = (output_dir / "kiosk.html").read_text()
+            config.kiosk_bundle = False
+            pipeline.run(force=True)
+
+        assert site["kiosk"]["name"] == "kiosk.html"
+        assert html.count('<section class="slide') == 2
+        assert not list(output_dir.glob("kiosk.html*"))
+
+
+class TestEventStore:
+    @responses.activate
+    def test_counts_and_render_state(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        with Pipeline(_config(tmp_path)) as pipeline:
+            first = pipeline.run()
+            again = pipeline.run(force=True)
+            state = pipeline.store.render_state()
+
+        assert first.metrics.counters["events_added"] == 2
+        assert again.metrics.counters["events_added"] == 0
+        assert again.metrics.counters["events_changed"] == 0
+        assert sorted(f for e in state.values() for f in e["files"]) == [
+            "Jane Doe.html",
+            "Jane Doe.pdf",
+            "Shange Tang.html",
+            "Shange Tang.pdf",
+        ]
+
+    @responses.activate
+    def test_unchanged_events_are_not_scraped(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            config.hash_file.unlink()
+            calls = len(responses.calls)
+            again = pipeline.run()
+
+        # Only the feed was fetched; both titles came from the store
+        assert len(responses.calls) == calls + 1
+        assert again.metrics.counters["scrapes_skipped"] == 2
+        assert again.metrics.counters["scrape_cache_hits"] == 0
+        assert (again.rendered, again.unchanged) == (0, 2)
+
+    @responses.activate
+    def test_failed_scrape_keeps_stored_title(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        config.scrape_cache = None
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            for url in PAGES:
+                responses.replace(responses.GET, url, status=503)
+            again = pipeline.run(force=True)
+            events = pipeline.store.events_between(
+                datetime(2026, 1, 1, tzinfo=timezone.utc),
+                datetime(2027, 1, 1, tzinfo=timezone.utc),
+            )
+
+        assert again.metrics.counters["scrape_errors"] == 2
+        assert len(events) == 2
+        assert all("Representation" in e.dissertation_title for e in events)
+
+    @responses.activate
+    def test_migrates_json_manifest(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        with Pipeline(config) as pipeline:
+            pipeline.run()
+            state = pipeline.store.render_state()
+        legacy = config.output_dir / MANIFEST_FILE
+        legacy.write_text(json.dumps(state))
+        (config.output_dir / STORE_FILE).unlink()
+        config.hash_file.unlink()
+
+        with Pipeline(config) as pipeline:
+            result = pipeline.run()
+            assert pipeline.store.render_state() == state
+
+        # Outputs recorded in the old manifest were not rendered again
+        assert (result.rendered, result.unchanged) == (0, 2)
+        assert not legacy.exists()
+
+
+class TestTimeWindow:
+    @responses.activate
+    def test_moving_window_expires_past_events(
+        self, tmp_path, monkeypatch, sample_feed_ics, sample_event_html
+    ):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        for url in PAGES:
+            responses.add(responses.GET, url, body=sample_event_html)
+        config = _config(tmp_path)
+        with Pipeline(config) as pipeline:
+            first = pipeline.run()
+            config.since = datetime(2026, 4, 1, tzinfo=timezone.utc)
+            # Same feed, but the window moved past the first exam
+            moved = pipeline.run()
+            again = pipeline.run()
+            archived = pipeline.store.events_between(
+                datetime(2026, 3, 1, tzinfo=timezone.utc), config.since
+            )
+
+        assert first.events == 2
+        assert (moved.status, moved.events, moved.deleted) == ("done", 1, 2)
+        assert sorted(p.name for p in config.output_dir.glob("*.pdf")) == [
+            "Jane Doe.pdf"
+        ]
+        assert again.status == "unchanged"
+        # Expired, not removed from the feed: the store still knows it
+        assert [e.candidate_name for e in archived] == ["Shange Tang"]
+
+    @responses.activate
+    def test_empty_window_is_remembered(self, tmp_path, monkeypatch, sample_feed_ics):
+        monkeypatch.setattr(renderer, "render_events", _fake_render_events)
+        responses.add(responses.GET, FEED, body=sample_feed_ics)
+        config = _config(tmp_path)
+        config.since = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        with Pipeline(config) as pipeline:
+            first = pipeline.run()
+            again = pipeline.run()
+
+        assert first.status == "no_events"
+        assert again.status == "unchanged"
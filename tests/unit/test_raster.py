@@ -0,0 +1,63 @@
+"""Tests for slideshow image rasterisation."""
+
+import io
+
+import pytest
+
+from fpo_flyers.raster import (
+    IMAGE_WIDTH,
+    THUMBNAIL_WIDTH,
+    raster_available,
+    rasterize_pdf,
+    write_images,
+)
+
+pypdfium2 = pytest.importorskip("pypdfium2")
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def letter_pdf() -> bytes:
+    document = pypdfium2.PdfDocument.new()
+    document.new_page(612, 792)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestRasterizePdf:
+    def test_available(self):
+        assert raster_available()
+
+    @pytest.mark.parametrize("fmt", ["webp", "png"])
+    def test_sizes_and_transparency(self, letter_pdf, fmt):
+        image, thumbnail = rasterize_pdf(letter_pdf, fmt)
+        full = Image.open(io.BytesIO(image))
+        small = Image.open(io.BytesIO(thumbnail))
+        assert full.format.lower() == fmt
+        assert full.width == IMAGE_WIDTH
+        assert full.height == round(IMAGE_WIDTH * 792 / 612)
+        assert small.width == THUMBNAIL_WIDTH
+        # Nothing is painted behind the flyer, so any tint shows through
+        assert full.convert("RGBA").getpixel((0, 0))[3] == 0
+
+    def test_reproducible(self, letter_pdf):
+        assert rasterize_pdf(letter_pdf) == rasterize_pdf(letter_pdf)
+
+    def test_unknown_format(self, letter_pdf):
+        with pytest.raises(ValueError):
+            rasterize_pdf(letter_pdf, "gif")
+
+
+class TestWriteImages:
+    def test_writes_image_and_thumbnail(self, tmp_path, letter_pdf):
+        written = write_images(letter_pdf, tmp_path, "Jane_Doe")
+        assert [(p.name, w) for p, w in written] == [
+            ("Jane_Doe.webp", True),
+            ("Jane_Doe.thumb.webp", True),
+        ]
+
+    def test_identical_images_left_alone(self, tmp_path, letter_pdf):
+        write_images(letter_pdf, tmp_path, "Jane_Doe", "png")
+        again = write_images(letter_pdf, tmp_path, "Jane_Doe", "png")
+        assert [w for _, w in again] == [False, False]
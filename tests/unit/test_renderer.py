@@ -3,8 +3,26 @@
 from datetime import datetime, timezone
 from pathlib import Path
 
+import pytest
+
+from fpo_flyers import renderer
 from fpo_flyers.models import CommitteeMember, FPOEvent
-from fpo_flyers.renderer import TEMPLATES_DIR, render_html, render_html_flyer, render_ipad_html
+from fpo_flyers.renderer import (
+    TEMPLATE_NAMES,
+    TEMPLATES_DIR,
+    FlyerRenderer,
+    compute_template_version,
+    get_font_config,
+    get_renderer,
+    pdf_bytes,
+    render_document,
+    render_events,
+    render_html,
+    render_html_flyer,
+    render_ipad_html,
+    source_date,
+    write_combined_pdf,
+)
 
 
 def _sample_event() -> FPOEvent:
@@ -121,3 +139,157 @@ class TestRenderHtmlFlyer:
         out = tmp_path / "nested" / "dir"
         path = render_html_flyer(_sample_event(), out)
         assert path.exists()
+
+    def test_identical_rerender_leaves_file_alone(self, tmp_path):
+        path = render_html_flyer(_sample_event(), tmp_path)
+        before = path.stat()
+        render_html_flyer(_sample_event(), tmp_path)
+        assert path.stat().st_ino == before.st_ino
+        assert path.stat().st_mtime_ns == before.st_mtime_ns
+
+
+class TestFlyerRenderer:
+    def test_matches_module_functions(self):
+        event = _sample_event()
+        r = FlyerRenderer()
+        assert r.render_html(event) == render_html(event)
+        assert r.render_ipad_html(event) == render_ipad_html(event)
+
+    def test_render_many(self):
+        event = _sample_event()
+        results = FlyerRenderer().render_many([event, event])
+        assert len(results) == 2
+        print_html, ipad_html = results[0]
+        assert "Announcement" in print_html
+        assert 'name="viewport"' in ipad_html
+
+    def test_bytecode_cache(self, tmp_path):
+        cache_dir = tmp_path / "jinja-cache"
+        FlyerRenderer(bytecode_cache_dir=cache_dir)
+        assert len(list(cache_dir.iterdir())) == 2
+        # A second renderer loads from the warm cache
+        html = FlyerRenderer(bytecode_cache_dir=cache_dir).render_html(_sample_event())
+        assert "Shange Tang" in html
+
+    def test_get_renderer_is_shared(self):
+        assert get_renderer() is get_renderer()
+
+
+class TestComputeTemplateVersion:
+    def test_deterministic(self):
+        assert compute_template_version() == compute_template_version()
+
+    def test_changes_with_template(self, tmp_path):
+        for name in TEMPLATE_NAMES:
+            (tmp_path / name).write_text((TEMPLATES_DIR / name).read_text())
+        before = compute_template_version(tmp_path)
+        (tmp_path / "flyer.html").write_text("edited")
+        assert compute_template_version(tmp_path) != before
+
+
+class TestRenderEvents:
+    def test_sequential(self, tmp_path):
+        results = list(render_events([_sample_event()], tmp_path))
+        assert len(results) == 1
+        _, result = results[0]
+        assert result.pdf_path.exists()
+        assert result.html_path.exists()
+        assert result.seconds > 0
+
+    def test_error_does_not_stop_batch(self, tmp_path, monkeypatch):
+        real_render_event = renderer.render_event
+
+        def flaky(event, output_dir, *args):
+            if event.uid == "bad":
+                raise RuntimeError("boom")
+            return real_render_event(event, output_dir, *args)
+
+        monkeypatch.setattr(renderer, "render_event", flaky)
+        bad = _sample_event()
+        bad.uid = "bad"
+        good = _sample_event()
+        good.candidate_name = "Jane Doe"
+        results = dict((e.uid, r) for e, r in render_events([bad, good], tmp_path))
+        assert isinstance(results["bad"], RuntimeError)
+        assert results["test-uid"].pdf_path.name == "Jane_Doe.pdf"
+
+    def test_process_pool(self, tmp_path):
+        events = []
+        for name in ("Shange Tang", "Jane Doe", "John Roe"):
+            event = _sample_event()
+            event.uid = name
+            event.candidate_name = name
+            events.append(event)
+        results = list(render_events(events, tmp_path, jobs=2))
+        assert {e.uid for e, _ in results} == {e.uid for e in events}
+        for _, result in results:
+            assert result.pdf_path.stat().st_size > 0
+            assert result.html_path.exists()
+
+    def test_keep_documents(self, tmp_path):
+        results = list(render_events([_sample_event()], tmp_path, keep_documents=True))
+        _, result = results[0]
+        assert len(result.document.pages) == 1
+
+
+class TestCombinedPdf:
+    def _events(self):
+        first = _sample_event()
+        second = _sample_event()
+        second.uid = "second"
+        second.candidate_name = "Jane Doe"
+        return [first, second]
+
+    def test_writes_pdf(self, tmp_path):
+        path = write_combined_pdf(self._events(), tmp_path / "all_flyers.pdf")
+        assert path.read_bytes().startswith(b"%PDF")
+        assert not (tmp_path / "all_flyers.pdf.tmp").exists()
+
+    def test_reuses_documents(self, tmp_path, monkeypatch):
+        first, second = self._events()
+        documents = {first.uid: renderer.render_document(first)}
+        laid_out = []
+        real_render_document = renderer.render_document
+
+        def counting(event, *args):
+            laid_out.append(event.uid)
+            return real_render_document(event, *args)
+
+        monkeypatch.setattr(renderer, "render_document", counting)
+        write_combined_pdf([first, second], tmp_path / "all.pdf", documents=documents)
+        assert laid_out == ["second"]
+
+    def test_no_events(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_combined_pdf([], tmp_path / "all.pdf")
+
+    def test_font_config_is_shared(self):
+        assert get_font_config() is get_font_config()
+
+
+class TestReproduciblePdf:
+    def test_source_date_unset(self, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        assert source_date() is None
+
+    def test_source_date(self, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+        assert source_date() == "2023-11-14T22:13:20Z"
+
+    def test_invalid_source_date_ignored(self, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+        assert source_date() is None
+
+    def test_same_event_same_bytes(self, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        first = pdf_bytes(render_document(_sample_event()))
+        second = pdf_bytes(render_document(_sample_event()))
+        assert first == second
+
+    def test_dates_pinned_to_source_date(self, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+        document = render_document(_sample_event())
+        first = pdf_bytes(document)
+        assert document.metadata.created == "2023-11-14T22:13:20Z"
+        assert document.metadata.modified == "2023-11-14T22:13:20Z"
+        assert pdf_bytes(render_document(_sample_event())) == first
@@ -0,0 +1,169 @@
+"""Tests for the scraped event page cache."""
+
+import time
+
+import requests
+import responses
+
+from fpo_flyers.scrape_cache import INCOMPLETE_TTL, ScrapeCache
+from fpo_flyers.scraper import scrape_event_page, scrape_event_pages
+
+URL = "https://orfe.princeton.edu/events/2026/fpo-shange-tang"
+INFO = {"dissertation_title": "A Title", "dissertation_pdf_url": "https://x/t.pdf"}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestScrapeCache:
+    def test_miss(self, tmp_path):
+        with ScrapeCache(tmp_path / "cache.sqlite") as cache:
+            assert cache.get(URL) is None
+
+    def test_put_and_get(self, tmp_path):
+        with ScrapeCache(tmp_path / "cache.sqlite") as cache:
+            cache.put(URL, INFO, etag='"v1"', last_modified="Wed")
+            page = cache.get(URL)
+        assert page.info == INFO
+        assert page.etag == '"v1"'
+        assert page.last_modified == "Wed"
+
+    def test_persists(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        with ScrapeCache(path) as cache:
+            cache.put(URL, INFO)
+        with ScrapeCache(path) as cache:
+            assert cache.get(URL).info == INFO
+
+    def test_ttl(self, tmp_path):
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO)
+            assert cache.is_fresh(cache.get(URL))
+            clock.now += 61
+            assert not cache.is_fresh(cache.get(URL))
+            cache.refresh(URL)
+            assert cache.is_fresh(cache.get(URL))
+
+    def test_incomplete_entry_expires_early(self, tmp_path):
+        clock = FakeClock()
+        untitled = {"dissertation_title": "", "dissertation_pdf_url": ""}
+        with ScrapeCache(tmp_path / "cache.sqlite", clock=clock) as cache:
+            cache.put(URL, untitled)
+            cache.put("https://b", INFO)
+            clock.now += INCOMPLETE_TTL
+            assert not cache.is_fresh(cache.get(URL))
+            assert cache.is_fresh(cache.get("https://b"))
+
+    def test_lru_eviction(self, tmp_path):
+        clock = FakeClock()
+        path = tmp_path / "cache.sqlite"
+        with ScrapeCache(path, max_entries=2, clock=clock) as cache:
+            cache.put("https://a", INFO)
+            clock.now += 1
+            cache.put("https://b", INFO)
+            clock.now += 1
+            cache.get("https://a")  # a is now more recent than b
+            clock.now += 1
+            cache.put("https://c", INFO)
+            assert len(cache) == 2
+            assert cache.get("https://b") is None
+            assert cache.get("https://a") is not None
+
+
+class TestScrapeWithCache:
+    @responses.activate
+    def test_fresh_entry_skips_request(self, tmp_path):
+        with ScrapeCache(tmp_path / "cache.sqlite") as cache:
+            cache.put(URL, INFO)
+            assert scrape_event_page(URL, cache=cache) == INFO
+            assert cache.stats["hits"] == 1
+        assert len(responses.calls) == 0
+
+    @responses.activate
+    def test_miss_fetches_and_stores(self, tmp_path, sample_event_html):
+        responses.add(
+            responses.GET, URL, body=sample_event_html, headers={"ETag": '"v1"'}
+        )
+        with ScrapeCache(tmp_path / "cache.sqlite") as cache:
+            result = scrape_event_page(URL, cache=cache)
+            assert cache.get(URL).info == result
+            assert cache.get(URL).etag == '"v1"'
+            assert cache.stats["misses"] == 1
+
+    @responses.activate
+    def test_stale_entry_revalidates(self, tmp_path):
+        responses.add(
+            responses.GET,
+            URL,
+            status=304,
+            match=[responses.matchers.header_matcher({"If-None-Match": '"v1"'})],
+        )
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO, etag='"v1"')
+            clock.now += 61
+            assert scrape_event_page(URL, cache=cache) == INFO
+            assert cache.stats["revalidated"] == 1
+            assert cache.is_fresh(cache.get(URL))
+
+    @responses.activate
+    def test_stale_entry_updates_on_change(self, tmp_path, sample_event_html):
+        responses.add(responses.GET, URL, body=sample_event_html)
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO, etag='"v1"')
+            clock.now += 61
+            result = scrape_event_page(URL, cache=cache)
+            assert "Representation" in result["dissertation_title"]
+            assert cache.get(URL).info == result
+
+    @responses.activate
+    def test_stale_entry_served_when_unreachable(self, tmp_path):
+        responses.add(responses.GET, URL, body=requests.ConnectionError("down"))
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO, etag='"v1"')
+            clock.now += 61
+            assert scrape_event_page(URL, cache=cache) == INFO
+            assert cache.stats["stale"] == 1
+
+    @responses.activate
+    def test_stale_entry_served_on_server_error(self, tmp_path):
+        responses.add(responses.GET, URL, status=503)
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO)
+            clock.now += 61
+            assert scrape_event_page(URL, cache=cache) == INFO
+
+    @responses.activate
+    def test_deadline_falls_back_to_cache(self, tmp_path):
+        def slow(request):
+            time.sleep(0.5)
+            return (200, {}, "")
+
+        responses.add_callback(responses.GET, URL, callback=slow)
+        clock = FakeClock()
+        with ScrapeCache(tmp_path / "cache.sqlite", ttl=60, clock=clock) as cache:
+            cache.put(URL, INFO)
+            clock.now += 61
+            results = scrape_event_pages([URL], cache=cache, deadline=0.05)
+            assert results == {URL: INFO}
+            assert cache.stats["stale"] == 1
+
+    @responses.activate
+    def test_stats_count_only_this_call(self, tmp_path):
+        with ScrapeCache(tmp_path / "cache.sqlite") as cache:
+            cache.put(URL, INFO)
+            # Lookups by another caller sharing the cache
+            cache.record("misses")
+            stats = dict.fromkeys(cache.stats, 0)
+            scrape_event_pages([URL], cache=cache, stats=stats)
+        assert stats == {"hits": 1, "revalidated": 0, "misses": 0, "stale": 0}
+        assert cache.stats["misses"] == 1
@@ -1,8 +1,78 @@
 """Tests for event page scraper."""
 
+import importlib.util
+import threading
+import time
+
+import pytest
+import requests
 import responses
 
-from fpo_flyers.scraper import parse_event_html, scrape_event_page
+from fpo_flyers import scraper
+from fpo_flyers.scraper import (
+    make_session,
+    parse_event_html,
+    resolve_backend,
+    scrape_event_page,
+    scrape_event_pages,
+)
+
+URL_A = "https://orfe.princeton.edu/events/2026/fpo-shange-tang"
+URL_B = "https://orfe.princeton.edu/events/2026/fpo-jane-doe"
+
+
+def _backend_params():
+    params = []
+    for backend, module in (
+        ("bs4", "bs4"),
+        ("stream", None),
+        ("lxml", "lxml"),
+        ("selectolax", "selectolax"),
+    ):
+        marks = []
+        if module and importlib.util.find_spec(module) is None:
+            marks.append(pytest.mark.skip(reason=f"{module} not installed"))
+        params.append(pytest.param(backend, marks=marks))
+    return params
+
+
+BACKENDS = _backend_params()
+
+EDGE_CASES = [
+    "",
+    "<html></html>",
+    (
+        "<div class='event-subtitle'>A <em>b</em> c<br>d<p>e</div>"
+        "<div class='x field--name-field-ps-events-location-virtual'>"
+        "<a>no</a><a href='https://x/y.pdf?a=1&amp;b=2'>pdf</a></div>"
+    ),
+    "<div class=event-subtitle>  x &amp; y <!-- note --> z</div>",
+    (
+        "<span class='event-subtitle'>T</span>"
+        "<div class='field--name-field-ps-events-location-virtual'><p>none</div>"
+        "<a href='outside'>o</a>"
+    ),
+]
+
+
+class TestParserBackends:
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_fixture_matches_bs4(self, backend, sample_event_html):
+        assert parse_event_html(sample_event_html, backend) == parse_event_html(
+            sample_event_html, "bs4"
+        )
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @pytest.mark.parametrize("html", EDGE_CASES)
+    def test_edge_cases_match_bs4(self, backend, html):
+        assert parse_event_html(html, backend) == parse_event_html(html, "bs4")
+
+    def test_auto_resolves_to_installed_backend(self):
+        assert resolve_backend("auto") in ("selectolax", "lxml", "bs4")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            parse_event_html("", "html5lib")
 
 
 class TestParseEventHtml:
@@ -46,3 +116,74 @@ class TestScrapeEventPage:
         responses.add(responses.GET, url, body=sample_event_html, status=200)
         scrape_event_page(url)
         assert "x-custom" not in responses.calls[0].request.headers
+
+    @responses.activate
+    def test_scrape_with_session(self, sample_event_html):
+        responses.add(responses.GET, URL_A, body=sample_event_html, status=200)
+        with make_session() as session:
+            result = scrape_event_page(URL_A, session=session)
+        assert "Representation" in result["dissertation_title"]
+
+
+class TestScrapeEventPages:
+    @responses.activate
+    def test_scrapes_all(self, sample_event_html):
+        responses.add(responses.GET, URL_A, body=sample_event_html, status=200)
+        responses.add(responses.GET, URL_B, body=sample_event_html, status=200)
+        results = scrape_event_pages([URL_A, URL_B])
+        assert set(results) == {URL_A, URL_B}
+        assert "Representation" in results[URL_B]["dissertation_title"]
+
+    @responses.activate
+    def test_failure_is_per_url(self, sample_event_html):
+        responses.add(responses.GET, URL_A, body=sample_event_html, status=200)
+        responses.add(responses.GET, URL_B, status=500)
+        results = scrape_event_pages([URL_A, URL_B])
+        assert "Representation" in results[URL_A]["dissertation_title"]
+        assert isinstance(results[URL_B], requests.HTTPError)
+
+    @responses.activate
+    def test_deduplicates_and_skips_empty(self, sample_event_html):
+        responses.add(responses.GET, URL_A, body=sample_event_html, status=200)
+        results = scrape_event_pages([URL_A, "", URL_A])
+        assert list(results) == [URL_A]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_sends_extra_headers(self, sample_event_html):
+        responses.add(responses.GET, URL_A, body=sample_event_html, status=200)
+        scrape_event_pages([URL_A], extra_headers={"x-custom": "secret"})
+        assert responses.calls[0].request.headers["x-custom"] == "secret"
+
+    @responses.activate
+    def test_deadline(self, sample_event_html):
+        def slow(request):
+            time.sleep(0.5)
+            return (200, {}, sample_event_html)
+
+        responses.add_callback(responses.GET, URL_A, callback=slow)
+        results = scrape_event_pages([URL_A], deadline=0.05)
+        assert isinstance(results[URL_A], TimeoutError)
+
+    def test_no_urls(self):
+        assert scrape_event_pages([]) == {}
+
+    @pytest.mark.parametrize(("per_host_limit", "peak"), [(None, 6), (2, 2)])
+    def test_per_host_limit(self, monkeypatch, per_host_limit, peak):
+        active = []
+        seen = []
+        lock = threading.Lock()
+
+        def fake_scrape(url, *args):
+            with lock:
+                active.append(url)
+                seen.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(url)
+            return {}
+
+        monkeypatch.setattr(scraper, "scrape_event_page", fake_scrape)
+        urls = [f"https://orfe.princeton.edu/events/{i}" for i in range(6)]
+        scrape_event_pages(urls, max_workers=6, per_host_limit=per_host_limit)
+        assert max(seen) == peak
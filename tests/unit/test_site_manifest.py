@@ -0,0 +1,179 @@
+"""Tests for the public site manifest."""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from fpo_flyers import site_manifest
+from fpo_flyers.models import FPOEvent
+from fpo_flyers.site_manifest import (
+    address_by_content,
+    build_site_manifest,
+    file_entry,
+    file_kind,
+    is_content_addressed,
+    read_site_manifest,
+    write_headers,
+    write_site_manifest,
+)
+
+
+def _event(uid, name, day):
+    return FPOEvent(
+        uid=uid,
+        candidate_name=name,
+        start=datetime(2026, 3, day, 18, 0, tzinfo=timezone.utc),
+        end=datetime(2026, 3, day, 20, 0, tzinfo=timezone.utc),
+        location="125 - Sherrerd Hall",
+    )
+
+
+def _publish(tmp_path, event):
+    names = [f"{event.safe_filename}.pdf", f"{event.safe_filename}.html"]
+    (tmp_path / names[0]).write_bytes(b"%PDF " + event.uid.encode())
+    (tmp_path / names[1]).write_text(f"<html>{event.uid}</html>")
+    return names
+
+
+class TestFileEntry:
+    def test_hash_and_size(self, tmp_path):
+        path = tmp_path / "a.pdf"
+        path.write_bytes(b"%PDF")
+        digest = hashlib.sha256(b"%PDF").hexdigest()
+        assert file_entry(path) == {
+            "name": "a.pdf",
+            "url": f"a.pdf?v={digest[:12]}",
+            "bytes": 4,
+            "sha256": digest,
+        }
+
+    def test_content_addressed_url_is_name(self, tmp_path):
+        (tmp_path / "a.pdf").write_bytes(b"%PDF")
+        path = address_by_content(tmp_path / "a.pdf")
+        assert file_entry(path)["url"] == path.name
+
+
+class TestFileKind:
+    def test_kinds(self):
+        assert file_kind("J._Doe.pdf") == "pdf"
+        assert file_kind("J._Doe.html") == "html"
+        assert file_kind("J._Doe.webp") == "image"
+        assert file_kind("J._Doe.thumb.png") == "thumbnail"
+
+    def test_content_addressed(self):
+        assert file_kind("Jane_Doe.0123456789ab.webp") == "image"
+        assert file_kind("Jane_Doe.thumb.0123456789ab.webp") == "thumbnail"
+
+
+class TestContentAddressing:
+    def test_renames_by_digest(self, tmp_path):
+        path = tmp_path / "Jane_Doe.pdf"
+        path.write_bytes(b"%PDF")
+        target = address_by_content(path)
+        digest = hashlib.sha256(b"%PDF").hexdigest()[:12]
+        assert target.name == f"Jane_Doe.{digest}.pdf"
+        assert target.read_bytes() == b"%PDF"
+        assert not path.exists()
+
+    def test_existing_target_left_alone(self, tmp_path):
+        path = tmp_path / "Jane_Doe.pdf"
+        path.write_bytes(b"%PDF")
+        target = address_by_content(path)
+        before = target.stat()
+        path.write_bytes(b"%PDF")
+        assert address_by_content(path) == target
+        assert target.stat().st_ino == before.st_ino
+        assert not path.exists()
+
+    def test_is_content_addressed(self):
+        assert is_content_addressed("Jane_Doe.0123456789ab.pdf")
+        assert not is_content_addressed("Jane_Doe.pdf")
+        assert not is_content_addressed("J._Doe.html")
+
+    def test_headers(self, tmp_path):
+        manifest = {
+            "events": [
+                {
+                    "files": {
+                        "pdf": {"name": "A.0123456789ab.pdf"},
+                        "html": {"name": "A.html"},
+                    }
+                }
+            ]
+        }
+        text = write_headers(tmp_path, manifest).read_text()
+        assert "/manifest.json\n  Cache-Control: no-cache" in text
+        assert "/A.0123456789ab.pdf\n  Cache-Control: public, max-age=31536000" in text
+        assert "/A.html" not in text
+
+
+class TestBuildSiteManifest:
+    def test_sorted_by_start(self, tmp_path):
+        late, early = _event("b", "Late Person", 20), _event("a", "Early Person", 2)
+        outputs = {e.uid: _publish(tmp_path, e) for e in (late, early)}
+        manifest = build_site_manifest([late, early], outputs, tmp_path)
+        assert [e["candidate"] for e in manifest["events"]] == [
+            "Early Person",
+            "Late Person",
+        ]
+        first = manifest["events"][0]
+        assert first["date"] == "Monday, March 2, 2026"
+        assert first["files"]["pdf"]["name"] == "Early_Person.pdf"
+        assert first["files"]["html"]["bytes"] > 0
+        assert manifest["combined_pdf"] is None
+
+    def test_skips_events_without_outputs(self, tmp_path):
+        event = _event("a", "No Output", 2)
+        assert build_site_manifest([event], {}, tmp_path)["events"] == []
+
+    def test_reuses_hashes_of_unchanged_events(self, tmp_path, monkeypatch):
+        a, b = _event("a", "Ann Lee", 2), _event("b", "Bob Ray", 3)
+        outputs = {e.uid: _publish(tmp_path, e) for e in (a, b)}
+        previous = build_site_manifest([a, b], outputs, tmp_path)
+
+        hashed = []
+        real_file_entry = site_manifest.file_entry
+
+        def counting(path):
+            hashed.append(path.name)
+            return real_file_entry(path)
+
+        monkeypatch.setattr(site_manifest, "file_entry", counting)
+        manifest = build_site_manifest(
+            [a, b], outputs, tmp_path, previous=previous, changed={"b"}
+        )
+        assert sorted(hashed) == ["Bob_Ray.html", "Bob_Ray.pdf"]
+        assert manifest == previous
+
+    def test_rehashes_when_size_changes(self, tmp_path):
+        event = _event("a", "Ann Lee", 2)
+        outputs = {"a": _publish(tmp_path, event)}
+        previous = build_site_manifest([event], outputs, tmp_path)
+        (tmp_path / "Ann_Lee.pdf").write_bytes(b"%PDF longer")
+        manifest = build_site_manifest([event], outputs, tmp_path, previous=previous)
+        assert manifest["events"][0]["files"]["pdf"]["bytes"] == 11
+
+    def test_combined_pdf(self, tmp_path):
+        (tmp_path / "all_flyers.pdf").write_bytes(b"%PDF")
+        manifest = build_site_manifest([], {}, tmp_path, combined="all_flyers.pdf")
+        assert manifest["combined_pdf"]["name"] == "all_flyers.pdf"
+
+
+class TestReadWrite:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        write_site_manifest(path, {"version": 1, "events": []})
+        assert read_site_manifest(path) == {"version": 1, "events": []}
+        assert not (tmp_path / "manifest.json.tmp").exists()
+
+    def test_missing_or_corrupt(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        assert read_site_manifest(path) == {}
+        path.write_text("[not json")
+        assert read_site_manifest(path) == {}
+
+    def test_non_ascii_kept_readable(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        write_site_manifest(path, {"candidate": "Zoë"})
+        assert "Zoë" in path.read_text()
+        assert json.loads(path.read_text()) == {"candidate": "Zoë"}
@@ -0,0 +1,83 @@
+"""Tests for the watch loop."""
+
+import random
+
+import pytest
+
+from fpo_flyers.pipeline import RunResult
+from fpo_flyers.watch import next_delay, watch
+
+
+class _FakePipeline:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.runs = 0
+
+    def run(self, force=False):
+        self.runs += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return RunResult(outcome)
+
+
+class TestNextDelay:
+    def test_no_jitter(self):
+        assert next_delay(60, jitter=0) == 60
+
+    def test_jitter_bounds(self):
+        rng = random.Random(0)
+        delays = [next_delay(100, jitter=0.1, rng=rng) for _ in range(200)]
+        assert all(90 <= d <= 110 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_backoff_doubles(self):
+        assert next_delay(60, jitter=0, failures=1, max_backoff=1000) == 120
+        assert next_delay(60, jitter=0, failures=3, max_backoff=1000) == 480
+
+    def test_backoff_capped(self):
+        assert next_delay(60, jitter=0, failures=10, max_backoff=600) == 600
+        assert next_delay(60, jitter=0, failures=10_000, max_backoff=600) == 600
+
+    def test_cap_never_below_interval(self):
+        assert next_delay(60, jitter=0, failures=2, max_backoff=10) == 60
+
+
+class TestWatch:
+    def test_runs_iterations_and_sleeps_between(self):
+        pipeline = _FakePipeline(["done", "unchanged", "not_modified"])
+        sleeps = []
+        runs = watch(
+            pipeline, interval=30, jitter=0, iterations=3, sleep=sleeps.append
+        )
+        assert runs == pipeline.runs == 3
+        assert sleeps == [30, 30]
+
+    def test_backs_off_on_failures_then_resets(self):
+        pipeline = _FakePipeline(
+            [OSError("feed down"), "failed", "done", "unchanged"]
+        )
+        sleeps = []
+        watch(pipeline, interval=10, jitter=0, iterations=4, sleep=sleeps.append)
+        assert sleeps == [20, 40, 10]
+
+    def test_reports_completed_runs(self):
+        pipeline = _FakePipeline([RuntimeError("boom"), "done"])
+        seen = []
+        watch(
+            pipeline,
+            interval=1,
+            iterations=2,
+            on_result=lambda r: seen.append(r.status),
+            sleep=lambda s: None,
+        )
+        assert seen == ["done"]
+
+    def test_interrupt_propagates(self):
+        pipeline = _FakePipeline(["done"])
+
+        def sleep(seconds):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            watch(pipeline, interval=1, sleep=sleep)